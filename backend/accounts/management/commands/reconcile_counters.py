@@ -0,0 +1,34 @@
+# backend/accounts/management/commands/reconcile_counters.py
+"""
+Management command to repair drift in the denormalized counters on Post
+(likes, comments, replies) and User (followers, following, posts).
+
+Usage:
+    python manage.py reconcile_counters
+"""
+from django.core.management.base import BaseCommand
+
+from services.counter_service import CounterService
+
+
+class Command(BaseCommand):
+    help = "Recount denormalized Post and User counters and fix any drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows written per UPDATE batch",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        posts = CounterService.reconcile_posts(batch_size=batch_size)
+        self.stdout.write(f"Repaired counters on {posts} post(s)")
+
+        users = CounterService.reconcile_users(batch_size=batch_size)
+        self.stdout.write(f"Repaired counters on {users} user(s)")
+
+        self.stdout.write(self.style.SUCCESS("✓ Counters reconciled"))
@@ -0,0 +1,63 @@
+# Generated manually
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def _count(queryset, group_field):
+    return Coalesce(
+        Subquery(
+            queryset.order_by().values(group_field).annotate(n=Count("pk")).values("n")
+        ),
+        Value(0),
+    )
+
+
+def backfill_counters(apps, schema_editor):
+    User = apps.get_model("accounts", "User")
+    Follow = apps.get_model("accounts", "Follow")
+    Post = apps.get_model("posts", "Post")
+    User.objects.update(
+        followers_count=_count(
+            Follow.objects.filter(following=OuterRef("pk"), accepted=True), "following"
+        ),
+        following_count=_count(
+            Follow.objects.filter(follower=OuterRef("pk"), accepted=True), "follower"
+        ),
+        posts_count=_count(Post.objects.filter(author=OuterRef("pk")), "author"),
+        public_posts_count=_count(
+            Post.objects.filter(author=OuterRef("pk"), visibility__in=[1, 2]), "author"
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_follow_collection_indexes'),
+        ('posts', '0004_post_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='following_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='posts_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='public_posts_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
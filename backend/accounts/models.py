@@ -46,6 +46,12 @@ class User(AbstractUser):
     last_password_change = models.DateTimeField(auto_now_add=True)
     require_password_change = models.BooleanField(default=False)
 
+    # Denormalized counters, maintained by accounts/posts signals
+    followers_count = models.PositiveIntegerField(default=0)
+    following_count = models.PositiveIntegerField(default=0)
+    posts_count = models.PositiveIntegerField(default=0)
+    public_posts_count = models.PositiveIntegerField(default=0)  # Public + Local
+
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -71,6 +77,11 @@ class User(AbstractUser):
             self.bio = InputValidationService.sanitize_plain_text(self.bio)[
                 :500]
 
+        from services.counter_service import CounterService
+
+        kwargs = CounterService.protect_counters(
+            self, CounterService.USER_COUNTERS, kwargs
+        )
         super().save(*args, **kwargs)
 
     def get_timezone(self):
@@ -152,8 +163,26 @@ class Follow(models.Model):
     accepted = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored state so counter signals can see accept transitions
+        instance._loaded_accepted = instance.__dict__.get("accepted")
+        return instance
+
     class Meta:
         unique_together = ("follower", "following")
+        indexes = [
+            # Keyset pages of the followers/following collections
+            models.Index(
+                fields=["following", "accepted", "-created_at"],
+                name="accounts_fo_followers_idx",
+            ),
+            models.Index(
+                fields=["follower", "accepted", "-created_at"],
+                name="accounts_fo_following_idx",
+            ),
+        ]
 
     def to_activitypub_follow(self):
         """Convert to ActivityPub Follow activity"""
@@ -60,9 +60,9 @@ class UserSerializer(serializers.ModelSerializer):
     """Basic user serializer"""
 
     avatar_url = serializers.ReadOnlyField()
-    followers_count = serializers.SerializerMethodField()
-    following_count = serializers.SerializerMethodField()
-    posts_count = serializers.SerializerMethodField()
+    followers_count = serializers.IntegerField(read_only=True)
+    following_count = serializers.IntegerField(read_only=True)
+    posts_count = serializers.IntegerField(source="public_posts_count", read_only=True)
 
     class Meta:
         model = User
@@ -80,18 +80,6 @@ class UserSerializer(serializers.ModelSerializer):
             "posts_count",
         ]
 
-    @staticmethod
-    def get_followers_count(obj):
-        return obj.followers.filter(accepted=True).count()
-
-    @staticmethod
-    def get_following_count(obj):
-        return obj.following.filter(accepted=True).count()
-
-    @staticmethod
-    def get_posts_count(obj):
-        return obj.posts.filter(visibility__in=[1, 2]).count()
-
 
 class UserProfileSerializer(serializers.ModelSerializer):
     """Extended user profile serializer"""
@@ -100,8 +88,8 @@ class UserProfileSerializer(serializers.ModelSerializer):
     is_following = serializers.SerializerMethodField()
     is_follower = serializers.SerializerMethodField()
     follow_requested = serializers.SerializerMethodField()
-    followers_count = serializers.SerializerMethodField()
-    following_count = serializers.SerializerMethodField()
+    followers_count = serializers.IntegerField(read_only=True)
+    following_count = serializers.IntegerField(read_only=True)
     posts_count = serializers.SerializerMethodField()
 
     class Meta:
@@ -149,19 +137,13 @@ class UserProfileSerializer(serializers.ModelSerializer):
             return obj.followers.filter(follower=request.user, accepted=False).exists()
         return False
 
-    def get_followers_count(self, obj):
-        return obj.followers.filter(accepted=True).count()
-
-    def get_following_count(self, obj):
-        return obj.following.filter(accepted=True).count()
-
     def get_posts_count(self, obj):
         # If viewing own profile, count all posts
         request = self.context.get('request')
         if request and request.user == obj:
-            return obj.posts.count()
+            return obj.posts_count
         # Otherwise only count public and local posts
-        return obj.posts.filter(visibility__in=[1, 2]).count()
+        return obj.public_posts_count
 
     def validate_display_name(self, value):
         """Validate and sanitize display name"""
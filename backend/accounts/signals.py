@@ -0,0 +1,51 @@
+# backend/accounts/signals.py
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from services.counter_service import CounterService
+
+from .models import Follow, User
+
+logger = logging.getLogger(__name__)
+
+
+def _adjust_follow_counts(follow, delta):
+    CounterService.adjust(User, follow.following_id, followers_count=delta)
+    CounterService.adjust(User, follow.follower_id, following_count=delta)
+
+
+def _update_timeline(operation, *args):
+    """Apply a home timeline change once the follow change commits"""
+    from posts import timeline
+
+    def apply():
+        try:
+            getattr(timeline, operation)(*args)
+        except Exception as e:
+            logger.warning(f"Home timeline {operation} failed: {e}")
+
+    transaction.on_commit(apply)
+
+
+@receiver(post_save, sender=Follow)
+def follow_saved(sender, instance, created, **kwargs):
+    """Only accepted follows count; requests count once accepted"""
+    was_accepted = False if created else getattr(instance, "_loaded_accepted", None)
+    if was_accepted is not None and instance.accepted != was_accepted:
+        _adjust_follow_counts(instance, 1 if instance.accepted else -1)
+        if instance.accepted:
+            # Rebuilt on next read with the new author's recent posts
+            _update_timeline("drop", instance.follower_id)
+        else:
+            _update_timeline("remove_author", instance.follower_id, instance.following_id)
+    instance._loaded_accepted = instance.accepted
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender, instance, **kwargs):
+    if instance.accepted:
+        _adjust_follow_counts(instance, -1)
+        _update_timeline("remove_author", instance.follower_id, instance.following_id)
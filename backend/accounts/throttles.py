@@ -1,5 +1,49 @@
 # backend/accounts/throttles.py
-from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+import re
+
+from rest_framework import throttling
+
+from services import rate_limiter
+
+
+class AtomicRateThrottleMixin:
+    """
+    Count throttled requests with the atomic GCRA limiter
+    (services/rate_limiter.py) instead of DRF's cached request history,
+    which costs a read and a write per request and lets concurrent
+    requests through on the same count.
+    """
+
+    PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+    def parse_rate(self, rate):
+        """Accept a multiplier on the period, e.g. "1/5min" """
+        if rate is None:
+            return (None, None)
+        num, period = rate.split("/")
+        match = re.fullmatch(r"(\d*)\s*([a-z]+)", period.strip())
+        multiplier = int(match.group(1) or 1)
+        return int(num), multiplier * self.PERIODS[match.group(2)[0]]
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        self.result = rate_limiter.hit(self.key, self.num_requests, self.duration)
+        return self.result.allowed
+
+    def wait(self):
+        return self.result.retry_after
+
+
+class AnonRateThrottle(AtomicRateThrottleMixin, throttling.AnonRateThrottle):
+    """General rate limit for anonymous requests, per IP."""
+
+
+class UserRateThrottle(AtomicRateThrottleMixin, throttling.UserRateThrottle):
+    """General rate limit for authenticated requests, per user."""
 
 
 class RegistrationRateThrottle(AnonRateThrottle):
@@ -8,6 +8,9 @@ from django.contrib.auth.models import AnonymousUser
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils import timezone
+from glade.pagination import KeysetPagination
+from notifications import preferences as notification_preferences
+from notifications.models import NotificationPreference
 from notifications.services import NotificationService
 from rest_framework import generics, permissions, status
 from rest_framework.authtoken.models import Token
@@ -54,6 +57,9 @@ class RegisterView(generics.CreateAPIView):
         # Create auth token
         token, _created = Token.objects.get_or_create(user=user)
 
+        # Default notification preferences, so notifying the user never has to
+        notification_preferences.store(NotificationPreference.objects.create(user=user))
+
         # Send verification email — catch common network/SMTP failures but don't fail registration.
         # If EmailVerificationService documents its own exception class (e.g. EmailVerificationError),
         # prefer to catch that here instead.
@@ -376,19 +382,15 @@ def follow_user_by_uri(request):
         return Response({"error": "actor_uri required"}, status=400)
 
     # Delegate to federation service for remote users
-    from asgiref.sync import async_to_sync
+    from federation.http_client import run_async
     from federation.services import ActivityPubService
 
     try:
         logger.info(f"Attempting to follow remote user: {actor_uri}")
         ap_service = ActivityPubService()
 
-        # Use async_to_sync with force_new_loop to avoid conflicts with Celery
-        from asgiref.sync import async_to_sync
-
-        result = async_to_sync(ap_service.follow_remote_user, force_new_loop=True)(
-            request.user, actor_uri
-        )
+        # Run on the shared federation I/O loop so pooled connections are reused
+        result = run_async(ap_service.follow_remote_user(request.user, actor_uri))
 
         logger.info(f"Follow successful: {result}")
         return Response(result, status=201)
@@ -473,14 +475,14 @@ def follow_user(request, username):
 
     else:
         # Remote user follow - delegate to federation service
-        from asgiref.sync import async_to_sync
+        from federation.http_client import run_async
         from federation.services import ActivityPubService
 
         if request.method == "POST":
             try:
                 ap_service = ActivityPubService()
-                result = async_to_sync(ap_service.follow_remote_user)(
-                    request.user, username
+                result = run_async(
+                    ap_service.follow_remote_user(request.user, username)
                 )
                 return Response(result, status=201)
             except Exception as e:
@@ -495,13 +497,11 @@ def follow_user(request, username):
 @permission_classes([permissions.IsAuthenticated])
 @throttle_classes([SearchRateThrottle])
 def search_users(request):
-    """Search for users by username with pagination"""
+    """Search for users by username, newest accounts first, in cursor pages"""
     query = request.query_params.get("q", "").strip()
-    page = int(request.query_params.get("page", 1))
-    page_size = 10
 
     if not query or len(query) < 2:
-        return Response({"results": [], "count": 0, "total": 0, "page": 1, "pages": 0})
+        return Response({"next": None, "previous": None, "results": []})
 
     # Search by username or display_name, respecting privacy levels
     # Privacy level 1 (Public): searchable by everyone
@@ -513,25 +513,11 @@ def search_users(request):
         privacy_level__in=[1, 2],  # Public and Local profiles are searchable
     ).exclude(id=request.user.id)
 
-    total_count = all_users.count()
-    total_pages = (total_count + page_size -
-                   1) // page_size  # Ceiling division
-
-    # Paginate results
-    start = (page - 1) * page_size
-    end = start + page_size
-    users = all_users[start:end]
+    paginator = KeysetPagination()
+    users = paginator.paginate_queryset(all_users, request)
 
     serializer = UserSerializer(users, many=True, context={"request": request})
-    return Response(
-        {
-            "results": serializer.data,
-            "count": len(serializer.data),
-            "total": total_count,
-            "page": page,
-            "pages": total_pages,
-        }
-    )
+    return paginator.get_paginated_response(serializer.data)
 
 
 @api_view(["GET"])
@@ -0,0 +1,175 @@
+# backend/federation/activity_log.py
+"""
+Buffered writer for the federation.Activity log.
+
+Rows are collected per process and written with one bulk_create when
+ACTIVITYPUB_ACTIVITY_LOG_BATCH_SIZE rows are pending or
+ACTIVITYPUB_ACTIVITY_LOG_FLUSH_SECONDS have passed, instead of one or two
+single-row writes per activity. Inbound activities are logged once, with
+their final status; outbound activities once per target inbox. Raw
+payloads are kept for a sample of rows and for every failure, and are
+reduced to a small stub when over the size limit.
+
+The log is for debugging: rows still buffered when a process is killed
+outright are lost. Normal shutdown flushes them.
+"""
+import atexit
+import json
+import logging
+import os
+import random
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .models import Activity
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_wake = threading.Event()
+_pending = []
+_pid = None
+_flusher = None
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def _actor_uri(activity: dict) -> str:
+    actor = activity.get("actor", "")
+    if isinstance(actor, dict):
+        return actor.get("id", "") or ""
+    return actor if isinstance(actor, str) else ""
+
+
+def _object_uri(activity: dict) -> str:
+    obj = activity.get("object", "")
+    if isinstance(obj, dict):
+        return obj.get("id", "") or ""
+    return obj if isinstance(obj, str) else ""
+
+
+def _stored_payload(activity: dict, keep_full: bool) -> dict:
+    """The payload as stored: full, or a stub when unsampled or oversized"""
+    if keep_full:
+        max_bytes = _setting("ACTIVITYPUB_ACTIVITY_LOG_PAYLOAD_MAX_BYTES", 16384)
+        if len(json.dumps(activity, separators=(",", ":"))) <= max_bytes:
+            return activity
+    return {
+        "id": activity.get("id", ""),
+        "type": activity.get("type", ""),
+        "actor": _actor_uri(activity),
+        "object": _object_uri(activity),
+        "truncated": True,
+    }
+
+
+def log_activity(
+    activity: dict,
+    direction: str,
+    processed: bool = True,
+    target: str = "",
+    error_message: str = "",
+):
+    """
+    Queue an Activity row; it is written with the next batch. Safe to call
+    from async code: writes happen on the flusher thread, never here.
+    """
+    sample_rate = _setting("ACTIVITYPUB_ACTIVITY_LOG_SAMPLE_RATE", 1.0)
+    keep_full = bool(error_message) or random.random() < sample_rate
+
+    row = Activity(
+        activity_id=(activity.get("id") or "")[:1024] or None,
+        activity_type=(activity.get("type") or "Unknown")[:20],
+        direction=direction,
+        actor_uri=_actor_uri(activity)[:200],
+        object_uri=_object_uri(activity)[:200],
+        target=target[:200],
+        raw_activity=_stored_payload(activity, keep_full),
+        processed=processed,
+        error_message=error_message,
+    )
+
+    with _lock:
+        _reset_after_fork()
+        _pending.append(row)
+        full = len(_pending) >= _setting("ACTIVITYPUB_ACTIVITY_LOG_BATCH_SIZE", 200)
+        _ensure_flusher()
+
+    if full:
+        _wake.set()
+
+
+def flush() -> int:
+    """Write all buffered rows; returns the number written"""
+    with _lock:
+        _reset_after_fork()
+        rows = _pending[:]
+        del _pending[:]
+
+    if not rows:
+        return 0
+
+    try:
+        return len(Activity.objects.bulk_create(rows))
+    except Exception as e:
+        logger.error(f"Failed to write {len(rows)} activity log rows: {e}")
+        return 0
+
+
+def _reset_after_fork():
+    """Forked children must not inherit the parent's rows or flusher thread"""
+    global _pid, _flusher
+    if _pid != os.getpid():
+        _pid = os.getpid()
+        _flusher = None
+        del _pending[:]
+
+
+def _ensure_flusher():
+    global _flusher
+    if _flusher is None or not _flusher.is_alive():
+        _flusher = threading.Thread(
+            target=_flush_periodically, name="activity-log-flusher", daemon=True
+        )
+        _flusher.start()
+
+
+def _flush_periodically():
+    interval = _setting("ACTIVITYPUB_ACTIVITY_LOG_FLUSH_SECONDS", 5)
+    while True:
+        # Woken early when a batch fills up
+        _wake.wait(interval)
+        _wake.clear()
+        try:
+            flush()
+        finally:
+            close_old_connections()
+
+
+def prune(days: int = None, batch_size: int = 5000) -> int:
+    """
+    Delete rows older than the retention period in small batches, so
+    pruning never holds long locks on the table.
+    """
+    if days is None:
+        days = _setting("ACTIVITYPUB_ACTIVITY_LOG_RETENTION_DAYS", 30)
+    cutoff = timezone.now() - timedelta(days=days)
+    total = 0
+    while True:
+        ids = list(
+            Activity.objects.filter(created_at__lt=cutoff)
+            .order_by()
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            return total
+        total += Activity.objects.filter(id__in=ids).delete()[0]
+
+
+atexit.register(flush)
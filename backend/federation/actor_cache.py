@@ -0,0 +1,203 @@
+# backend/federation/actor_cache.py
+"""
+Two-tier cache of remote actors.
+
+Each process keeps a small LRU of compact ActorRecords in front of the
+shared Redis cache, with RemoteUser rows as the fallback. A record older
+than ACTIVITYPUB_ACTOR_CACHE_TTL is still served, while one background
+refresh per actor (coordinated through a cache.add lock) fetches the
+actor again. Local entries are only trusted for a short time, so an
+invalidation reaches the other processes within that time.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from services.local_cache import LocalCache
+
+from .http_client import submit_async
+from .models import RemoteUser
+from .signing import invalidate_cached_keys, load_public_key
+
+logger = logging.getLogger(__name__)
+
+ACTOR_TYPES = {"Person", "Service", "Application", "Group", "Organization"}
+
+_refresh_tasks = set()  # keeps fire-and-forget refreshes from being collected
+
+
+@dataclass(frozen=True)
+class ActorRecord:
+    """What federation needs to know about an actor, without the full document"""
+
+    uri: str
+    inbox: str
+    shared_inbox: str
+    key_id: str
+    public_key_pem: str
+    remote_user_id: str
+    fetched_at: float
+
+    @classmethod
+    def from_remote_user(cls, remote_user: RemoteUser) -> "ActorRecord":
+        return cls(
+            uri=remote_user.actor_uri,
+            inbox=remote_user.inbox_url,
+            shared_inbox=remote_user.shared_inbox_url,
+            key_id=f"{remote_user.actor_uri}#main-key",
+            public_key_pem=remote_user.public_key,
+            remote_user_id=str(remote_user.pk),
+            fetched_at=remote_user.last_fetched_at.timestamp(),
+        )
+
+    @property
+    def public_key(self):
+        """Parsed public key (shared with signature verification's key cache)"""
+        if not self.public_key_pem:
+            return None
+        return load_public_key(self.public_key_pem.encode("utf-8"), self.key_id)
+
+    @property
+    def is_stale(self) -> bool:
+        ttl = getattr(settings, "ACTIVITYPUB_ACTOR_CACHE_TTL", 3600)
+        return time.time() - self.fetched_at > ttl
+
+    def as_remote_user(self) -> RemoteUser:
+        """
+        RemoteUser carrying only the cached fields; other fields load
+        lazily on access, and save() writes back only what was loaded.
+        """
+        return RemoteUser.from_db(
+            "default",
+            ["id", "actor_uri", "inbox_url", "shared_inbox_url", "public_key"],
+            [
+                uuid.UUID(self.remote_user_id),
+                self.uri,
+                self.inbox,
+                self.shared_inbox,
+                self.public_key_pem,
+            ],
+        )
+
+
+_local = LocalCache(
+    "ACTIVITYPUB_ACTOR_LOCAL_CACHE_SECONDS",
+    60,
+    "ACTIVITYPUB_ACTOR_LOCAL_CACHE_SIZE",
+    10000,
+)
+
+
+def _cache_key(uri: str) -> str:
+    return f"actor_record:{uri}"
+
+
+def store(record: ActorRecord):
+    """Write a record to both tiers"""
+    _local.set(record.uri, record)
+    # Keep it in Redis past the TTL so it can be served stale during refresh
+    timeout = getattr(settings, "ACTIVITYPUB_ACTOR_CACHE_TTL", 3600) + getattr(
+        settings, "ACTIVITYPUB_ACTOR_STALE_SECONDS", 86400
+    )
+    cache.set(_cache_key(record.uri), asdict(record), timeout)
+
+
+def invalidate(uri: str):
+    """Forget everything cached about an actor, including its parsed keys"""
+    _local.pop(uri)
+    cache.delete(_cache_key(uri))
+    invalidate_cached_keys(uri)
+
+
+def get_actor(uri: str) -> Optional[ActorRecord]:
+    """
+    Return the cached record for an actor, possibly stale, or None if the
+    actor is unknown. Stale records trigger a background refresh.
+    """
+    record = _local.get(uri)
+    if record is None:
+        data = cache.get(_cache_key(uri))
+        if data:
+            record = ActorRecord(**data)
+        else:
+            remote_user = RemoteUser.objects.filter(actor_uri=uri).first()
+            if remote_user is None:
+                return None
+            record = ActorRecord.from_remote_user(remote_user)
+            store(record)
+        _local.set(record.uri, record)
+
+    if record.is_stale:
+        schedule_refresh(uri)
+    return record
+
+
+async def aget_actor(uri: str) -> Optional[ActorRecord]:
+    """Async get_actor; a local hit does not leave the event loop"""
+    record = _local.get(uri)
+    if record is not None and not record.is_stale:
+        return record
+    return await sync_to_async(get_actor)(uri)
+
+
+async def refresh_actor(uri: str) -> Optional[ActorRecord]:
+    """
+    Fetch the actor document and update RemoteUser and both cache tiers.
+    Falls back to a signed fetch for servers requiring authorized fetch.
+    Returns None unless the document's id is exactly uri, so a key looked up
+    for one actor is never taken from another actor's document.
+    """
+    from accounts.models import User
+
+    from .services import ActivityPubService
+
+    service = ActivityPubService()
+    actor_data = await service.fetch_actor(uri)
+    if not actor_data:
+        local_user = await sync_to_async(
+            User.objects.filter(is_active=True).exclude(private_key="").first
+        )()
+        if local_user:
+            actor_data = await service.fetch_actor(uri, signed_by=local_user)
+    if not actor_data:
+        return None
+    if actor_data.get("id") != uri:
+        logger.warning(f"Actor {uri} answered with id {actor_data.get('id')!r}")
+        return None
+
+    # fetch_actor stored the new record
+    return await aget_actor(uri)
+
+
+async def _refresh_in_background(uri: str):
+    try:
+        if await refresh_actor(uri) is not None:
+            cache.delete(f"actor_refresh:{uri}")
+        # On failure the lock is left to expire, spacing out retries
+    except Exception as e:
+        logger.warning(f"Background refresh of {uri} failed: {e}")
+
+
+def schedule_refresh(uri: str):
+    """Start a background refresh unless one is already running somewhere"""
+    if not cache.add(f"actor_refresh:{uri}", 1, 60):
+        return
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    if loop is not None:
+        task = loop.create_task(_refresh_in_background(uri))
+        _refresh_tasks.add(task)
+        task.add_done_callback(_refresh_tasks.discard)
+    else:
+        submit_async(_refresh_in_background(uri))
+
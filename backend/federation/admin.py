@@ -1,7 +1,7 @@
 # backend/federation/admin.py
 from django.contrib import admin
 
-from .models import Activity, RemoteInstance, RemoteUser
+from .models import Activity, DeliveryJob, RemoteInstance, RemoteUser
 
 
 @admin.register(RemoteInstance)
@@ -48,3 +48,17 @@ class ActivityAdmin(admin.ModelAdmin):
 
     def get_queryset(self, request):
         return super().get_queryset(request).select_related()
+
+
+@admin.register(DeliveryJob)
+class DeliveryJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "activity_id",
+        "inbox_url",
+        "status",
+        "attempts",
+        "next_attempt_at",
+    )
+    list_filter = ("status",)
+    search_fields = ("activity_id", "inbox_url")
+    readonly_fields = ("created_at", "updated_at", "activity")
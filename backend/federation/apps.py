@@ -8,4 +8,4 @@ class FederationConfig(AppConfig):
     verbose_name = "ActivityPub Federation"
 
     def ready(self):
-        pass
+        from . import signals  # noqa: F401
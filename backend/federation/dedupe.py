@@ -0,0 +1,71 @@
+# backend/federation/dedupe.py
+"""
+Front gate for redelivered inbound activities.
+
+Remote servers retry deliveries and relays forward the same activity many
+times. Activity IDs we have already accepted are remembered in the cache
+for ACTIVITYPUB_INBOX_DEDUPE_SECONDS, so repeats are acknowledged before
+signature verification or any database work. An ID is claimed only once
+its delivery has passed signature verification, so an unsigned request
+cannot suppress the real activity by claiming its ID first. The claim is
+taken before the activity is queued and released if queuing or processing
+fails. Nothing is written to the database before the 202, so this gate is
+what stops concurrent redeliveries from being processed twice.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+DUPLICATE_COUNT_KEY = "federation:inbox_duplicates"
+
+
+def _seen_key(activity_id: str) -> str:
+    # Activity IDs can be long URLs; hash them to a fixed-size key
+    return "inbox_seen:" + hashlib.sha1(activity_id.encode("utf-8")).hexdigest()
+
+
+def is_duplicate(activity_id: str) -> bool:
+    """Return True (and count it) if this activity was already accepted"""
+    if not activity_id:
+        return False
+    if cache.get(_seen_key(activity_id)) is None:
+        return False
+    record_duplicate()
+    return True
+
+
+def claim(activity_id: str) -> bool:
+    """
+    Atomically mark an activity as accepted. Returns False if a concurrent
+    or earlier delivery already claimed it.
+    """
+    if not activity_id:
+        return True
+    return cache.add(
+        _seen_key(activity_id),
+        1,
+        getattr(settings, "ACTIVITYPUB_INBOX_DEDUPE_SECONDS", 3 * 86400),
+    )
+
+
+def release(activity_id: str):
+    """
+    Forget a claim whose activity could not be queued or processed, so the
+    sender's retry gets through
+    """
+    if activity_id:
+        cache.delete(_seen_key(activity_id))
+
+
+def record_duplicate():
+    try:
+        cache.incr(DUPLICATE_COUNT_KEY)
+    except ValueError:
+        cache.add(DUPLICATE_COUNT_KEY, 0, timeout=None)
+        cache.incr(DUPLICATE_COUNT_KEY)
+
+
+def duplicate_count() -> int:
+    """Number of duplicate deliveries dropped since the counter was created"""
+    return cache.get(DUPLICATE_COUNT_KEY, 0)
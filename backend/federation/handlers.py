@@ -9,10 +9,10 @@ from typing import Optional
 from accounts.models import Follow, User
 from asgiref.sync import sync_to_async
 from django.conf import settings
-from django.core.cache import cache
 from posts.models import Like, Post
 
-from .models import Activity, RemoteUser
+from . import actor_cache
+from .models import RemoteUser
 from .services import ActivityPubService
 
 logger = logging.getLogger(__name__)
@@ -27,17 +27,14 @@ class ActivityHandler:
     async def handle_activity(self, activity: dict, request=None) -> dict:
         """
         Main entry point for processing inbox activities.
+        Runs in the process_inbox_activity task, which logs the outcome.
         Returns dict with status info.
         """
         activity_type = activity.get("type")
-        activity_id = activity.get("id", "")
         actor_uri = activity.get("actor", "")
 
         logger.info(f"Processing {activity_type} activity from {actor_uri}")
 
-        # Log activity
-        await self._log_activity(activity, "inbound")
-
         # Route to handler
         handler_map = {
             "Follow": self._handle_follow,
@@ -57,12 +54,9 @@ class ActivityHandler:
             return {"status": "ignored", "reason": "unsupported type"}
 
         try:
-            result = await handler(activity)
-            await self._mark_activity_processed(activity_id)
-            return result
+            return await handler(activity)
         except Exception as e:
             logger.exception(f"Error handling {activity_type}: {e}")
-            await self._mark_activity_error(activity_id, str(e))
             return {"status": "error", "reason": str(e)}
 
     async def _handle_follow(self, activity: dict) -> dict:
@@ -119,7 +113,8 @@ class ActivityHandler:
         if not local_user:
             return {"status": "ignored"}
 
-        remote_user = await self._get_or_fetch_remote_user(actor_uri)
+        # Backfill reads outbox_url and username, which the cache does not hold
+        remote_user = await self._get_or_fetch_remote_user(actor_uri, full=True)
         if not remote_user:
             return {"status": "error", "reason": "remote user not found"}
 
@@ -136,9 +131,7 @@ class ActivityHandler:
                 await sync_to_async(follow.save)(update_fields=["accepted"])
             
             # Fetch their recent posts
-            from .services import ActivityPubService
-            ap_service = ActivityPubService()
-            await ap_service.fetch_remote_posts(remote_user)
+            await self.ap_service.fetch_remote_posts(remote_user)
             
             return {"status": "success", "action": "follow_accepted"}
         except Follow.DoesNotExist:
@@ -194,11 +187,21 @@ class ActivityHandler:
         return {"status": "success", "action": "post_created", "post_id": str(post.id)}
 
     async def _handle_update(self, activity: dict) -> dict:
-        """Handle Update activity (edit post)"""
+        """Handle Update activity (edit post or actor profile)"""
         obj = activity.get("object", {})
         if not isinstance(obj, dict):
             return {"status": "error", "reason": "invalid object"}
 
+        if obj.get("type") in actor_cache.ACTOR_TYPES:
+            # Actors may only update themselves
+            if obj.get("id") != activity.get("actor"):
+                return {"status": "ignored", "reason": "actor mismatch"}
+            # The payload is not trusted for keys or inboxes; the actor is
+            # refetched from its own server instead
+            actor_cache.invalidate(obj["id"])
+            actor_cache.schedule_refresh(obj["id"])
+            return {"status": "success", "action": "actor_refetch_scheduled"}
+
         activity_id = obj.get("id")
         content = obj.get("content")
 
@@ -342,37 +345,24 @@ class ActivityHandler:
                 accept_activity, [remote_user.inbox_url]
             )
 
-    async def _get_or_fetch_remote_user(self, actor_uri: str) -> Optional[RemoteUser]:
-        """Get remote user from cache/DB or fetch from remote"""
-        # Try cache first
-        cached = cache.get(f"remote_user:{actor_uri}")
-        if cached:
-            return cached
-
-        # Try database
-        remote_user = await sync_to_async(
-            RemoteUser.objects.filter(actor_uri=actor_uri).first
-        )()
-        if remote_user:
-            cache.set(f"remote_user:{actor_uri}", remote_user, 3600)
-            return remote_user
-
-        # Fetch from remote
-        actor_data = await self.ap_service.fetch_actor(actor_uri)
-        if not actor_data:
+    async def _get_or_fetch_remote_user(
+        self, actor_uri: str, full: bool = False
+    ) -> Optional[RemoteUser]:
+        """
+        Get remote user from the actor cache or fetch from remote. The
+        cached RemoteUser only carries the cached fields, and lazily loading
+        the rest fails on the event loop; full=True loads the whole row.
+        """
+        record = await actor_cache.aget_actor(actor_uri)
+        if record is None:
+            record = await actor_cache.refresh_actor(actor_uri)
+        if record is None:
             return None
-
-        # Create remote user (this is handled in ActivityPubService._cache_remote_user)
-        await self.ap_service._cache_remote_user(actor_data)
-
-        # Retrieve newly created user
-        remote_user = await sync_to_async(
-            RemoteUser.objects.filter(actor_uri=actor_uri).first
-        )()
-        if remote_user:
-            cache.set(f"remote_user:{actor_uri}", remote_user, 3600)
-
-        return remote_user
+        if full:
+            return await sync_to_async(
+                RemoteUser.objects.filter(pk=record.remote_user_id).first
+            )()
+        return record.as_remote_user()
 
     async def _get_local_user_from_uri(self, uri: str) -> Optional[User]:
         """Extract username from actor URI and get local user"""
@@ -381,32 +371,3 @@ class ActivityHandler:
         username = parts[-1]
 
         return await sync_to_async(User.objects.filter(username=username).first)()
-
-    async def _log_activity(self, activity: dict, direction: str):
-        """Log activity to database"""
-        import uuid
-        await sync_to_async(Activity.objects.create)(
-            activity_id=activity.get("id", f"activity:{uuid.uuid4()}"),
-            activity_type=activity.get("type", "Unknown"),
-            direction=direction,
-            actor_uri=activity.get("actor", ""),
-            object_uri=(
-                activity.get("object", {}).get("id", "")
-                if isinstance(activity.get("object"), dict)
-                else activity.get("object", "")
-            ),
-            raw_activity=activity,
-            processed=False,
-        )
-
-    async def _mark_activity_processed(self, activity_id: str):
-        """Mark activity as processed"""
-        await sync_to_async(Activity.objects.filter(activity_id=activity_id).update)(
-            processed=True
-        )
-
-    async def _mark_activity_error(self, activity_id: str, error: str):
-        """Mark activity as error"""
-        await sync_to_async(Activity.objects.filter(activity_id=activity_id).update)(
-            processed=False, error_message=error
-        )
@@ -0,0 +1,159 @@
+"""
+Shared HTTP clients for federation I/O.
+
+Each process keeps one pooled sync client and one pooled async client, so
+deliveries and actor fetches reuse keep-alive connections instead of
+paying TCP+TLS setup on every request. The async client lives on a
+dedicated background event loop; sync code (views, Celery tasks) submits
+coroutines to it with run_async().
+"""
+import asyncio
+import atexit
+import concurrent.futures
+import logging
+import os
+import threading
+import weakref
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.RLock()
+_pid = None
+_sync_client = None
+_loop = None
+_async_clients = weakref.WeakKeyDictionary()  # event loop -> AsyncClient
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional h2 package (httpx[http2])"""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _client_options() -> dict:
+    return {
+        "timeout": httpx.Timeout(
+            getattr(settings, "ACTIVITYPUB_HTTP_TIMEOUT", 30.0), connect=10.0
+        ),
+        "limits": httpx.Limits(
+            max_connections=getattr(settings, "ACTIVITYPUB_HTTP_MAX_CONNECTIONS", 100),
+            max_keepalive_connections=getattr(
+                settings, "ACTIVITYPUB_HTTP_MAX_KEEPALIVE", 20
+            ),
+            keepalive_expiry=getattr(settings, "ACTIVITYPUB_HTTP_KEEPALIVE_EXPIRY", 30.0),
+        ),
+        "http2": _http2_available(),
+        "headers": {
+            "User-Agent": f"Glade/{settings.INSTANCE_DOMAIN}",
+            "Accept": "application/activity+json, application/ld+json",
+        },
+    }
+
+
+def _reset_after_fork():
+    """Drop clients and loop inherited from a parent process (Celery prefork)"""
+    global _pid, _sync_client, _loop, _async_clients
+    if _pid != os.getpid():
+        _pid = os.getpid()
+        _sync_client = None
+        _loop = None
+        _async_clients = weakref.WeakKeyDictionary()
+
+
+def get_client() -> httpx.Client:
+    """Return the process-wide pooled sync client"""
+    global _sync_client
+    with _lock:
+        _reset_after_fork()
+        if _sync_client is None:
+            _sync_client = httpx.Client(**_client_options())
+        return _sync_client
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Return the pooled async client for the running event loop.
+    httpx connections are bound to the loop that opened them, so there is
+    one client per loop; in practice that is the federation I/O loop.
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        _reset_after_fork()
+        client = _async_clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(**_client_options())
+            _async_clients[loop] = client
+        return client
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _lock:
+        _reset_after_fork()
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="federation-io", daemon=True
+            ).start()
+        return _loop
+
+
+async def _run_and_release(coro):
+    try:
+        return await coro
+    finally:
+        # DB calls made through sync_to_async run on asgiref's long-lived
+        # executor thread; drop stale connections as a request cycle would
+        await sync_to_async(close_old_connections)()
+
+
+def submit_async(coro) -> concurrent.futures.Future:
+    """Schedule a coroutine on the federation I/O loop without waiting for it"""
+    loop = _get_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        # Blocking on the result here would deadlock the loop; callers there should await
+        coro.close()
+        raise RuntimeError("Federation I/O loop cannot wait on itself; await instead")
+
+    return asyncio.run_coroutine_threadsafe(_run_and_release(coro), loop)
+
+
+def run_async(coro, timeout: float = None):
+    """Run a coroutine on the federation I/O loop and wait for its result"""
+    return submit_async(coro).result(timeout)
+
+
+def close():
+    """Close pooled connections and stop the I/O loop (process shutdown)"""
+    global _sync_client, _loop
+    with _lock:
+        if _pid != os.getpid():
+            return
+        if _sync_client is not None:
+            _sync_client.close()
+            _sync_client = None
+        loop, _loop = _loop, None
+
+    if loop is not None and loop.is_running():
+        client = _async_clients.pop(loop, None)
+        if client is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(5)
+            except Exception as e:
+                logger.warning(f"Error closing federation HTTP client: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+
+
+atexit.register(close)
@@ -5,11 +5,13 @@ API views for instance management and federation status.
 from accounts.models import User
 from django.conf import settings
 from django.db.models import Count, Q
+from glade.pagination import KeysetPagination
 from posts.models import Post
 from rest_framework import permissions, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 
+from . import dedupe
 from .models import Activity, RemoteInstance, RemoteUser
 
 
@@ -53,6 +55,7 @@ def instance_info(request):
                 "connected_instances": remote_instances,
                 "federated_posts": federated_posts,
                 "total_activities": recent_activities,
+                "duplicate_deliveries_dropped": dedupe.duplicate_count(),
             },
             "features": {
                 "location_based": True,
@@ -145,20 +148,13 @@ def remote_instances_list(request):
 @permission_classes([permissions.IsAuthenticated])
 def remote_users_list(request):
     """
-    List remote users with pagination.
+    List remote users, newest first, in cursor pages.
     """
-    page = int(request.query_params.get("page", 1))
-    page_size = 20
+    remote_users = RemoteUser.objects.select_related("instance")
 
-    remote_users = RemoteUser.objects.select_related(
-        "instance").order_by("-created_at")
-
-    # Pagination
-    start = (page - 1) * page_size
-    end = start + page_size
-    total = remote_users.count()
-
-    users_page = remote_users[start:end]
+    paginator = KeysetPagination()
+    paginator.page_size = 20
+    users_page = paginator.paginate_queryset(remote_users, request)
 
     data = [
         {
@@ -177,15 +173,7 @@ def remote_users_list(request):
         for user in users_page
     ]
 
-    return Response(
-        {
-            "results": data,
-            "page": page,
-            "page_size": page_size,
-            "total": total,
-            "pages": (total + page_size - 1) // page_size,
-        }
-    )
+    return paginator.get_paginated_response(data)
 
 
 @api_view(["GET"])
@@ -194,8 +182,6 @@ def activity_log(request):
     """
     Get activity log for debugging/monitoring federation.
     """
-    page = int(request.query_params.get("page", 1))
-    page_size = 50
     activity_type = request.query_params.get("type")
     direction = request.query_params.get("direction")
 
@@ -206,14 +192,9 @@ def activity_log(request):
     if direction:
         activities = activities.filter(direction=direction)
 
-    activities = activities.order_by("-created_at")
-
-    # Pagination
-    start = (page - 1) * page_size
-    end = start + page_size
-    total = activities.count()
-
-    activities_page = activities[start:end]
+    paginator = KeysetPagination()
+    paginator.page_size = 50
+    activities_page = paginator.paginate_queryset(activities, request)
 
     data = [
         {
@@ -229,12 +210,4 @@ def activity_log(request):
         for act in activities_page
     ]
 
-    return Response(
-        {
-            "results": data,
-            "page": page,
-            "page_size": page_size,
-            "total": total,
-            "pages": (total + page_size - 1) // page_size,
-        }
-    )
+    return paginator.get_paginated_response(data)
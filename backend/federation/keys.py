@@ -0,0 +1,135 @@
+# backend/federation/keys.py
+"""
+Public key resolution for inbound signature verification.
+
+Keys for known actors come from the actor cache. Unknown actors are
+fetched at most once at a time: lookups in one process share the in-flight
+fetch, and across processes a Redis lock (cache.add) lets one worker fetch
+while the others wait for the key it caches. Failed lookups are negatively
+cached so a broken remote is not refetched on every delivery, and waiters
+give up after a short bound so a slow remote cannot pin request workers.
+"""
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import actor_cache
+from .http_client import submit_async
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 0.25
+
+_inflight = {}  # actor URI -> concurrent.futures.Future
+_inflight_lock = threading.Lock()
+
+
+def _miss_cache_key(actor_uri: str) -> str:
+    return f"actor_key_miss:{actor_uri}"
+
+
+def _lock_cache_key(actor_uri: str) -> str:
+    return f"actor_key_lock:{actor_uri}"
+
+
+def _fetch_timeout() -> float:
+    return getattr(settings, "ACTIVITYPUB_KEY_FETCH_TIMEOUT", 10)
+
+
+def _cached_key(actor_uri: str):
+    """Return (found, pem) from the actor cache or the negative cache"""
+    record = actor_cache.get_actor(actor_uri)
+    if record and record.public_key_pem:
+        return True, record.public_key_pem
+    if cache.get(_miss_cache_key(actor_uri)):
+        return True, None
+    return False, None
+
+
+async def _fetch_public_key(actor_uri: str) -> Optional[str]:
+    """Fetch the actor; refresh_actor stores it in the actor cache"""
+    record = await actor_cache.refresh_actor(actor_uri)
+    return record.public_key_pem if record else None
+
+
+async def _resolve_and_publish(actor_uri: str) -> Optional[str]:
+    """Fetch a key under the Redis lock and publish a failure to the cache"""
+    pem = None
+    try:
+        pem = await asyncio.wait_for(_fetch_public_key(actor_uri), _fetch_timeout())
+    except asyncio.TimeoutError:
+        logger.warning(f"Timed out fetching key for {actor_uri}")
+    except Exception as e:
+        logger.error(f"Error fetching key for {actor_uri}: {e}", exc_info=True)
+
+    if not pem:
+        cache.set(
+            _miss_cache_key(actor_uri),
+            True,
+            getattr(settings, "ACTIVITYPUB_KEY_NEGATIVE_CACHE_SECONDS", 300),
+        )
+    cache.delete(_lock_cache_key(actor_uri))
+    return pem
+
+
+def _start_fetch(actor_uri: str):
+    """
+    Return the in-flight fetch for this actor, starting one if this process
+    wins the cross-worker lock. Returns None if another process holds it.
+    """
+    with _inflight_lock:
+        future = _inflight.get(actor_uri)
+        if future is not None:
+            return future
+
+        # The lock outlives the fetch timeout so a crashed holder cannot wedge it
+        if not cache.add(_lock_cache_key(actor_uri), 1, int(_fetch_timeout()) + 5):
+            return None
+
+        future = submit_async(_resolve_and_publish(actor_uri))
+        _inflight[actor_uri] = future
+
+    def _done(_):
+        with _inflight_lock:
+            _inflight.pop(actor_uri, None)
+
+    future.add_done_callback(_done)
+    return future
+
+
+def resolve_public_key(actor_uri: str) -> Optional[bytes]:
+    """
+    Return the PEM public key for an actor, or None if it cannot be resolved
+    within ACTIVITYPUB_KEY_WAIT_SECONDS.
+    """
+    found, pem = _cached_key(actor_uri)
+    if found:
+        return pem.encode("utf-8") if pem else None
+
+    wait = getattr(settings, "ACTIVITYPUB_KEY_WAIT_SECONDS", 5)
+    future = _start_fetch(actor_uri)
+    if future is not None:
+        try:
+            pem = future.result(wait)
+        except FutureTimeoutError:
+            # The fetch keeps running and fills the cache for the sender's retry
+            logger.info(f"Key fetch for {actor_uri} still pending after {wait}s")
+            return None
+        return pem.encode("utf-8") if pem else None
+
+    # Another worker is fetching; wait for it to publish the result
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        found, pem = _cached_key(actor_uri)
+        if found:
+            return pem.encode("utf-8") if pem else None
+
+    logger.info(f"Gave up waiting for key fetch of {actor_uri}")
+    return None
@@ -57,8 +57,8 @@ def _post_to_status(post):
         "tags": [],
         "emojis": [],
         "reblogs_count": 0,
-        "favourites_count": post.likes.count(),
-        "replies_count": post.comments.count(),
+        "favourites_count": post.likes_count,
+        "replies_count": post.comments_count,
         "url": f"https://{settings.INSTANCE_DOMAIN}/posts/{post.id}",
         "account": _user_to_account(post.author),
         "reblog": None,
@@ -79,9 +79,9 @@ def _user_to_account(user):
         "url": f"https://{settings.INSTANCE_DOMAIN}/users/{user.username}",
         "avatar": user.avatar_url,
         "header": "",
-        "followers_count": user.followers.count(),
-        "following_count": user.following.count(),
-        "statuses_count": user.posts.count(),
+        "followers_count": user.followers_count,
+        "following_count": user.following_count,
+        "statuses_count": user.posts_count,
     }
 
 
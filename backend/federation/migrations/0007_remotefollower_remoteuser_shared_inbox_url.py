@@ -0,0 +1,36 @@
+# Generated manually
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('federation', '0006_deliveryjob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='remoteuser',
+            name='shared_inbox_url',
+            field=models.URLField(blank=True),
+        ),
+        migrations.CreateModel(
+            name='RemoteFollower',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('activity_id', models.URLField(blank=True)),
+                ('accepted', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('local_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='remote_followers', to=settings.AUTH_USER_MODEL)),
+                ('remote_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='following_local', to='federation.remoteuser')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'unique_together': {('remote_user', 'local_user')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated manually
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('federation', '0008_activity_created_at_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='remoteuser',
+            index=models.Index(
+                fields=['-created_at', '-id'], name='federation_r_created_idx'
+            ),
+        ),
+    ]
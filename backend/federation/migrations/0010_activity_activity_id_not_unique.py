@@ -0,0 +1,22 @@
+# Generated manually
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('federation', '0009_remoteuser_created_at_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='activity',
+            name='activity_id',
+            field=models.CharField(blank=True, db_index=True, max_length=1024, null=True),
+        ),
+        # Rows logged without an id used to be stored as ""
+        migrations.RunSQL(
+            "UPDATE federation_activity SET activity_id = NULL WHERE activity_id = ''",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
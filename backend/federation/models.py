@@ -53,6 +53,7 @@ class RemoteUser(models.Model):
 
     # ActivityPub endpoints
     inbox_url = models.URLField()
+    shared_inbox_url = models.URLField(blank=True)  # endpoints.sharedInbox
     outbox_url = models.URLField(blank=True)
     public_key = models.TextField()
 
@@ -62,6 +63,10 @@ class RemoteUser(models.Model):
 
     class Meta:
         unique_together = ("instance", "username")
+        indexes = [
+            # Cursor pages of the remote user listing
+            models.Index(fields=["-created_at", "-id"], name="federation_r_created_idx"),
+        ]
 
     def __str__(self):
         return self.actor_uri
@@ -89,7 +94,9 @@ class Activity(models.Model):
     ]
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    activity_id = models.CharField(max_length=1024, unique=True)
+    # Not unique: outbound activities get one row per target inbox, and
+    # inbound activities without an id are stored with NULL
+    activity_id = models.CharField(max_length=1024, null=True, blank=True, db_index=True)
     activity_type = models.CharField(max_length=20, choices=ACTIVITY_TYPES)
     direction = models.CharField(max_length=10, choices=DIRECTIONS)
 
@@ -113,6 +120,8 @@ class Activity(models.Model):
             models.Index(fields=["direction", "-created_at"]),
             models.Index(fields=["activity_type", "direction"]),
             models.Index(fields=["processed"]),
+            # Retention pruning (federation.tasks.prune_activity_log)
+            models.Index(fields=["created_at"], name="federation_a_created_idx"),
         ]
 
     def __str__(self):
@@ -142,6 +151,25 @@ class RemoteFollow(models.Model):
         return f"{self.follower.username} -> {self.remote_user.actor_uri}"
 
 
+class RemoteFollower(models.Model):
+    """Track follows from remote users (remote user following local user)"""
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    remote_user = models.ForeignKey(RemoteUser, on_delete=models.CASCADE, related_name='following_local')
+    local_user = models.ForeignKey('accounts.User', on_delete=models.CASCADE, related_name='remote_followers')
+    
+    activity_id = models.URLField(blank=True)
+    accepted = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        unique_together = ('remote_user', 'local_user')
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.remote_user.actor_uri} -> {self.local_user.username}"
+
+
 class RemotePost(models.Model):
     """Cache posts from remote users"""
     
@@ -168,3 +196,40 @@ class RemotePost(models.Model):
     
     def __str__(self):
         return f"{self.remote_user.username}: {self.content[:50]}"
+
+
+class DeliveryJob(models.Model):
+    """Outbound delivery of one activity to one remote inbox"""
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("delivered", "Delivered"),
+        ("dead", "Dead"),  # Gave up after max retries
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    sender = models.ForeignKey('accounts.User', on_delete=models.CASCADE, related_name='delivery_jobs')
+
+    # What to deliver and where
+    activity_id = models.CharField(max_length=1024)
+    activity = models.JSONField()
+    inbox_url = models.URLField(max_length=1024)
+
+    # Retry state
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField()
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('activity_id', 'inbox_url')
+        ordering = ['next_attempt_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='federation_d_status_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.activity_id} -> {self.inbox_url} ({self.status})"
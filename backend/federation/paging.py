@@ -0,0 +1,139 @@
+# backend/federation/paging.py
+"""
+Paged ActivityPub collections.
+
+A collection is served as an OrderedCollection root with first/last links
+plus OrderedCollectionPages walked with keyset cursors on (created_at, id),
+so a page deep in history costs the same index range scan as the first.
+Rendered pages are cached under their ETag, which is derived from the
+collection's size and newest change, so edits never need explicit
+invalidation and repeat fetches can be answered with 304.
+"""
+import hashlib
+from datetime import datetime
+from typing import Callable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max, QuerySet
+from django.http import JsonResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from glade.pagination import decode_cursor, encode_cursor, keyset_page
+
+ACTIVITY_JSON = "application/activity+json"
+
+
+def collection_stats(cache_key: str, queryset: QuerySet) -> Tuple[int, Optional[datetime]]:
+    """
+    (count, newest created_at) for a collection, cached until
+    invalidate_collection_stats() or ACTIVITYPUB_COLLECTION_CACHE_SECONDS
+    """
+    key = f"ap_collection_stats:{cache_key}"
+    stats = cache.get(key)
+    if stats is None:
+        agg = queryset.aggregate(total=Count("id"), last_modified=Max("created_at"))
+        stats = (agg["total"], agg["last_modified"])
+        cache.set(key, stats, getattr(settings, "ACTIVITYPUB_COLLECTION_CACHE_SECONDS", 300))
+    return stats
+
+
+def invalidate_collection_stats(*cache_keys: str):
+    cache.delete_many([f"ap_collection_stats:{key}" for key in cache_keys])
+
+
+def ordered_collection_response(
+    request,
+    collection_id: str,
+    queryset: QuerySet,
+    render_item: Callable,
+    total: int,
+    last_modified: Optional[datetime],
+    page_size: int = None,
+) -> "JsonResponse":
+    """
+    Serve the root (no ?page) or one page of a collection, honouring
+    If-None-Match / If-Modified-Since.
+    """
+    page_size = page_size or getattr(settings, "ACTIVITYPUB_COLLECTION_PAGE_SIZE", 20)
+    page = request.GET.get("page")
+    before = request.GET.get("before")
+    after = request.GET.get("after")
+
+    validator = f"{collection_id}|{total}|{last_modified}|{page}|{before}|{after}|{page_size}"
+    etag = quote_etag(hashlib.sha256(validator.encode("utf-8")).hexdigest()[:32])
+    modified_ts = int(last_modified.timestamp()) if last_modified else None
+
+    not_modified = get_conditional_response(
+        request, etag=etag, last_modified=modified_ts
+    )
+    if not_modified is not None:
+        return not_modified
+
+    if not page:
+        body = {
+            "@context": "https://www.w3.org/ns/activitystreams",
+            "type": "OrderedCollection",
+            "id": collection_id,
+            "totalItems": total,
+        }
+        if total:
+            body["first"] = f"{collection_id}?page=true"
+            body["last"] = f"{collection_id}?page=last"
+    else:
+        cache_key = f"ap_collection:{etag}"
+        body = cache.get(cache_key)
+        if body is None:
+            body = _render_page(
+                request, collection_id, queryset, render_item, page_size, page, before, after
+            )
+            if body is None:
+                return JsonResponse({"error": "Invalid cursor"}, status=400)
+            cache.set(
+                cache_key,
+                body,
+                getattr(settings, "ACTIVITYPUB_COLLECTION_CACHE_SECONDS", 300),
+            )
+
+    response = JsonResponse(body, content_type=ACTIVITY_JSON)
+    response["ETag"] = etag
+    if modified_ts is not None:
+        response["Last-Modified"] = http_date(modified_ts)
+    return response
+
+
+def _render_page(
+    request, collection_id, queryset, render_item, page_size, page, before, after
+) -> Optional[dict]:
+    before_cursor = decode_cursor(before) if before else None
+    after_cursor = decode_cursor(after) if after else None
+    if (before and not before_cursor) or (after and not after_cursor):
+        return None
+
+    items, has_older, has_newer = keyset_page(
+        queryset,
+        page_size,
+        before=before_cursor,
+        after=after_cursor,
+        last=page == "last",
+    )
+
+    page_id = f"{collection_id}?{request.GET.urlencode()}"
+    body = {
+        "@context": "https://www.w3.org/ns/activitystreams",
+        "type": "OrderedCollectionPage",
+        "id": page_id,
+        "partOf": collection_id,
+        "orderedItems": [render_item(item) for item in items],
+    }
+    if items and has_older:
+        oldest = items[-1]
+        body["next"] = (
+            f"{collection_id}?page=true&before={encode_cursor(oldest.created_at, oldest.pk)}"
+        )
+    if items and has_newer:
+        newest = items[0]
+        body["prev"] = (
+            f"{collection_id}?page=true&after={encode_cursor(newest.created_at, newest.pk)}"
+        )
+    return body
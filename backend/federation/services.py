@@ -2,34 +2,58 @@
 """
 ActivityPub federation service - updated to use consolidated signing.
 """
+import asyncio
 import json
+import logging
 import uuid
+from collections import defaultdict
 from datetime import datetime, timezone
 from urllib.parse import urlparse
 
 import httpx
 from accounts.models import User
 from django.conf import settings
-from django.core.cache import cache
 
-from .models import Activity, RemoteInstance, RemoteUser
+from . import activity_log, actor_cache
+from .actor_cache import ActorRecord
+from .http_client import get_async_client
+from .models import RemoteInstance, RemoteUser
 from .signing import sign_request
 
+logger = logging.getLogger(__name__)
+
+
+def shared_inbox_for(actor_data: dict) -> str:
+    """Return the actor's advertised shared inbox (endpoints.sharedInbox), if any"""
+    endpoints = actor_data.get("endpoints")
+    if isinstance(endpoints, dict):
+        return endpoints.get("sharedInbox", "") or ""
+    return ""
+
+
+def same_origin(uri: str, other: str) -> bool:
+    """True when both URIs share a scheme and host, so one server answers for both"""
+    parsed, parsed_other = urlparse(uri or ""), urlparse(other or "")
+    return bool(parsed.netloc) and (parsed.scheme, parsed.netloc) == (
+        parsed_other.scheme,
+        parsed_other.netloc,
+    )
+
 
 class ActivityPubService:
     """Handle ActivityPub federation"""
 
-    def __init__(self):
-        self.client = httpx.AsyncClient(
-            timeout=30.0,
-            headers={
-                "User-Agent": f"Glade/{settings.INSTANCE_DOMAIN}",
-                "Accept": "application/activity+json, application/ld+json",
-            },
-        )
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Process-wide pooled client (see federation.http_client)"""
+        return get_async_client()
 
     async def send_activity(self, sender: User, activity: dict, inbox_url: str) -> bool:
         """Send ActivityPub activity to remote inbox"""
+        return not await self._post_activity(sender, activity, inbox_url)
+
+    async def _post_activity(self, sender: User, activity: dict, inbox_url: str) -> str:
+        """Sign and POST an activity; returns "" on success, else what went wrong"""
         try:
             # Serialize activity
             activity_json = json.dumps(activity, separators=(",", ":"))
@@ -65,16 +89,52 @@ class ActivityPubService:
             response = await self.client.post(inbox_url, content=body, headers=headers)
 
             # Log activity
-            await self._log_activity(
-                activity, "outbound", response.status_code >= 400, inbox_url
+            activity_log.log_activity(
+                activity,
+                "outbound",
+                processed=response.status_code < 400,
+                target=inbox_url,
             )
 
-            return response.status_code in [200, 201, 202]
+            if response.status_code in [200, 201, 202]:
+                return ""
+            return f"HTTP {response.status_code}"
 
         except Exception as e:
             print(f"Failed to send activity to {inbox_url}: {e}")
-            await self._log_activity(activity, "outbound", True, inbox_url, str(e))
-            return False
+            activity_log.log_activity(
+                activity, "outbound", processed=False, target=inbox_url, error_message=str(e)
+            )
+            return f"{type(e).__name__}: {e}"
+
+    async def send_activity_batch(
+        self, sender: User, activity: dict, inboxes: list
+    ) -> dict:
+        """
+        Send an activity to many inboxes concurrently.
+        Concurrency is bounded globally and per remote host, so one slow
+        server only holds up its own deliveries.
+        Returns dict mapping inbox URL to its error, "" when delivered.
+        """
+        global_limit = asyncio.Semaphore(
+            getattr(settings, "ACTIVITYPUB_DELIVERY_CONCURRENCY", 50)
+        )
+        per_host = getattr(settings, "ACTIVITYPUB_DELIVERY_PER_HOST_CONCURRENCY", 4)
+        host_limits = defaultdict(lambda: asyncio.Semaphore(per_host))
+
+        async def deliver(inbox_url: str) -> str:
+            # Take the host slot first so waiting on a busy host
+            # doesn't hold one of the global slots
+            async with host_limits[urlparse(inbox_url).netloc]:
+                async with global_limit:
+                    try:
+                        return await self._post_activity(sender, activity, inbox_url)
+                    except Exception as e:
+                        logger.error(f"Failed to deliver to {inbox_url}: {e}")
+                        return f"{type(e).__name__}: {e}"
+
+        results = await asyncio.gather(*(deliver(inbox) for inbox in inboxes))
+        return dict(zip(inboxes, results))
 
     async def follow_remote_user(self, local_user: User, actor_uri: str) -> dict:
         """Send Follow activity to remote user"""
@@ -118,6 +178,7 @@ class ActivityPubService:
                     "summary": actor_data.get("summary", ""),
                     "avatar_url": actor_data.get("icon", {}).get("url", ""),
                     "inbox_url": inbox_url,
+                    "shared_inbox_url": shared_inbox_for(actor_data),
                     "outbox_url": actor_data.get("outbox", ""),
                     "public_key": actor_data.get("publicKey", {}).get("publicKeyPem", ""),
                 }
@@ -196,12 +257,10 @@ class ActivityPubService:
             return 0
 
     async def fetch_actor(self, actor_uri: str, signed_by: User = None) -> dict:
-        """Fetch remote ActivityPub actor, optionally with signed request"""
-        # Check cache first
-        cached = cache.get(f"actor:{actor_uri}")
-        if cached:
-            return cached
-
+        """
+        Fetch remote ActivityPub actor, optionally with signed request.
+        Always goes to the network; cached lookups go through actor_cache.
+        """
         try:
             headers = {
                 "Accept": "application/activity+json, application/ld+json",
@@ -234,17 +293,23 @@ class ActivityPubService:
             if response.status_code == 200:
                 actor_data = response.json()
 
-                # Cache for 1 hour
-                cache.set(f"actor:{actor_uri}", actor_data, 3600)
+                # A server may only describe actors it hosts; otherwise it
+                # could overwrite another server's actor and public key
+                if not same_origin(actor_data.get("id"), actor_uri):
+                    logger.warning(
+                        f"Rejected actor document for {actor_uri} "
+                        f"claiming id {actor_data.get('id')!r}"
+                    )
+                    return {}
 
-                # Update/create RemoteUser
-                await self._cache_remote_user(actor_data)
+                # Update/create RemoteUser and the compact actor record
+                remote_user = await self._cache_remote_user(actor_data)
+                if remote_user is not None:
+                    actor_cache.store(ActorRecord.from_remote_user(remote_user))
 
                 return actor_data
 
         except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
             logger.error(f"Exception fetching actor {actor_uri}: {e}", exc_info=True)
 
         return {}
@@ -255,7 +320,7 @@ class ActivityPubService:
 
         actor_uri = actor_data.get("id")
         if not actor_uri:
-            return
+            return None
 
         # Extract domain
         domain = urlparse(actor_uri).netloc
@@ -263,8 +328,14 @@ class ActivityPubService:
             domain=domain
         )
 
+        # Remember the instance-wide shared inbox for delivery fan-out
+        shared_inbox = shared_inbox_for(actor_data)
+        if shared_inbox and instance.shared_inbox != shared_inbox:
+            instance.shared_inbox = shared_inbox
+            await sync_to_async(instance.save)(update_fields=["shared_inbox"])
+
         # Update or create remote user
-        await sync_to_async(RemoteUser.objects.update_or_create)(
+        remote_user, _ = await sync_to_async(RemoteUser.objects.update_or_create)(
             actor_uri=actor_uri,
             defaults={
                 "instance": instance,
@@ -273,34 +344,9 @@ class ActivityPubService:
                 "summary": actor_data.get("summary", ""),
                 "avatar_url": actor_data.get("icon", {}).get("url", ""),
                 "inbox_url": actor_data.get("inbox", ""),
+                "shared_inbox_url": shared_inbox,
                 "outbox_url": actor_data.get("outbox", ""),
                 "public_key": actor_data.get("publicKey", {}).get("publicKeyPem", ""),
             },
         )
-
-    async def _log_activity(
-        self,
-        activity: dict,
-        direction: str,
-        error: bool = False,
-        target: str = "",
-        error_msg: str = "",
-    ):
-        """Log ActivityPub activity"""
-        from asgiref.sync import sync_to_async
-
-        await sync_to_async(Activity.objects.create)(
-            activity_id=activity.get("id", ""),
-            activity_type=activity.get("type", ""),
-            direction=direction,
-            actor_uri=activity.get("actor", ""),
-            object_uri=(
-                activity.get("object", {}).get("id", "")
-                if isinstance(activity.get("object"), dict)
-                else activity.get("object", "")
-            ),
-            raw_activity=activity,
-            processed=not error,
-            error_message=error_msg,
-            target=target,
-        )
+        return remote_user
@@ -0,0 +1,25 @@
+# backend/federation/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.models import Follow
+
+from . import actor_cache
+from .models import RemoteUser
+from .paging import invalidate_collection_stats
+
+
+@receiver(post_save, sender=RemoteUser)
+@receiver(post_delete, sender=RemoteUser)
+def remote_user_changed(sender, instance, **kwargs):
+    """Drop the cached actor record and parsed keys so changes are re-read"""
+    actor_cache.invalidate(instance.actor_uri)
+
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def follow_changed(sender, instance, **kwargs):
+    """Refresh the followers/following collection counts of both users"""
+    invalidate_collection_stats(
+        f"followers:{instance.following_id}", f"following:{instance.follower_id}"
+    )
@@ -7,6 +7,8 @@ Consolidates signing/verification from activitypub app.
 import base64
 import hashlib
 import logging
+import threading
+from collections import OrderedDict
 from typing import Callable, Tuple
 
 from cryptography.exceptions import InvalidSignature
@@ -16,26 +18,83 @@ from cryptography.hazmat.primitives.asymmetric import padding
 logger = logging.getLogger(__name__)
 
 
+class _KeyCache:
+    """
+    LRU cache of parsed key objects, keyed by (key ID, PEM fingerprint).
+    The fingerprint means a rotated key never matches a stale entry.
+    """
+
+    def __init__(self, loader, maxsize: int = 1024):
+        self._loader = loader
+        self._maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, pem: bytes, key_id: str = ""):
+        cache_key = (key_id, hashlib.sha256(pem).digest())
+        with self._lock:
+            key = self._entries.get(cache_key)
+            if key is not None:
+                self._entries.move_to_end(cache_key)
+                return key
+
+        key = self._loader(pem)
+        with self._lock:
+            self._entries[cache_key] = key
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+        return key
+
+    def invalidate(self, owner: str):
+        """Drop entries whose key ID is owner or owner#fragment"""
+        with self._lock:
+            for cache_key in list(self._entries):
+                if cache_key[0].split("#")[0] == owner:
+                    del self._entries[cache_key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_private_keys = _KeyCache(
+    lambda pem: serialization.load_pem_private_key(pem, password=None), maxsize=256
+)
+_public_keys = _KeyCache(serialization.load_pem_public_key, maxsize=4096)
+
+
+def invalidate_cached_keys(actor_uri: str):
+    """Forget parsed keys for an actor, e.g. when RemoteUser.public_key rotates."""
+    _private_keys.invalidate(actor_uri)
+    _public_keys.invalidate(actor_uri)
+
+
+def load_public_key(public_key_pem: bytes, key_id: str = ""):
+    """Return the parsed public key, reusing the cached object when warm."""
+    return _public_keys.get(public_key_pem, key_id)
+
+
 def digest_payload(body_bytes: bytes) -> str:
     """Return Digest header value for the body."""
     sha256 = hashlib.sha256(body_bytes).digest()
     return "SHA-256=" + base64.b64encode(sha256).decode("ascii")
 
 
-def sign_bytes_rsa(private_key_pem: bytes, signing_string: bytes) -> str:
+def sign_bytes_rsa(
+    private_key_pem: bytes, signing_string: bytes, key_id: str = ""
+) -> str:
     """Sign bytes with RSA-SHA256 and return base64 signature string."""
-    private_key = serialization.load_pem_private_key(
-        private_key_pem, password=None)
+    private_key = _private_keys.get(private_key_pem, key_id)
     sig = private_key.sign(signing_string, padding.PKCS1v15(), hashes.SHA256())
     return base64.b64encode(sig).decode("ascii")
 
 
 def verify_bytes_rsa(
-    public_key_pem: bytes, signing_string: bytes, signature_b64: str
+    public_key_pem: bytes, signing_string: bytes, signature_b64: str, key_id: str = ""
 ) -> bool:
     """Verify RSA-SHA256 signature. Return True if valid."""
     try:
-        public_key = serialization.load_pem_public_key(public_key_pem)
+        public_key = _public_keys.get(public_key_pem, key_id)
         signature = base64.b64decode(signature_b64)
         public_key.verify(
             signature, signing_string, padding.PKCS1v15(), hashes.SHA256()
@@ -98,7 +157,7 @@ def sign_request(
         headers_list = "(request-target) host date"
     
     signing_string = build_signing_string(headers)
-    signature_b64 = sign_bytes_rsa(private_key_pem, signing_string)
+    signature_b64 = sign_bytes_rsa(private_key_pem, signing_string, key_id)
     
     sig_header = (
         f'keyId="{key_id}",'
@@ -176,5 +235,5 @@ def verify_request_signature(
         return False, "unknown keyId"
 
     # Verify
-    ok = verify_bytes_rsa(public_key_pem, signing_string, signature_b64)
+    ok = verify_bytes_rsa(public_key_pem, signing_string, signature_b64, key_id)
     return (ok, "verified" if ok else "invalid signature")
@@ -4,69 +4,218 @@ Celery tasks for ActivityPub delivery
 """
 import json
 import logging
+import random
+from datetime import timedelta
 
 import httpx
 from accounts.models import Follow, User
-from asgiref.sync import async_to_sync
 from celery import shared_task
 from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce, NullIf
+from django.utils import timezone
 from posts.models import Post
 
-from .models import Activity, RemoteUser
+from . import activity_log, dedupe
+from .handlers import ActivityHandler
+from .http_client import run_async
+from .models import DeliveryJob, RemoteUser
 from .services import ActivityPubService
 
 logger = logging.getLogger(__name__)
 
+# How long a claimed job stays invisible to other workers
+DELIVERY_LEASE_SECONDS = 300
+DELIVERY_MAX_BACKOFF_SECONDS = 6 * 3600
 
-@shared_task(bind=True, max_retries=5, autoretry_for=(Exception,), retry_backoff=True)
-def deliver_activity(self, activity_dict: dict, inboxes: list):
+
+@shared_task
+def deliver_activity(activity_dict: dict, inboxes: list):
     """
     Deliver an activity to multiple remote inboxes.
-    Uses ActivityPubService for signing and delivery.
+    Queues one DeliveryJob per inbox and attempts them right away; failed
+    inboxes are retried independently by process_delivery_queue.
     """
+    actor_uri = activity_dict.get("actor")
+    activity_id = activity_dict.get("id")
+
+    # Find local user for signing
     try:
-        actor_uri = activity_dict.get("actor")
-        activity_id = activity_dict.get("id")
-
-        # Find local user for signing
-        try:
-            # Extract username from actor URI
-            username = actor_uri.rstrip("/").split("/")[-1]
-            local_user = User.objects.get(username=username)
-        except User.DoesNotExist:
-            logger.error(f"Local user not found for actor {actor_uri}")
-            return
+        # Extract username from actor URI
+        username = actor_uri.rstrip("/").split("/")[-1]
+        local_user = User.objects.get(username=username)
+    except User.DoesNotExist:
+        logger.error(f"Local user not found for actor {actor_uri}")
+        return
+
+    now = timezone.now()
+    DeliveryJob.objects.bulk_create(
+        [
+            DeliveryJob(
+                sender=local_user,
+                activity_id=activity_id,
+                activity=activity_dict,
+                inbox_url=inbox,
+                next_attempt_at=now,
+            )
+            for inbox in set(inboxes)
+        ],
+        ignore_conflicts=True,  # Already queued for this inbox
+    )
+
+    process_delivery_queue(activity_id=activity_id)
+
 
-        # Use ActivityPubService to send
+@shared_task
+def process_delivery_queue(activity_id: str = None, batch_size: int = None):
+    """
+    Attempt delivery jobs that are due.
+    Each job keeps its own attempt count and backoff, so a retry only
+    re-sends to the inboxes that actually failed. A full batch queues
+    another run right away instead of waiting for the next beat tick.
+    """
+    if batch_size is None:
+        batch_size = getattr(settings, "ACTIVITYPUB_DELIVERY_BATCH_SIZE", 500)
+    jobs = _claim_due_jobs(batch_size, activity_id)
+    if not jobs:
+        return 0
+    if len(jobs) >= batch_size:
+        process_delivery_queue.delay(activity_id=activity_id, batch_size=batch_size)
+
+    # One concurrent batch per activity
+    batches = {}
+    for job in jobs:
+        batches.setdefault(job.activity_id, []).append(job)
+
+    delivered = 0
+    for batch_activity_id, batch in batches.items():
         ap_service = ActivityPubService()
-        success_count = 0
-        failed_inboxes = []
-
-        for inbox in inboxes:
-            try:
-                success = async_to_sync(ap_service.send_activity)(
-                    local_user, activity_dict, inbox
-                )
-                if success:
-                    success_count += 1
-                else:
-                    failed_inboxes.append(inbox)
-            except Exception as e:
-                logger.error(f"Failed to deliver to {inbox}: {e}")
-                failed_inboxes.append(inbox)
+        results = run_async(
+            ap_service.send_activity_batch(
+                batch[0].sender, batch[0].activity, [job.inbox_url for job in batch]
+            )
+        )
+
+        ok_ids = [job.id for job in batch if results.get(job.inbox_url) == ""]
+        DeliveryJob.objects.filter(id__in=ok_ids).update(
+            status="delivered",
+            attempts=F("attempts") + 1,
+            last_error="",
+            updated_at=timezone.now(),
+        )
+        delivered += len(ok_ids)
+
+        for job in batch:
+            error = results.get(job.inbox_url, "not attempted")
+            if error:
+                _schedule_retry(job, error)
 
         logger.info(
-            f"Delivered activity {activity_id} to {success_count}/{len(inboxes)} inboxes"
+            f"Delivered activity {batch_activity_id} to {len(ok_ids)}/{len(batch)} inboxes"
+        )
+
+    return delivered
+
+
+@shared_task
+def cleanup_delivery_jobs(days: int = 7):
+    """Remove delivered jobs older than the given number of days"""
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted = DeliveryJob.objects.filter(
+        status="delivered", updated_at__lt=cutoff
+    ).delete()[0]
+    logger.info(f"Deleted {deleted} delivered jobs")
+    return deleted
+
+
+def _claim_due_jobs(limit: int, activity_id: str = None) -> list:
+    """
+    Lock and lease due jobs so concurrent workers never send the same job.
+    The lease pushes next_attempt_at forward; if this worker dies the job
+    becomes due again once the lease runs out.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        due = DeliveryJob.objects.select_for_update(skip_locked=True).filter(
+            status="pending", next_attempt_at__lte=now
+        )
+        if activity_id:
+            due = due.filter(activity_id=activity_id)
+        jobs = list(due.select_related("sender").order_by("next_attempt_at")[:limit])
+
+        DeliveryJob.objects.filter(id__in=[job.id for job in jobs]).update(
+            next_attempt_at=now + timedelta(seconds=DELIVERY_LEASE_SECONDS)
+        )
+    return jobs
+
+
+def _schedule_retry(job: DeliveryJob, error: str):
+    """Back off exponentially, or dead-letter the job after max retries"""
+    job.attempts += 1
+    job.last_error = error
+    max_retries = getattr(settings, "ACTIVITYPUB_DELIVERY_MAX_RETRIES", 5)
+
+    if job.attempts > max_retries:
+        job.status = "dead"
+        logger.warning(
+            f"Giving up on {job.inbox_url} for {job.activity_id} after {job.attempts} attempts"
+        )
+    else:
+        base = getattr(settings, "ACTIVITYPUB_DELIVERY_RETRY_BASE_SECONDS", 60)
+        delay = min(base * 2 ** (job.attempts - 1), DELIVERY_MAX_BACKOFF_SECONDS)
+        # Jitter so retries to one host don't all land at once
+        delay = delay * random.uniform(1.0, 1.25)
+        job.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+
+    job.save(
+        update_fields=["attempts", "last_error", "status", "next_attempt_at", "updated_at"]
+    )
+
+
+@shared_task(
+    rate_limit=getattr(settings, "ACTIVITYPUB_INBOX_RATE_LIMIT", None),
+    # The message is the only copy of the activity: acknowledge it only once
+    # processed, and requeue it if the worker dies mid-task
+    acks_late=True,
+    reject_on_worker_lost=True,
+)
+def process_inbox_activity(activity: dict):
+    """
+    Process a verified inbound activity queued by the inbox view.
+    Routed to the federation_inbox queue so inbox bursts are worked off at
+    a controlled rate instead of holding web workers. If processing fails,
+    the dedupe claim is released so the sender's retry is accepted.
+    """
+    handler = ActivityHandler()
+    try:
+        result = run_async(handler.handle_activity(activity))
+    except Exception as e:
+        dedupe.release(activity.get("id"))
+        activity_log.log_activity(
+            activity, "inbound", processed=False, error_message=f"{type(e).__name__}: {e}"
         )
+        raise
 
-        # Retry failed inboxes
-        if failed_inboxes and self.request.retries < self.max_retries:
-            raise Exception(
-                f"Failed to deliver to {len(failed_inboxes)} inboxes")
+    failed = result.get("status") == "error"
+    if failed:
+        dedupe.release(activity.get("id"))
+    activity_log.log_activity(
+        activity,
+        "inbound",
+        processed=not failed,
+        error_message=result.get("reason", "") if failed else "",
+    )
+    logger.info(f"Processed {activity.get('type')} {activity.get('id')}: {result}")
+    return result
 
-    except Exception as exc:
-        logger.exception("deliver_activity error")
-        raise self.retry(exc=exc)
+
+@shared_task
+def prune_activity_log(days: int = None):
+    """Apply the activity log retention policy"""
+    deleted = activity_log.prune(days)
+    logger.info(f"Pruned {deleted} activity log rows")
+    return deleted
 
 
 @shared_task
@@ -202,19 +351,31 @@ def federate_delete(
 
 
 def get_federation_targets(author: User, post: Post) -> list:
-    """Get list of inbox URLs to federate to"""
-    inboxes = set()
-
-    # 1. Get remote followers (remote users following this local user)
+    """
+    Get list of inbox URLs to federate to.
+    Followers on the same server are collapsed onto its shared inbox, so
+    each remote server gets one request instead of one per follower.
+    """
     from .models import RemoteFollower
-    remote_followers = RemoteFollower.objects.filter(
-        local_user=author,
-        accepted=True
-    ).select_related('remote_user')
-    
-    for follower in remote_followers:
-        if follower.remote_user.inbox_url:
-            inboxes.add(follower.remote_user.inbox_url)
+
+    # 1. Get remote followers (remote users following this local user),
+    #    preferring the actor's shared inbox, then the instance's, then
+    #    the personal inbox
+    follower_inboxes = (
+        RemoteFollower.objects.filter(local_user=author, accepted=True)
+        .annotate(
+            target_inbox=Coalesce(
+                NullIf("remote_user__shared_inbox_url", Value("")),
+                NullIf("remote_user__instance__shared_inbox", Value("")),
+                NullIf("remote_user__inbox_url", Value("")),
+            )
+        )
+        .filter(target_inbox__isnull=False)
+        .values_list("target_inbox", flat=True)
+        .order_by()
+        .distinct()
+    )
+    inboxes = set(follower_inboxes)
     
     # 2. If replying to a federated post, include original author
     if hasattr(post, 'reply_to') and post.reply_to:
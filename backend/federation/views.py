@@ -2,9 +2,10 @@
 import json
 import logging
 
-from accounts.models import User
-from asgiref.sync import async_to_sync
+import httpx
+from accounts.models import Follow, User
 from django.conf import settings
+from django.db.models import Count, Max
 from django.http import HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404
 from django.views.decorators.csrf import csrf_exempt
@@ -13,9 +14,13 @@ from rest_framework.decorators import throttle_classes
 from accounts.throttles import FederationInboxThrottle
 from posts.models import Post
 
-from .handlers import ActivityHandler
+from . import dedupe
+from .http_client import get_client, run_async
+from .keys import resolve_public_key
 from .models import RemoteUser
+from .paging import collection_stats, ordered_collection_response
 from .signing import verify_request_signature
+from .tasks import process_inbox_activity
 
 logger = logging.getLogger(__name__)
 
@@ -94,23 +99,43 @@ def actor_view(request, username):
 @require_http_methods(["POST"])
 @throttle_classes([FederationInboxThrottle])
 def inbox_view(request, username=None):
-    """Handle incoming ActivityPub activities"""
+    """
+    Accept incoming ActivityPub activities.
+    Only validation and signature checks happen here; the activity is
+    processed and logged in the background by process_inbox_activity.
+    """
     try:
         activity = json.loads(request.body)
     except json.JSONDecodeError:
         return JsonResponse({"error": "Invalid JSON"}, status=400)
 
+    if not isinstance(activity, dict) or not activity.get("type"):
+        return JsonResponse({"error": "Invalid activity"}, status=400)
+
+    # Redeliveries of accepted activities stop here, before any crypto or DB work
+    if dedupe.is_duplicate(activity.get("id")):
+        return JsonResponse({"status": "duplicate"}, status=202)
+
     # Verify HTTP signature
     if not _verify_signature(request):
         logger.warning(f"Invalid signature for activity {activity.get('id')}")
         return JsonResponse({"error": "Invalid signature"}, status=401)
 
-    # Process activity
-    handler = ActivityHandler()
-    result = async_to_sync(handler.handle_activity)(activity, request)
+    activity_id = activity.get("id")
+    if not dedupe.claim(activity_id):
+        dedupe.record_duplicate()
+        return JsonResponse({"status": "duplicate"}, status=202)
+
+    try:
+        process_inbox_activity.delay(activity)
+    except Exception as e:
+        # Release the claim so the sender's retry is not mistaken for a duplicate
+        logger.error(f"Failed to queue inbox activity {activity_id}: {e}")
+        dedupe.release(activity_id)
+        return JsonResponse({"error": "Temporarily unavailable"}, status=503)
 
     # ActivityPub spec says to return 202 Accepted for async processing
-    return JsonResponse(result, status=202)
+    return JsonResponse({"status": "accepted"}, status=202)
 
 
 @csrf_exempt
@@ -123,91 +148,65 @@ def shared_inbox_view(request):
 
 @require_http_methods(["GET"])
 def outbox_view(request, username):
-    """Return user's outbox (collection of activities)"""
+    """Return user's outbox: a paged collection of Create activities"""
     user = get_object_or_404(User, username=username)
 
-    # Get recent public posts
-    posts = Post.objects.filter(author=user, visibility=1).order_by(  # Public only
-        "-created_at"
-    )[:20]
+    posts = Post.objects.filter(author=user, visibility=1)  # Public only
+    stats = posts.aggregate(total=Count("id"), last_modified=Max("updated_at"))
 
-    # Convert to activities
-    items = []
-    for post in posts:
-        note = post.to_activitypub_note()
-        activity = {
+    def render_item(post):
+        return {
             "@context": "https://www.w3.org/ns/activitystreams",
             "type": "Create",
             "id": f"{post.activity_id}/activity",
             "actor": user.actor_uri,
             "published": post.created_at.isoformat(),
-            "object": note,
+            "object": post.to_activitypub_note(),
         }
-        items.append(activity)
-
-    outbox = {
-        "@context": "https://www.w3.org/ns/activitystreams",
-        "type": "OrderedCollection",
-        "id": f"https://{settings.INSTANCE_DOMAIN}/users/{username}/outbox",
-        "totalItems": len(items),
-        "orderedItems": items,
-    }
 
-    return JsonResponse(outbox, content_type="application/activity+json")
+    return ordered_collection_response(
+        request,
+        collection_id=f"https://{settings.INSTANCE_DOMAIN}/users/{username}/outbox",
+        queryset=posts.select_related("author", "reply_to"),
+        render_item=render_item,
+        total=stats["total"],
+        last_modified=stats["last_modified"],
+    )
 
 
 @require_http_methods(["GET"])
 def followers_view(request, username):
-    """Return user's followers collection"""
+    """Return user's followers collection (count-only root, keyset pages)"""
     user = get_object_or_404(User, username=username)
-
-    # Get follower URIs
-    from accounts.models import Follow
-
-    followers = Follow.objects.filter(following=user, accepted=True).select_related(
-        "follower"
+    follows = Follow.objects.filter(following=user, accepted=True)
+    total, last_modified = collection_stats(f"followers:{user.id}", follows)
+
+    return ordered_collection_response(
+        request,
+        collection_id=f"https://{settings.INSTANCE_DOMAIN}/users/{username}/followers",
+        queryset=follows.select_related("follower").only("id", "created_at", "follower__actor_uri"),
+        render_item=lambda follow: follow.follower.actor_uri,
+        total=total,
+        last_modified=last_modified,
     )
 
-    follower_uris = [
-        f.follower.actor_uri for f in followers if hasattr(f.follower, "actor_uri")
-    ]
-
-    collection = {
-        "@context": "https://www.w3.org/ns/activitystreams",
-        "type": "OrderedCollection",
-        "id": f"https://{settings.INSTANCE_DOMAIN}/users/{username}/followers",
-        "totalItems": len(follower_uris),
-        "orderedItems": follower_uris,
-    }
-
-    return JsonResponse(collection, content_type="application/activity+json")
-
 
 @require_http_methods(["GET"])
 def following_view(request, username):
-    """Return user's following collection"""
+    """Return user's following collection (count-only root, keyset pages)"""
     user = get_object_or_404(User, username=username)
-
-    from accounts.models import Follow
-
-    following = Follow.objects.filter(follower=user, accepted=True).select_related(
-        "following"
+    follows = Follow.objects.filter(follower=user, accepted=True)
+    total, last_modified = collection_stats(f"following:{user.id}", follows)
+
+    return ordered_collection_response(
+        request,
+        collection_id=f"https://{settings.INSTANCE_DOMAIN}/users/{username}/following",
+        queryset=follows.select_related("following").only("id", "created_at", "following__actor_uri"),
+        render_item=lambda follow: follow.following.actor_uri,
+        total=total,
+        last_modified=last_modified,
     )
 
-    following_uris = [
-        f.following.actor_uri for f in following if hasattr(f.following, "actor_uri")
-    ]
-
-    collection = {
-        "@context": "https://www.w3.org/ns/activitystreams",
-        "type": "OrderedCollection",
-        "id": f"https://{settings.INSTANCE_DOMAIN}/users/{username}/following",
-        "totalItems": len(following_uris),
-        "orderedItems": following_uris,
-    }
-
-    return JsonResponse(collection, content_type="application/activity+json")
-
 
 @require_http_methods(["GET"])
 def post_view(request, post_id):
@@ -274,96 +273,6 @@ def nodeinfo(request):
     )
 
 
-def _fetch_actor_sync(actor_uri: str) -> dict:
-    """Fetch actor synchronously with automatic signed request retry"""
-    import httpx
-    from datetime import datetime, timezone
-    from urllib.parse import urlparse
-    from .signing import sign_request
-    
-    # Check cache first
-    from django.core.cache import cache
-    cached = cache.get(f"actor:{actor_uri}")
-    if cached:
-        return cached
-    
-    try:
-        with httpx.Client(timeout=30.0) as client:
-            headers = {
-                "Accept": "application/activity+json, application/ld+json",
-                "User-Agent": f"Glade/{settings.INSTANCE_DOMAIN}",
-            }
-            
-            # Try unsigned first
-            response = client.get(actor_uri, headers=headers, follow_redirects=True)
-            
-            # If 401/403, retry with signature
-            if response.status_code in [401, 403]:
-                logger.info(f"Actor fetch requires signed request: {actor_uri}")
-                local_user = User.objects.filter(is_active=True).first()
-                if local_user:
-                    parsed_url = urlparse(actor_uri)
-                    now = datetime.now(timezone.utc)
-                    date = now.strftime("%a, %d %b %Y %H:%M:%S GMT")
-                    
-                    private_key_pem = local_user.private_key.encode("utf-8")
-                    key_id = f"{local_user.actor_uri}#main-key"
-                    
-                    sig_headers = sign_request(
-                        private_key_pem=private_key_pem,
-                        key_id=key_id,
-                        method="GET",
-                        path=parsed_url.path or "/",
-                        host=parsed_url.netloc,
-                        body=b"",
-                        date=date,
-                    )
-                    headers.update(sig_headers)
-                    headers["Host"] = parsed_url.netloc
-                    
-                    response = client.get(actor_uri, headers=headers, follow_redirects=True)
-            
-            if response.status_code == 200:
-                actor_data = response.json()
-                
-                # Cache for 1 hour
-                cache.set(f"actor:{actor_uri}", actor_data, 3600)
-                
-                # Store in database
-                from .models import RemoteInstance, RemoteUser
-                domain = urlparse(actor_uri).netloc
-                instance, _ = RemoteInstance.objects.get_or_create(domain=domain)
-                
-                # Extract username from actor_uri if preferredUsername is missing
-                username = actor_data.get("preferredUsername", "")
-                if not username:
-                    # Try to extract from actor_uri (e.g., /users/frank or /frank)
-                    username = actor_uri.rstrip('/').split('/')[-1]
-                
-                RemoteUser.objects.update_or_create(
-                    actor_uri=actor_uri,
-                    defaults={
-                        "instance": instance,
-                        "username": username,
-                        "display_name": actor_data.get("name", ""),
-                        "summary": actor_data.get("summary", ""),
-                        "avatar_url": actor_data.get("icon", {}).get("url", ""),
-                        "inbox_url": actor_data.get("inbox", ""),
-                        "outbox_url": actor_data.get("outbox", ""),
-                        "public_key": actor_data.get("publicKey", {}).get("publicKeyPem", ""),
-                    },
-                )
-                
-                return actor_data
-            else:
-                logger.warning(f"Failed to fetch actor {actor_uri}: HTTP {response.status_code}")
-                
-    except Exception as e:
-        logger.error(f"Exception fetching actor {actor_uri}: {e}", exc_info=True)
-    
-    return {}
-
-
 def _verify_signature(request) -> bool:
     """Verify HTTP signature on incoming request"""
     if not settings.FEDERATION_ENABLED:
@@ -388,25 +297,7 @@ def _verify_signature(request) -> bool:
         """Look up public key for verification"""
         try:
             # Extract actor URI from key_id (format: actor_uri#main-key)
-            actor_uri = key_id.split("#")[0]
-
-            # Try to get from database
-            remote_user = RemoteUser.objects.filter(actor_uri=actor_uri).first()
-            if remote_user and remote_user.public_key:
-                return remote_user.public_key.encode("utf-8")
-
-            # Fetch from remote if not cached
-            actor_data = _fetch_actor_sync(actor_uri)
-            
-            if actor_data:
-                public_key = actor_data.get("publicKey", {}).get("publicKeyPem", "")
-                if public_key:
-                    return public_key.encode("utf-8")
-                else:
-                    logger.warning(f"No publicKey in actor data for {actor_uri}")
-            else:
-                logger.warning(f"Failed to fetch actor data for {actor_uri}")
-
+            return resolve_public_key(key_id.split("#")[0])
         except Exception as e:
             logger.error(f"Error looking up key {key_id}: {e}", exc_info=True)
 
@@ -511,8 +402,6 @@ def federated_timeline(request):
 
 def fetch_remote_actor_proxy(request):
     """Proxy requests to fetch remote actor data with signed request"""
-    import httpx
-    import asyncio
     from asgiref.sync import sync_to_async
     from .services import ActivityPubService
     from accounts.models import User
@@ -541,7 +430,7 @@ def fetch_remote_actor_proxy(request):
             raise e
     
     try:
-        actor_data = asyncio.run(fetch_with_signature())
+        actor_data = run_async(fetch_with_signature())
         if actor_data:
             return JsonResponse(actor_data)
         else:
@@ -555,8 +444,6 @@ def fetch_remote_actor_proxy(request):
 
 def lookup_remote_user(request):
     """Lookup remote user via WebFinger"""
-    import httpx
-    
     handle = request.GET.get("handle", "").strip()
     if not handle:
         return JsonResponse({"error": "Handle required"}, status=400)
@@ -575,25 +462,30 @@ def lookup_remote_user(request):
         webfinger_url = f"https://{domain}/.well-known/webfinger"
         params = {"resource": f"acct:{handle}"}
         
-        with httpx.Client(timeout=10.0, follow_redirects=True) as client:
-            response = client.get(webfinger_url, params=params)
-            
-            if response.status_code == 200:
-                try:
-                    return JsonResponse(response.json())
-                except Exception as json_error:
-                    logger.error(f"Invalid JSON from {domain}: {json_error}")
-                    return JsonResponse(
-                        {"error": f"Invalid response from {domain}"}, 
-                        status=502
-                    )
-            else:
-                logger.warning(f"WebFinger lookup failed for {handle}: HTTP {response.status_code}")
+        response = get_client().get(
+            webfinger_url,
+            params=params,
+            headers={"Accept": "application/jrd+json, application/json"},
+            timeout=10.0,
+            follow_redirects=True,
+        )
+        
+        if response.status_code == 200:
+            try:
+                return JsonResponse(response.json())
+            except Exception as json_error:
+                logger.error(f"Invalid JSON from {domain}: {json_error}")
                 return JsonResponse(
-                    {"error": f"User not found on {domain} (HTTP {response.status_code})"}, 
-                    status=404
+                    {"error": f"Invalid response from {domain}"}, 
+                    status=502
                 )
-                
+        else:
+            logger.warning(f"WebFinger lookup failed for {handle}: HTTP {response.status_code}")
+            return JsonResponse(
+                {"error": f"User not found on {domain} (HTTP {response.status_code})"}, 
+                status=404
+            )
+            
     except httpx.TimeoutException:
         logger.error(f"Timeout looking up remote user {handle}")
         return JsonResponse(
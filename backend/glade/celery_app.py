@@ -1,6 +1,7 @@
 # backend/glade/celery.py
 import os
 from celery import Celery
+from celery.signals import worker_process_shutdown
 
 # Set Django settings module (defaults to development if not provided)
 os.environ.setdefault(
@@ -17,6 +18,19 @@ app.config_from_object("django.conf:settings", namespace="CELERY")
 app.autodiscover_tasks()
 
 
+@worker_process_shutdown.connect
+def close_federation_http(**kwargs):
+    """
+    Prefork children exit without running atexit; flush buffered activity
+    log rows and close pooled connections here
+    """
+    from federation import activity_log
+    from federation.http_client import close
+
+    activity_log.flush()
+    close()
+
+
 @app.task(bind=True)
 def debug_task(self):
     print(f"Request: {self.request!r}")
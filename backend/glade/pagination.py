@@ -0,0 +1,182 @@
+# backend/glade/pagination.py
+"""
+Keyset pagination on (created_at, id).
+
+Pages are walked with opaque cursors instead of page numbers, so a deep
+page costs the same index range scan as the first and no COUNT(*) runs on
+each request. Lists that need a total can ask for ?count=estimate, which
+reads the planner's row estimate (pg_class statistics) instead of counting.
+"""
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Optional, Tuple
+
+from django.db import connections
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def encode_cursor(created_at: datetime, pk) -> str:
+    raw = f"{created_at.isoformat()}|{pk}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[datetime, str]]:
+    """Return (created_at, pk), or None for a malformed cursor (pks are UUIDs)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, pk = (
+            base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8").split("|", 1)
+        )
+        return datetime.fromisoformat(created_at), str(uuid.UUID(pk))
+    except (ValueError, UnicodeError):
+        return None
+
+
+def keyset_page(
+    queryset: QuerySet,
+    size: int,
+    before: Tuple[datetime, str] = None,
+    after: Tuple[datetime, str] = None,
+    last: bool = False,
+) -> Tuple[list, bool, bool]:
+    """
+    Return (items newest first, has_older, has_newer) for one page.
+    before/after are decoded cursors; last selects the oldest page.
+    """
+    if before:
+        created_at, pk = before
+        rows = list(
+            queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+            ).order_by("-created_at", "-id")[: size + 1]
+        )
+        return rows[:size], len(rows) > size, True
+
+    if after or last:
+        if after:
+            created_at, pk = after
+            queryset = queryset.filter(
+                Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+            )
+        rows = list(queryset.order_by("created_at", "id")[: size + 1])
+        has_newer = len(rows) > size
+        rows = rows[:size]
+        rows.reverse()
+        return rows, bool(after), has_newer
+
+    rows = list(queryset.order_by("-created_at", "-id")[: size + 1])
+    return rows[:size], len(rows) > size, False
+
+
+def estimated_count(queryset: QuerySet) -> int:
+    """
+    Approximate number of rows in a queryset without counting them: the
+    table's reltuples when unfiltered, otherwise the planner's estimate.
+    Exact on databases other than PostgreSQL.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return queryset.count()
+
+    queryset = queryset.order_by()
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+            # -1 until the table has been vacuumed or analyzed
+            if row and row[0] >= 0:
+                return row[0]
+
+        sql, params = queryset.query.sql_with_params()
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination newest first: ?before=<cursor> walks to older items,
+    ?after=<cursor> back to newer ones, ?limit sets the page size and
+    ?count=estimate adds an estimated total.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "limit"
+    max_page_size = 100
+    before_query_param = "before"
+    after_query_param = "after"
+    count_query_param = "count"
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_cursors(self, request):
+        """Decoded (before, after) cursors; raises NotFound when malformed"""
+        cursors = []
+        for param in (self.before_query_param, self.after_query_param):
+            value = request.query_params.get(param)
+            cursor = decode_cursor(value) if value else None
+            if value and cursor is None:
+                raise NotFound(self.invalid_cursor_message)
+            cursors.append(cursor)
+        return tuple(cursors)
+
+    def wants_count(self, request) -> bool:
+        return request.query_params.get(self.count_query_param) == "estimate"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        before, after = self.get_cursors(request)
+        items, has_older, has_newer = keyset_page(
+            queryset, self.get_page_size(request), before=before, after=after
+        )
+        count = estimated_count(queryset) if self.wants_count(request) else None
+        self.set_page(request, items, has_older, has_newer, count)
+        return items
+
+    def set_page(self, request, items, has_older: bool, has_newer: bool, count=None):
+        """Record a page, possibly fetched elsewhere (e.g. from Redis), for the response"""
+        self.request = request
+        self.items = items
+        self.has_older = has_older
+        self.has_newer = has_newer
+        self.count = count
+
+    def _link(self, param: str, item) -> str:
+        url = self.request.build_absolute_uri()
+        for other in (self.before_query_param, self.after_query_param):
+            url = remove_query_param(url, other)
+        return replace_query_param(url, param, encode_cursor(item.created_at, item.pk))
+
+    def get_next_link(self) -> Optional[str]:
+        if not (self.items and self.has_older):
+            return None
+        return self._link(self.before_query_param, self.items[-1])
+
+    def get_previous_link(self) -> Optional[str]:
+        if not (self.items and self.has_newer):
+            return None
+        return self._link(self.after_query_param, self.items[0])
+
+    def get_paginated_response(self, data):
+        body = {"next": self.get_next_link(), "previous": self.get_previous_link()}
+        if self.count is not None:
+            body["count"] = self.count
+        body["results"] = data
+        return Response(body)
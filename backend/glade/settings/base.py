@@ -99,6 +99,50 @@ CACHES = {
     }
 }
 
+# Materialized home timelines (posts/timeline.py): entries kept per user, and
+# how long a timeline lives without reads before it is rebuilt on demand
+HOME_TIMELINE_SIZE = config("HOME_TIMELINE_SIZE", default=800, cast=int)
+HOME_TIMELINE_TTL = config("HOME_TIMELINE_TTL", default=7 * 24 * 3600, cast=int)
+
+# Nearby feeds (posts/nearby.py): newest posts cached per geohash cell, and
+# how long a cell's list is kept before it is rebuilt
+NEARBY_CELL_MAX_POSTS = config("NEARBY_CELL_MAX_POSTS", default=200, cast=int)
+NEARBY_CELL_CACHE_SECONDS = config("NEARBY_CELL_CACHE_SECONDS", default=300, cast=int)
+
+# Global per-IP rate limit (privacy/middleware.py). Each worker answers most
+# checks from a local bucket and reports to Redis every BATCH requests or
+# SYNC_SECONDS, so a worker may overshoot the limit by at most BATCH requests
+GLOBAL_RATE_LIMIT = config("GLOBAL_RATE_LIMIT", default=200, cast=int)
+GLOBAL_RATE_LIMIT_WINDOW = config("GLOBAL_RATE_LIMIT_WINDOW", default=60, cast=int)
+GLOBAL_RATE_LIMIT_BATCH = config("GLOBAL_RATE_LIMIT_BATCH", default=10, cast=int)
+GLOBAL_RATE_LIMIT_SYNC_SECONDS = config("GLOBAL_RATE_LIMIT_SYNC_SECONDS", default=5, cast=int)
+
+# Notification preferences cache (notifications/preferences.py): how long
+# entries live in Redis and in each process, and the per-process entry cap
+NOTIFICATION_PREFERENCES_CACHE_SECONDS = config(
+    "NOTIFICATION_PREFERENCES_CACHE_SECONDS", default=3600, cast=int
+)
+NOTIFICATION_PREFERENCES_LOCAL_CACHE_SECONDS = config(
+    "NOTIFICATION_PREFERENCES_LOCAL_CACHE_SECONDS", default=30, cast=int
+)
+NOTIFICATION_PREFERENCES_LOCAL_CACHE_SIZE = config(
+    "NOTIFICATION_PREFERENCES_LOCAL_CACHE_SIZE", default=10000, cast=int
+)
+
+# Likes and follows are grouped per (recipient, type, post) while events keep
+# arriving within COALESCE_SECONDS
+NOTIFICATION_COALESCE_SECONDS = config("NOTIFICATION_COALESCE_SECONDS", default=3600, cast=int)
+
+# Notification emails go out as one digest per recipient every DIGEST_INTERVAL
+# seconds, sent over one SMTP connection in batches of DIGEST_BATCH_SIZE. A run
+# holds a lock, extended after each batch, that expires DIGEST_LOCK_SECONDS
+# after a crashed run
+NOTIFICATION_DIGEST_INTERVAL = config("NOTIFICATION_DIGEST_INTERVAL", default=300, cast=int)
+NOTIFICATION_DIGEST_BATCH_SIZE = config("NOTIFICATION_DIGEST_BATCH_SIZE", default=100, cast=int)
+NOTIFICATION_DIGEST_LOCK_SECONDS = config(
+    "NOTIFICATION_DIGEST_LOCK_SECONDS", default=600, cast=int
+)
+
 # REST Framework
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
@@ -107,11 +151,12 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    # Cursor pages on (created_at, id); ?count=estimate adds an estimated total
+    "DEFAULT_PAGINATION_CLASS": "glade.pagination.KeysetPagination",
     "PAGE_SIZE": 10,
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "accounts.throttles.AnonRateThrottle",
+        "accounts.throttles.UserRateThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
         "registration": "2/hour",  # 2 registrations per hour per IP
@@ -158,6 +203,11 @@ CELERY_RESULT_BACKEND = config("REDIS_URL", default="redis://127.0.0.1:6379/0")
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
+# Inbound federation activities get their own queue so bursts can be
+# worked off by dedicated workers without starving other tasks
+CELERY_TASK_ROUTES = {
+    "federation.tasks.process_inbox_activity": {"queue": "federation_inbox"},
+}
 
 # Glade settings
 INSTANCE_DOMAIN = config("INSTANCE_DOMAIN", default="localhost:8000")
@@ -243,6 +293,26 @@ CSRF_COOKIE_HTTPONLY = True
 #     },
 # }
 
+# Federation delivery queue (per-inbox retries)
+CELERY_BEAT_SCHEDULE = {
+    "process-delivery-queue": {
+        "task": "federation.tasks.process_delivery_queue",
+        "schedule": 30.0,  # Every 30 seconds
+    },
+    "cleanup-delivery-jobs": {
+        "task": "federation.tasks.cleanup_delivery_jobs",
+        "schedule": 24 * 3600.0,  # Daily
+    },
+    "prune-activity-log": {
+        "task": "federation.tasks.prune_activity_log",
+        "schedule": 3600.0,  # Hourly, so each run deletes a small slice
+    },
+    "send-notification-digests": {
+        "task": "notifications.tasks.send_notification_digests",
+        "schedule": float(NOTIFICATION_DIGEST_INTERVAL),
+    },
+}
+
 
 # ActivityPub app removed - using 'federation' app instead
 # INSTALLED_APPS += [
@@ -264,3 +334,74 @@ ACTIVITYPUB_DEFAULT_FROM = os.environ.get(
 ACTIVITYPUB_DELIVERY_MAX_RETRIES = int(
     os.environ.get("ACTIVITYPUB_DELIVERY_MAX_RETRIES", "5")
 )
+# Base delay for per-inbox retries; doubles on each failed attempt
+ACTIVITYPUB_DELIVERY_RETRY_BASE_SECONDS = int(
+    os.environ.get("ACTIVITYPUB_DELIVERY_RETRY_BASE_SECONDS", "60")
+)
+# Due delivery jobs claimed per process_delivery_queue run; a full batch
+# queues the next run immediately
+ACTIVITYPUB_DELIVERY_BATCH_SIZE = int(
+    os.environ.get("ACTIVITYPUB_DELIVERY_BATCH_SIZE", "500")
+)
+# Concurrent delivery limits: total in-flight requests per task, and per remote host
+ACTIVITYPUB_DELIVERY_CONCURRENCY = int(
+    os.environ.get("ACTIVITYPUB_DELIVERY_CONCURRENCY", "50")
+)
+ACTIVITYPUB_DELIVERY_PER_HOST_CONCURRENCY = int(
+    os.environ.get("ACTIVITYPUB_DELIVERY_PER_HOST_CONCURRENCY", "4")
+)
+# Shared federation HTTP client pool (per process)
+ACTIVITYPUB_HTTP_TIMEOUT = float(os.environ.get("ACTIVITYPUB_HTTP_TIMEOUT", "30"))
+ACTIVITYPUB_HTTP_MAX_CONNECTIONS = int(
+    os.environ.get("ACTIVITYPUB_HTTP_MAX_CONNECTIONS", "100")
+)
+ACTIVITYPUB_HTTP_MAX_KEEPALIVE = int(
+    os.environ.get("ACTIVITYPUB_HTTP_MAX_KEEPALIVE", "20")
+)
+ACTIVITYPUB_HTTP_KEEPALIVE_EXPIRY = float(
+    os.environ.get("ACTIVITYPUB_HTTP_KEEPALIVE_EXPIRY", "30")
+)
+# Per-worker rate limit for processing inbound activities (Celery rate_limit syntax)
+ACTIVITYPUB_INBOX_RATE_LIMIT = os.environ.get("ACTIVITYPUB_INBOX_RATE_LIMIT", "50/s")
+# Signature key lookups for unknown actors: fetch timeout, how long a request
+# waits on a fetch already in flight, and how long failed lookups are cached
+ACTIVITYPUB_KEY_FETCH_TIMEOUT = int(os.environ.get("ACTIVITYPUB_KEY_FETCH_TIMEOUT", "10"))
+ACTIVITYPUB_KEY_WAIT_SECONDS = int(os.environ.get("ACTIVITYPUB_KEY_WAIT_SECONDS", "5"))
+ACTIVITYPUB_KEY_NEGATIVE_CACHE_SECONDS = int(
+    os.environ.get("ACTIVITYPUB_KEY_NEGATIVE_CACHE_SECONDS", "300")
+)
+# Remote actor cache: records older than the TTL are served stale for up to
+# ACTIVITYPUB_ACTOR_STALE_SECONDS while refreshed in the background. The
+# per-process LRU re-reads Redis after ACTIVITYPUB_ACTOR_LOCAL_CACHE_SECONDS.
+ACTIVITYPUB_ACTOR_CACHE_TTL = int(os.environ.get("ACTIVITYPUB_ACTOR_CACHE_TTL", "3600"))
+ACTIVITYPUB_ACTOR_STALE_SECONDS = int(os.environ.get("ACTIVITYPUB_ACTOR_STALE_SECONDS", "86400"))
+ACTIVITYPUB_ACTOR_LOCAL_CACHE_SIZE = int(os.environ.get("ACTIVITYPUB_ACTOR_LOCAL_CACHE_SIZE", "10000"))
+ACTIVITYPUB_ACTOR_LOCAL_CACHE_SECONDS = int(
+    os.environ.get("ACTIVITYPUB_ACTOR_LOCAL_CACHE_SECONDS", "60")
+)
+# How long accepted inbound activity IDs are remembered for deduplication
+ACTIVITYPUB_INBOX_DEDUPE_SECONDS = int(
+    os.environ.get("ACTIVITYPUB_INBOX_DEDUPE_SECONDS", str(3 * 24 * 3600))
+)
+# Federation activity log: rows are buffered and bulk-written per batch or
+# flush interval. Raw payloads are kept for SAMPLE_RATE of rows (always for
+# failures) and stubbed above PAYLOAD_MAX_BYTES; rows older than
+# RETENTION_DAYS are pruned hourly.
+ACTIVITYPUB_ACTIVITY_LOG_BATCH_SIZE = int(os.environ.get("ACTIVITYPUB_ACTIVITY_LOG_BATCH_SIZE", "200"))
+ACTIVITYPUB_ACTIVITY_LOG_FLUSH_SECONDS = float(
+    os.environ.get("ACTIVITYPUB_ACTIVITY_LOG_FLUSH_SECONDS", "5")
+)
+ACTIVITYPUB_ACTIVITY_LOG_SAMPLE_RATE = float(
+    os.environ.get("ACTIVITYPUB_ACTIVITY_LOG_SAMPLE_RATE", "1.0")
+)
+ACTIVITYPUB_ACTIVITY_LOG_PAYLOAD_MAX_BYTES = int(
+    os.environ.get("ACTIVITYPUB_ACTIVITY_LOG_PAYLOAD_MAX_BYTES", "16384")
+)
+ACTIVITYPUB_ACTIVITY_LOG_RETENTION_DAYS = int(
+    os.environ.get("ACTIVITYPUB_ACTIVITY_LOG_RETENTION_DAYS", "30")
+)
+# Paged ActivityPub collections (outbox, followers, following)
+ACTIVITYPUB_COLLECTION_PAGE_SIZE = int(os.environ.get("ACTIVITYPUB_COLLECTION_PAGE_SIZE", "20"))
+ACTIVITYPUB_COLLECTION_CACHE_SECONDS = int(
+    os.environ.get("ACTIVITYPUB_COLLECTION_CACHE_SECONDS", "300")
+)
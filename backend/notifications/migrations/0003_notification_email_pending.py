@@ -0,0 +1,25 @@
+# Generated manually
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0002_notification_grouping"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notification",
+            name="email_pending",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                condition=models.Q(email_pending=True),
+                fields=["recipient"],
+                name="notificatio_email_pending_idx",
+            ),
+        ),
+    ]
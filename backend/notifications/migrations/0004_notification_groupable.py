@@ -0,0 +1,23 @@
+# Generated manually
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0003_notification_email_pending"),
+    ]
+
+    operations = [
+        # Existing rows stay ungrouped; new likes and follows open new groups
+        migrations.AddField(
+            model_name="notification",
+            name="groupable",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="grouped_since",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -66,12 +66,21 @@ class Notification(models.Model):
         related_name="notifications",
     )
 
-    # Notification content
+    # Notification content; for a group, the message of its latest actor
     message = models.TextField()
 
+    # Further actors grouped into this notification ("X and 42 others")
+    others_count = models.PositiveIntegerField(default=0)
+    # Only likes and follows group; a follow_accepted, say, never does
+    groupable = models.BooleanField(default=False)
+    # Likes or follows created since then count towards the group
+    grouped_since = models.DateTimeField(null=True, blank=True)
+
     # Status
     read = models.BooleanField(default=False)
     emailed = models.BooleanField(default=False)
+    # Waiting for the recipient's next email digest
+    email_pending = models.BooleanField(default=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -80,11 +89,32 @@ class Notification(models.Model):
         indexes = [
             models.Index(fields=["recipient", "-created_at"]),
             models.Index(fields=["recipient", "read"]),
+            # Finding the open group for (recipient, type, post)
+            models.Index(
+                fields=["recipient", "notification_type", "post", "-created_at"],
+                name="notificatio_group_idx",
+            ),
+            models.Index(
+                fields=["recipient"],
+                name="notificatio_email_pending_idx",
+                condition=models.Q(email_pending=True),
+            ),
         ]
 
     def __str__(self):
         return f"{self.notification_type} for {self.recipient.username}"
 
+    @property
+    def display_message(self):
+        """message, with the other grouped actors folded in after the actor's name"""
+        if not self.others_count:
+            return self.message
+        name = self.actor.display_name or self.actor.username
+        others = "1 other" if self.others_count == 1 else f"{self.others_count} others"
+        if self.message.startswith(name):
+            return f"{name} and {others}{self.message[len(name):]}"
+        return f"{self.message} (and {others})"
+
     def mark_as_read(self):
         """Mark notification as read"""
         self.read = True
@@ -0,0 +1,69 @@
+# backend/notifications/preferences.py
+"""
+Two-tier cache of notification preferences.
+
+Preferences are read on every notification, so each process keeps a small
+LRU of per-user flag dicts in front of the shared Redis cache, with the
+NotificationPreference row as the fallback. Updates through the API
+invalidate both tiers; other processes pick the change up once their
+short-lived local entry expires.
+"""
+from typing import Dict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models
+from services.local_cache import LocalCache
+
+from .models import NotificationPreference
+
+FLAG_FIELDS = [
+    field.name
+    for field in NotificationPreference._meta.get_fields()
+    if isinstance(field, models.BooleanField)
+]
+
+
+_local = LocalCache(
+    "NOTIFICATION_PREFERENCES_LOCAL_CACHE_SECONDS",
+    30,
+    "NOTIFICATION_PREFERENCES_LOCAL_CACHE_SIZE",
+    10000,
+)
+
+
+def _cache_key(user_id) -> str:
+    return f"notification_prefs:{user_id}"
+
+
+def store(preferences: NotificationPreference) -> Dict[str, bool]:
+    """Write a user's preferences to both tiers"""
+    flags = {name: getattr(preferences, name) for name in FLAG_FIELDS}
+    _local.set(preferences.user_id, flags)
+    cache.set(
+        _cache_key(preferences.user_id),
+        flags,
+        getattr(settings, "NOTIFICATION_PREFERENCES_CACHE_SECONDS", 3600),
+    )
+    return flags
+
+
+def invalidate(user_id):
+    _local.pop(user_id)
+    cache.delete(_cache_key(user_id))
+
+
+def get(user) -> Dict[str, bool]:
+    """A user's preference flags, e.g. get(user)["notify_on_likes"]"""
+    flags = _local.get(user.pk)
+    if flags is not None:
+        return flags
+
+    flags = cache.get(_cache_key(user.pk))
+    if flags is not None:
+        _local.set(user.pk, flags)
+        return flags
+
+    # Created at registration; get_or_create covers older accounts
+    preferences, _ = NotificationPreference.objects.get_or_create(user=user)
+    return store(preferences)
@@ -9,6 +9,8 @@ class NotificationSerializer(serializers.ModelSerializer):
     """Serializer for notifications"""
 
     actor = UserSerializer(read_only=True)
+    # Grouped notifications read "X and 42 others liked your post"
+    message = serializers.CharField(source="display_message", read_only=True)
 
     class Meta:
         model = Notification
@@ -17,6 +19,7 @@ class NotificationSerializer(serializers.ModelSerializer):
             "actor",
             "notification_type",
             "message",
+            "others_count",
             "read",
             "created_at",
             "post",
@@ -26,6 +29,7 @@ class NotificationSerializer(serializers.ModelSerializer):
             "actor",
             "notification_type",
             "message",
+            "others_count",
             "created_at",
             "post",
         ]
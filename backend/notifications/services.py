@@ -1,11 +1,13 @@
 # backend/notifications/services.py
+from datetime import timedelta
 from typing import Optional
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db import transaction
+from django.utils import timezone
 
-from .models import Notification, NotificationPreference
-from .tasks import send_notification_email
+from . import preferences as notification_preferences
+from .models import Notification
 
 User = get_user_model()
 
@@ -13,72 +15,156 @@ User = get_user_model()
 class NotificationService:
     """Service for creating and managing notifications"""
 
-    @staticmethod
-    def get_or_create_preferences(user):
-        """Get or create notification preferences for a user"""
-        preferences, created = NotificationPreference.objects.get_or_create(user=user)
-        return preferences
+    NOTIFY_FIELDS = {
+        "like": "notify_on_likes",
+        "reply": "notify_on_replies",
+        "mention": "notify_on_mentions",
+        "follow": "notify_on_follows",
+        "follow_request": "notify_on_follow_requests",
+    }
+    COALESCED_TYPES = ("like", "follow")
+    EMAIL_FIELDS = {
+        "like": "email_on_likes",
+        "reply": "email_on_replies",
+        "mention": "email_on_mentions",
+        "follow": "email_on_follows",
+    }
 
     @staticmethod
-    def should_notify(recipient, notification_type):
+    def should_notify(recipient, notification_type, prefs=None):
         """Check if user wants to receive this type of notification"""
-        prefs = NotificationService.get_or_create_preferences(recipient)
-
-        notification_map = {
-            "like": prefs.notify_on_likes,
-            "reply": prefs.notify_on_replies,
-            "mention": prefs.notify_on_mentions,
-            "follow": prefs.notify_on_follows,
-            "follow_request": prefs.notify_on_follow_requests,
-        }
-
-        return notification_map.get(notification_type, True)
+        if prefs is None:
+            prefs = notification_preferences.get(recipient)
+        field = NotificationService.NOTIFY_FIELDS.get(notification_type)
+        return prefs[field] if field else True
 
     @staticmethod
-    def should_email(recipient, notification_type):
+    def should_email(recipient, notification_type, prefs=None):
         """Check if user wants to receive email for this notification"""
-        prefs = NotificationService.get_or_create_preferences(recipient)
-
-        email_map = {
-            "like": prefs.email_on_likes,
-            "reply": prefs.email_on_replies,
-            "mention": prefs.email_on_mentions,
-            "follow": prefs.email_on_follows,
-        }
-
-        return email_map.get(notification_type, False)
+        if prefs is None:
+            prefs = notification_preferences.get(recipient)
+        field = NotificationService.EMAIL_FIELDS.get(notification_type)
+        return prefs[field] if field else False
 
     @staticmethod
-    @transaction.atomic
-    def create_notification(recipient, actor, notification_type, message, post=None):
-        """Create a notification if user preferences allow it"""
+    def create_notification(
+        recipient, actor, notification_type, message, post=None, coalesce=None
+    ):
+        """
+        Create a notification if user preferences allow it. Likes and
+        follows are grouped per (recipient, type, post): within
+        NOTIFICATION_COALESCE_SECONDS of the group's latest activity, a new
+        event updates the group in place instead of adding a row.
+        coalesce=False keeps a like or follow out of any group.
+        """
         # Don't notify user about their own actions
         if recipient == actor:
             return None
 
+        # One cached lookup covers both checks
+        prefs = notification_preferences.get(recipient)
+
         # Check if user wants this notification
-        if not NotificationService.should_notify(recipient, notification_type):
+        if not NotificationService.should_notify(recipient, notification_type, prefs):
             return None
 
-        # Create notification
-        notification = Notification.objects.create(
-            recipient=recipient,
-            actor=actor,
-            notification_type=notification_type,
-            message=message,
-            post=post,
+        # Other types have no source rows to count their actors from
+        coalesce = (
+            coalesce is not False
+            and notification_type in NotificationService.COALESCED_TYPES
         )
 
-        # Send email if preferences allow
-        if NotificationService.should_email(recipient, notification_type):
-            try:
-                send_notification_email.delay(str(notification.id))
-            except Exception as e:
-                # Celery not available, skip email
-                print(f"Failed to queue email notification: {e}")
+        # Emails are sent in per-recipient digests (send_notification_digests)
+        email_pending = NotificationService.should_email(
+            recipient, notification_type, prefs
+        )
+
+        notification = None
+        if coalesce:
+            notification = NotificationService._add_to_group(
+                recipient, actor, notification_type, message, post, email_pending
+            )
+        if notification is None:
+            notification = Notification.objects.create(
+                recipient=recipient,
+                actor=actor,
+                notification_type=notification_type,
+                message=message,
+                post=post,
+                email_pending=email_pending,
+                groupable=coalesce,
+                # No group was open, so nothing in the last window has been
+                # notified yet except this event
+                grouped_since=(
+                    timezone.now() - NotificationService._coalesce_window()
+                    if coalesce
+                    else None
+                ),
+            )
 
         return notification
 
+    @staticmethod
+    def _coalesce_window():
+        return timedelta(
+            seconds=getattr(settings, "NOTIFICATION_COALESCE_SECONDS", 3600)
+        )
+
+    @staticmethod
+    def _add_to_group(recipient, actor, notification_type, message, post, email_pending):
+        """Fold an event into the open group, or return None if there is none"""
+        now = timezone.now()
+        group = (
+            Notification.objects.filter(
+                recipient=recipient,
+                notification_type=notification_type,
+                post=post,
+                groupable=True,
+                created_at__gte=now - NotificationService._coalesce_window(),
+            )
+            .only("id", "grouped_since")
+            .order_by("-created_at")
+            .first()
+        )
+        if group is None:
+            return None
+
+        changes = {}
+        if email_pending:
+            # Emailed again in the next digest, with the grouped message
+            changes = {"email_pending": True, "emailed": False}
+        updated = Notification.objects.filter(pk=group.pk).update(
+            actor=actor,
+            message=message,
+            others_count=NotificationService._count_others(
+                notification_type, recipient, actor, post, group.grouped_since
+            ),
+            read=False,
+            created_at=now,  # groups sort by their latest activity
+            **changes,
+        )
+        return group if updated else None
+
+    @staticmethod
+    def _count_others(notification_type, recipient, actor, post, since):
+        """
+        Actors besides actor whose like or follow since the group opened
+        still stands. Likes and follows are unique per actor, so repeats
+        count once and undone ones drop out.
+        """
+        from accounts.models import Follow
+        from posts.models import Like
+
+        if notification_type == "like":
+            rows = Like.objects.filter(post=post).exclude(
+                user_id__in=[actor.pk, recipient.pk]
+            )
+        else:
+            rows = Follow.objects.filter(following=recipient, accepted=True).exclude(
+                follower=actor
+            )
+        return rows.filter(created_at__gte=since).count()
+
     @staticmethod
     def notify_post_like(post, liker):
         """Notify post author about a like"""
@@ -129,6 +215,7 @@ class NotificationService:
             actor=followed_user,
             notification_type="follow",
             message=f"{followed_user.display_name or followed_user.username} accepted your follow request",
+            coalesce=False,
         )
 
     @staticmethod
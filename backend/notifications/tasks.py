@@ -1,16 +1,41 @@
 # backend/notifications/tasks.py
+import logging
+
 from celery import shared_task
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from services.email_service import NotificationEmailService
 
 from .models import Notification
 
+logger = logging.getLogger(__name__)
+
 User = get_user_model()
 
 
+@shared_task(ignore_result=True)
+def send_notification_digests():
+    """Email each recipient their pending notifications in one message"""
+    lock = "notification_digests:lock"
+    timeout = getattr(settings, "NOTIFICATION_DIGEST_LOCK_SECONDS", 600)
+    if not cache.add(lock, 1, timeout):
+        return  # previous run still sending
+    try:
+        # Extended after every batch, so a long run is never overlapped while
+        # a crashed one frees the lock within timeout
+        sent = NotificationEmailService.send_pending_digests(
+            on_batch=lambda: cache.touch(lock, timeout)
+        )
+    finally:
+        cache.delete(lock)
+    if sent:
+        logger.info(f"Sent {sent} notification digests")
+
+
 @shared_task
 def send_notification_email(notification_id):
-    """Send email for a notification"""
+    """Send email for a notification (notifications now go out in digests)"""
     try:
         notification = Notification.objects.get(id=notification_id)
 
@@ -22,7 +47,8 @@ def send_notification_email(notification_id):
 
         # Mark as emailed
         notification.emailed = True
-        notification.save(update_fields=["emailed"])
+        notification.email_pending = False
+        notification.save(update_fields=["emailed", "email_pending"])
 
     except Notification.DoesNotExist:
         pass
@@ -3,6 +3,7 @@ from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 
+from . import preferences as notification_preferences
 from .models import Notification, NotificationPreference
 from .serializers import NotificationPreferenceSerializer, NotificationSerializer
 from .services import NotificationService
@@ -72,6 +73,10 @@ class NotificationPreferenceView(generics.RetrieveUpdateAPIView):
         )
         return prefs
 
+    def perform_update(self, serializer):
+        prefs = serializer.save()
+        notification_preferences.invalidate(prefs.user_id)
+
 
 @api_view(["GET"])
 @permission_classes([permissions.IsAuthenticated])
@@ -0,0 +1,122 @@
+# backend/posts/geocells.py
+"""
+Geohash grid cells.
+
+A geohash names a rectangular cell; every prefix of it names the
+enclosing, coarser cell, so a post tagged with one full-precision hash
+belongs to a cell at each precision. Nearby queries snap to the cell size
+that matches the radius and read the 3x3 block of cells around the
+viewer, which always covers the radius.
+"""
+import math
+from typing import List, Tuple
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+PRECISION = 9  # ~4.8 m x 4.8 m; what posts are tagged with
+MIN_PRECISION = 2
+MAX_PRECISION = 7  # ~150 m; finer than any fuzzed location is useful
+
+METERS_PER_DEGREE_LAT = 110574
+METERS_PER_DEGREE_LNG = 111320
+
+
+def encode(lat: float, lng: float, precision: int = PRECISION) -> str:
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True  # bits alternate, starting with longitude
+    while len(chars) < precision:
+        rng, coord = (lng_range, lng) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        value <<= 1
+        if coord >= mid:
+            value |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = 0
+            value = 0
+    return "".join(chars)
+
+
+def bounds(cell: str) -> Tuple[float, float, float, float]:
+    """(min_lat, min_lng, max_lat, max_lng) of a cell"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    even = True
+    for char in cell:
+        value = BASE32.index(char)
+        for shift in range(4, -1, -1):
+            rng = lng_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            if value >> shift & 1:
+                rng[0] = mid
+            else:
+                rng[1] = mid
+            even = not even
+    return lat_range[0], lng_range[0], lat_range[1], lng_range[1]
+
+
+def center(cell: str) -> Tuple[float, float]:
+    """(lat, lng) of the middle of a cell"""
+    min_lat, min_lng, max_lat, max_lng = bounds(cell)
+    return (min_lat + max_lat) / 2, (min_lng + max_lng) / 2
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """(height, width) of a cell in degrees"""
+    lng_bits = math.ceil(precision * 5 / 2)
+    lat_bits = precision * 5 // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+
+def precision_for_radius(lat: float, radius: float) -> int:
+    """Finest precision whose cells are at least radius meters on each side"""
+    cos_lat = max(math.cos(math.radians(lat)), 0.01)
+    for precision in range(MAX_PRECISION, MIN_PRECISION - 1, -1):
+        height, width = cell_size(precision)
+        if (
+            height * METERS_PER_DEGREE_LAT >= radius
+            and width * METERS_PER_DEGREE_LNG * cos_lat >= radius
+        ):
+            return precision
+    return MIN_PRECISION
+
+
+def max_radius(lat: float) -> int:
+    """Largest radius in meters that a 3x3 block of the coarsest cells covers"""
+    cos_lat = max(math.cos(math.radians(lat)), 0.01)
+    height, width = cell_size(MIN_PRECISION)
+    return int(
+        min(height * METERS_PER_DEGREE_LAT, width * METERS_PER_DEGREE_LNG * cos_lat)
+    )
+
+
+def covering_cells(lat: float, lng: float, radius: float) -> List[str]:
+    """
+    The cell containing the point, then its eight neighbours, at the
+    precision matching the radius. Points within radius of (lat, lng) all
+    fall in these cells as long as radius is at most max_radius(lat).
+    """
+    precision = precision_for_radius(lat, radius)
+    home = encode(lat, lng, precision)
+    mid_lat, mid_lng = center(home)
+    height, width = cell_size(precision)
+
+    cells = [home]
+    for dlat in (-1, 0, 1):
+        for dlng in (-1, 0, 1):
+            neighbour_lat = mid_lat + dlat * height
+            if not -90 < neighbour_lat < 90:
+                continue
+            neighbour_lng = (mid_lng + dlng * width + 180) % 360 - 180
+            cell = encode(neighbour_lat, neighbour_lng, precision)
+            if cell not in cells:
+                cells.append(cell)
+    return cells
@@ -0,0 +1,59 @@
+# Generated manually
+import django.contrib.gis.db.models.fields
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+def _auto_spatial_index(schema_editor):
+    # Name Django gave the geometry column's automatic spatial index
+    return schema_editor.quote_name(
+        schema_editor._create_index_name("posts_post", ["location"], suffix="_id")
+    )
+
+
+def to_geography(apps, schema_editor):
+    # The geometry GiST index cannot be rebuilt for geography; drop it first
+    schema_editor.execute(f"DROP INDEX IF EXISTS {_auto_spatial_index(schema_editor)}")
+    schema_editor.execute(
+        "ALTER TABLE posts_post ALTER COLUMN location "
+        "TYPE geography(POINT, 4326) USING location::geography"
+    )
+
+
+def to_geometry(apps, schema_editor):
+    schema_editor.execute(
+        "ALTER TABLE posts_post ALTER COLUMN location "
+        "TYPE geometry(POINT, 4326) USING location::geometry"
+    )
+    schema_editor.execute(
+        f"CREATE INDEX {_auto_spatial_index(schema_editor)} "
+        "ON posts_post USING GIST (location)"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0005_comment_keyset_index'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[migrations.RunPython(to_geography, to_geometry)],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='post',
+                    name='location',
+                    field=django.contrib.gis.db.models.fields.PointField(
+                        blank=True, geography=True, null=True, spatial_index=False, srid=4326
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=django.contrib.postgres.indexes.GistIndex(
+                fields=['location'], name='posts_post_location_gist'
+            ),
+        ),
+    ]
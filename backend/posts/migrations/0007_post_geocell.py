@@ -0,0 +1,42 @@
+# Generated manually
+from django.db import migrations, models
+
+from posts.geocells import encode
+
+
+def backfill_geocells(apps, schema_editor):
+    Post = apps.get_model("posts", "Post")
+    batch = []
+    for post in Post.objects.filter(location__isnull=False).only("id", "location").iterator(
+        chunk_size=1000
+    ):
+        post.geocell = encode(post.location.y, post.location.x)
+        batch.append(post)
+        if len(batch) >= 1000:
+            Post.objects.bulk_update(batch, ["geocell"])
+            batch = []
+    Post.objects.bulk_update(batch, ["geocell"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0006_post_location_geography'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='geocell',
+            field=models.CharField(blank=True, default='', max_length=12),
+        ),
+        migrations.RunPython(backfill_geocells, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(
+                fields=['geocell'],
+                name='posts_post_geocell_idx',
+                opclasses=['varchar_pattern_ops'],
+            ),
+        ),
+    ]
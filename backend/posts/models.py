@@ -4,10 +4,28 @@ import uuid
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.gis.db import models
+from django.contrib.postgres.indexes import GistIndex
+
+from . import geocells
 
 User = get_user_model()
 
 
+class PostQuerySet(models.QuerySet):
+    def with_viewer_flags(self, user):
+        """
+        Annotate per-viewer flags (liked_by_viewer) as EXISTS subqueries,
+        so a page of posts resolves them in the same query that loads it.
+        """
+        if not user or not user.is_authenticated:
+            return self.annotate(liked_by_viewer=models.Value(False))
+        return self.annotate(
+            liked_by_viewer=models.Exists(
+                Like.objects.filter(post=models.OuterRef("pk"), user=user)
+            )
+        )
+
+
 class Post(models.Model):
     VISIBILITY_CHOICES = [
         (1, "Public"),  # Visible everywhere
@@ -25,10 +43,16 @@ class Post(models.Model):
 
     # Privacy and location
     visibility = models.IntegerField(choices=VISIBILITY_CHOICES, default=2)
-    location = models.PointField(srid=4326, blank=True, null=True)
+    # Geography, so distances and ST_DWithin work in meters on the spheroid;
+    # indexed by posts_post_location_gist below
+    location = models.PointField(
+        srid=4326, geography=True, spatial_index=False, blank=True, null=True
+    )
     location_radius = models.IntegerField(
         blank=True, null=True
     )  # Visibility radius in meters
+    # Geohash of location; its prefixes are the coarser cells (posts/geocells.py)
+    geocell = models.CharField(max_length=12, blank=True, default="")
     local_only = models.BooleanField(default=False)
 
     # Federation
@@ -55,6 +79,13 @@ class Post(models.Model):
             targets.append("https://www.w3.org/ns/activitystreams#Public")
         return targets
 
+    objects = PostQuerySet.as_manager()
+
+    # Denormalized counters, maintained by posts/signals.py
+    likes_count = models.PositiveIntegerField(default=0)
+    comments_count = models.PositiveIntegerField(default=0)
+    replies_count = models.PositiveIntegerField(default=0)
+
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -65,12 +96,38 @@ class Post(models.Model):
             models.Index(fields=["-created_at"]),
             models.Index(fields=["author", "-created_at"]),
             models.Index(fields=["visibility"]),
+            GistIndex(fields=["location"], name="posts_post_location_gist"),
+            # Prefix (LIKE 'cell%') scans for nearby cells
+            models.Index(
+                fields=["geocell"],
+                name="posts_post_geocell_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored visibility so counter signals can see changes
+        instance._loaded_visibility = instance.__dict__.get("visibility")
+        instance._loaded_geocell = instance.__dict__.get("geocell")
+        return instance
+
     def save(self, *args, **kwargs):
         # Set ActivityPub ID for new posts
         if not self.activity_id:
             self.activity_id = f"https://{settings.INSTANCE_DOMAIN}/posts/{self.id}"
+
+        # Tag the post with its grid cell for cached nearby lookups
+        self.geocell = (
+            geocells.encode(self.location.y, self.location.x) if self.location else ""
+        )
+
+        from services.counter_service import CounterService
+
+        kwargs = CounterService.protect_counters(
+            self, CounterService.POST_COUNTERS, kwargs
+        )
         super().save(*args, **kwargs)
 
     def to_activitypub_note(self):
@@ -166,6 +223,12 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Cursor pages of a post's comments
+            models.Index(
+                fields=["post", "-created_at", "-id"], name="posts_comme_post_created_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"Comment by {self.author.username} on {self.post.id}"
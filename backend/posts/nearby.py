@@ -0,0 +1,75 @@
+# backend/posts/nearby.py
+"""
+Cached per-cell lists of nearby posts.
+
+Each geohash cell maps to the IDs of the newest public and local posts
+tagged inside it, cached under nearby_cell:<cell>. A nearby query reads
+the cells covering its radius with one get_many and only runs the indexed
+prefix query for cells that miss. Lists are viewer independent; callers
+apply the viewer's privacy filter when hydrating the posts. Creating,
+changing or deleting a post drops the lists of every cell containing it.
+Lists are capped at NEARBY_CELL_MAX_POSTS; a query touching a full cell
+falls back to the ST_DWithin index rather than miss older posts.
+"""
+from typing import List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import geocells
+from .models import Post
+
+NEARBY_VISIBILITIES = (1, 2)  # Public, Local
+
+
+def _cache_key(cell: str) -> str:
+    return f"nearby_cell:{cell}"
+
+
+def _max_posts() -> int:
+    return getattr(settings, "NEARBY_CELL_MAX_POSTS", 200)
+
+
+def cell_post_ids(cells: List[str]) -> Optional[List[str]]:
+    """
+    IDs of the nearby posts in each cell, from cache where possible, or
+    None when a cell holds more than NEARBY_CELL_MAX_POSTS. Such a list is
+    only the newest posts, so callers query the posts directly instead.
+    """
+    max_posts = _max_posts()
+    cached = cache.get_many([_cache_key(cell) for cell in cells])
+    missing = {}
+    ids = []
+    for cell in cells:
+        cell_ids = cached.get(_cache_key(cell))
+        if cell_ids is None:
+            # One extra row tells a full cell from one at exactly the limit
+            cell_ids = [
+                str(pk)
+                for pk in Post.objects.filter(
+                    geocell__startswith=cell, visibility__in=NEARBY_VISIBILITIES
+                )
+                .order_by("-created_at")
+                .values_list("id", flat=True)[: max_posts + 1]
+            ]
+            missing[_cache_key(cell)] = cell_ids
+        ids.extend(cell_ids)
+        if len(cell_ids) > max_posts:
+            ids = None
+            break
+
+    if missing:
+        cache.set_many(missing, getattr(settings, "NEARBY_CELL_CACHE_SECONDS", 300))
+    return ids
+
+
+def invalidate(*geocell_values: str):
+    """Drop the cached lists of every cell containing the given post cells"""
+    keys = {
+        _cache_key(value[:precision])
+        for value in geocell_values
+        if value
+        for precision in range(geocells.MIN_PRECISION, geocells.MAX_PRECISION + 1)
+    }
+    if keys:
+        cache.delete_many(list(keys))
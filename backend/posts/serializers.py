@@ -94,9 +94,9 @@ class PostSerializer(serializers.ModelSerializer):
     """Serializer for displaying posts"""
 
     author = UserSerializer(read_only=True)
-    likes_count = serializers.SerializerMethodField()
-    comments_count = serializers.SerializerMethodField()
-    replies_count = serializers.SerializerMethodField()
+    likes_count = serializers.IntegerField(read_only=True)
+    comments_count = serializers.IntegerField(read_only=True)
+    replies_count = serializers.IntegerField(read_only=True)
     liked_by_current_user = serializers.SerializerMethodField()
     location_name = serializers.SerializerMethodField()
     location_radius = serializers.IntegerField(read_only=True)
@@ -120,19 +120,10 @@ class PostSerializer(serializers.ModelSerializer):
             "liked_by_current_user",
         ]
 
-    @staticmethod
-    def get_likes_count(obj):
-        return obj.likes.count()
-
-    @staticmethod
-    def get_comments_count(obj):
-        return obj.comments.count()
-
-    @staticmethod
-    def get_replies_count(obj):
-        return obj.replies.count()
-
     def get_liked_by_current_user(self, obj):
+        # List views annotate this via Post.objects.with_viewer_flags()
+        if hasattr(obj, "liked_by_viewer"):
+            return obj.liked_by_viewer
         request = self.context.get("request")
         if request and request.user.is_authenticated:
             return obj.likes.filter(user=request.user).exists()
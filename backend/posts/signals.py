@@ -1,4 +1,124 @@
 # backend/posts/signals.py
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from services.counter_service import CounterService
+
+from .models import Comment, Like, Post
+
+logger = logging.getLogger(__name__)
+
+PUBLIC_VISIBILITIES = (1, 2)  # Public, Local
+
+
+@receiver(post_save, sender=Like)
+def like_created(sender, instance, created, **kwargs):
+    if created:
+        CounterService.adjust(Post, instance.post_id, likes_count=1)
+
+
+@receiver(post_delete, sender=Like)
+def like_deleted(sender, instance, **kwargs):
+    CounterService.adjust(Post, instance.post_id, likes_count=-1)
+
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, **kwargs):
+    if created:
+        CounterService.adjust(Post, instance.post_id, comments_count=1)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    CounterService.adjust(Post, instance.post_id, comments_count=-1)
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, **kwargs):
+    from accounts.models import User
+
+    is_public = instance.visibility in PUBLIC_VISIBILITIES
+    if created:
+        CounterService.adjust(
+            User,
+            instance.author_id,
+            posts_count=1,
+            public_posts_count=1 if is_public else 0,
+        )
+        if instance.reply_to_id:
+            CounterService.adjust(Post, instance.reply_to_id, replies_count=1)
+    else:
+        loaded = getattr(instance, "_loaded_visibility", None)
+        if loaded is not None and (loaded in PUBLIC_VISIBILITIES) != is_public:
+            CounterService.adjust(
+                User, instance.author_id, public_posts_count=1 if is_public else -1
+            )
+    instance._loaded_visibility = instance.visibility
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    from accounts.models import User
+
+    CounterService.adjust(
+        User,
+        instance.author_id,
+        posts_count=-1,
+        public_posts_count=-1 if instance.visibility in PUBLIC_VISIBILITIES else 0,
+    )
+    if instance.reply_to_id:
+        CounterService.adjust(Post, instance.reply_to_id, replies_count=-1)
+
+
+def _queue(task, *args):
+    """Queue a timeline task once the transaction commits"""
+
+    def send():
+        try:
+            task.delay(*args)
+        except Exception as e:
+            # Reads drop deleted posts; a missed push shows up on the next rebuild
+            logger.warning(f"Could not queue {task.name}: {e}")
+
+    transaction.on_commit(send)
+
+
+@receiver(post_save, sender=Post)
+def fan_out_post(sender, instance, created, **kwargs):
+    if created:
+        from .tasks import fanout_post
+
+        _queue(fanout_post, str(instance.id))
+
+
+@receiver(post_delete, sender=Post)
+def drop_post_from_timelines(sender, instance, **kwargs):
+    from .tasks import remove_post_from_timelines
+
+    _queue(remove_post_from_timelines, str(instance.id), str(instance.author_id))
+
+
+@receiver(post_save, sender=Post)
+def invalidate_nearby_cells_on_save(sender, instance, **kwargs):
+    from . import nearby
+
+    # Posts are rarely saved after creation; drop old and new cells on any save
+    cells = (instance.geocell, getattr(instance, "_loaded_geocell", None) or "")
+    if any(cells):
+        transaction.on_commit(lambda: nearby.invalidate(*cells))
+    instance._loaded_geocell = instance.geocell
+
+
+@receiver(post_delete, sender=Post)
+def invalidate_nearby_cells_on_delete(sender, instance, **kwargs):
+    from . import nearby
+
+    transaction.on_commit(lambda: nearby.invalidate(instance.geocell))
+
+
 # Federation signals disabled - needs proper implementation
 # TODO: Re-enable when federation is fully implemented
 
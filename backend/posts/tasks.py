@@ -0,0 +1,30 @@
+# backend/posts/tasks.py
+import logging
+
+from celery import shared_task
+
+from accounts.models import Follow
+
+from . import timeline
+from .models import Post
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=True)
+def fanout_post(post_id: str):
+    """Push a new post onto the home timelines of its author and followers"""
+    try:
+        post = Post.objects.get(id=post_id)
+    except Post.DoesNotExist:
+        return
+    timeline.push(post)
+
+
+@shared_task(ignore_result=True)
+def remove_post_from_timelines(post_id: str, author_id: str):
+    """Remove a deleted post from the timelines it was pushed to"""
+    follower_ids = Follow.objects.filter(
+        following_id=author_id, accepted=True
+    ).values_list("follower_id", flat=True)
+    timeline.remove_post(post_id, author_id, [author_id, *follower_ids])
@@ -0,0 +1,283 @@
+# backend/posts/timeline.py
+"""
+Materialized home timelines.
+
+Each local user's home timeline is a Redis sorted set of
+"<post_id>:<author_id>" members scored by creation time, capped at
+HOME_TIMELINE_SIZE entries. New posts are pushed to the timelines of the
+author and of every local follower allowed to see them (posts.tasks), so a
+read is one sorted-set range plus one primary-key query for the page.
+
+A timeline is only written to once it has been built: a sentinel member
+(scored 0, so it always sorts last) marks a built set, and pushes to users
+without one are skipped. Cold, expired or evicted timelines are rebuilt
+from the database on the next read. Timelines expire after HOME_TIMELINE_TTL
+without reads, so inactive users cost nothing on fan-out.
+
+The home feed itself is every post the user may see. Only the user's own
+and followed posts are materialized; each page merges in the visible posts
+of everyone else (public posts, local posts nearby) with one keyset query.
+"""
+import logging
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.gis.measure import D
+from django.core.cache import cache
+from django.db.models import Q
+
+from accounts.models import Follow, User
+from glade.pagination import keyset_page
+from privacy.services import PrivacyService
+from services import redis_client
+
+from .models import Post
+
+logger = logging.getLogger(__name__)
+
+SENTINEL = "built"
+
+# Adds a post to a built timeline and trims it to the cap, keeping the
+# sentinel at rank 0. ARGV: score, member, cap
+_PUSH_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('ZADD', KEYS[1], ARGV[1], ARGV[2])
+redis.call('ZREMRANGEBYRANK', KEYS[1], 1, -(tonumber(ARGV[3]) + 1))
+return 1
+"""
+
+
+def _size() -> int:
+    return getattr(settings, "HOME_TIMELINE_SIZE", 800)
+
+
+def _ttl() -> int:
+    return getattr(settings, "HOME_TIMELINE_TTL", 7 * 24 * 3600)
+
+
+def _key(user_id) -> str:
+    return cache.make_key(f"timeline:home:{user_id}")
+
+
+def _member(post_id, author_id) -> str:
+    return f"{post_id}:{author_id}"
+
+
+def _post_id(member) -> str:
+    if isinstance(member, bytes):
+        member = member.decode()
+    return member.split(":", 1)[0]
+
+
+def home_queryset(user: User, queryset=None):
+    """Every post the user may see, newest first"""
+    if queryset is None:
+        queryset = Post.objects.all()
+    return PrivacyService().filter_visible_posts(user, queryset).order_by(
+        "-created_at"
+    )
+
+
+def _following_ids(user: User):
+    return Follow.objects.filter(follower=user, accepted=True).values("following_id")
+
+
+def followed_queryset(user: User, queryset=None):
+    """The user's own posts and the visible posts of everyone they follow"""
+    if queryset is None:
+        queryset = Post.objects.all()
+    return home_queryset(
+        user, queryset.filter(Q(author=user) | Q(author_id__in=_following_ids(user)))
+    )
+
+
+def others_queryset(user: User, queryset=None):
+    """The rest of the home feed: visible posts by authors the user does not follow"""
+    if queryset is None:
+        queryset = Post.objects.all()
+    return home_queryset(
+        user, queryset.exclude(author=user).exclude(author_id__in=_following_ids(user))
+    )
+
+
+def recipient_ids(post: Post):
+    """
+    IDs of local users whose home timeline should receive a post: the
+    author and the followers can_user_see_post would let through.
+    """
+    yield post.author_id
+    if post.visibility == 4:  # Private
+        return
+
+    followers = User.objects.filter(
+        following__following_id=post.author_id,
+        following__accepted=True,
+        is_active=True,
+    ).exclude(pk=post.author_id)
+
+    if post.visibility == 2:  # Local: only followers in the area
+        if not post.location:
+            return
+        radius = post.location_radius or settings.DEFAULT_LOCATION_RADIUS
+    elif post.location_radius and post.location:
+        radius = post.location_radius
+    else:
+        radius = None
+
+    if radius is not None:
+        followers = followers.filter(
+            approximate_location__distance_lte=(post.location, D(m=radius))
+        )
+
+    yield from followers.values_list("id", flat=True).iterator(chunk_size=1000)
+
+
+def push(post: Post, batch_size: int = 500) -> int:
+    """Add a post to its recipients' built timelines; returns how many"""
+    client = redis_client.get_client()
+    if client is None:
+        return 0
+
+    script = client.register_script(_PUSH_SCRIPT)
+    score = post.created_at.timestamp()
+    member = _member(post.id, post.author_id)
+    pushed = 0
+    pipe = client.pipeline(transaction=False)
+    queued = 0
+    for user_id in recipient_ids(post):
+        script(keys=[_key(user_id)], args=[score, member, _size()], client=pipe)
+        queued += 1
+        if queued >= batch_size:
+            pushed += sum(pipe.execute())
+            queued = 0
+    if queued:
+        pushed += sum(pipe.execute())
+    return pushed
+
+
+def remove_post(post_id, author_id, user_ids) -> None:
+    """Remove a deleted post from the given users' timelines"""
+    client = redis_client.get_client()
+    if client is None:
+        return
+    member = _member(post_id, author_id)
+    pipe = client.pipeline(transaction=False)
+    for user_id in user_ids:
+        pipe.zrem(_key(user_id), member)
+    pipe.execute()
+
+
+def remove_author(user_id, author_id) -> None:
+    """Remove an unfollowed author's posts from a user's timeline"""
+    client = redis_client.get_client()
+    if client is None:
+        return
+    key = _key(user_id)
+    suffix = f":{author_id}"
+    members = [
+        m
+        for m in client.zrange(key, 0, -1)
+        if (m.decode() if isinstance(m, bytes) else m).endswith(suffix)
+    ]
+    if members:
+        client.zrem(key, *members)
+
+
+def drop(user_id) -> None:
+    """Forget a timeline so the next read rebuilds it (e.g. after a new follow)"""
+    client = redis_client.get_client()
+    if client is not None:
+        client.delete(_key(user_id))
+
+
+def rebuild(user: User) -> int:
+    """Rebuild a timeline from the database; returns the number of entries"""
+    client = redis_client.get_client()
+    if client is None:
+        return 0
+
+    rows = followed_queryset(user).values_list("id", "author_id", "created_at")[
+        : _size()
+    ]
+    entries = {SENTINEL: 0}
+    for post_id, author_id, created_at in rows:
+        entries[_member(post_id, author_id)] = created_at.timestamp()
+
+    key = _key(user.pk)
+    pipe = client.pipeline()
+    pipe.delete(key)
+    pipe.zadd(key, entries)
+    pipe.expire(key, _ttl())
+    pipe.execute()
+    return len(entries) - 1
+
+
+def page(
+    user: User, queryset, limit: int, before: Tuple[datetime, str] = None
+) -> Optional[Tuple[List[Post], bool]]:
+    """
+    Return (posts, has_older) for the page of the user's home feed older
+    than the (created_at, id) cursor before: the materialized posts,
+    hydrated from queryset in one query, merged with the matching page of
+    others_queryset. Returns None when the page cannot be served from Redis
+    (no Redis, or past the capped entries); callers then fall back to
+    home_queryset.
+    """
+    client = redis_client.get_client()
+    if client is None:
+        return None
+
+    key = _key(user.pk)
+    max_score = before[0].timestamp() if before else "+inf"
+    for attempt in range(2):
+        pipe = client.pipeline(transaction=False)
+        pipe.zcard(key)
+        pipe.expire(key, _ttl())
+        # Entries sharing the cursor's timestamp are fetched and skipped below
+        pipe.zcount(key, max_score, max_score)
+        size, _, ties = pipe.execute()
+        if size:
+            break
+        if attempt == 0:
+            rebuild(user)
+
+    # "(0" leaves out the sentinel
+    rows = client.zrevrangebyscore(
+        key, max_score, "(0", start=0, num=limit + 1 + ties, withscores=True
+    )
+    members = [
+        member
+        for member, score in rows
+        if not (before and score == max_score and _post_id(member) >= str(before[1]))
+    ]
+    has_older = len(members) > limit
+    members = members[:limit]
+    if not has_older and size - 1 >= _size():
+        return None  # the capped timeline ends here, older posts may not
+
+    ids = [_post_id(m) for m in members]
+    found = {}
+    if ids:
+        found = {
+            str(post.pk): post
+            for post in PrivacyService().filter_visible_posts(
+                user, queryset.filter(pk__in=ids)
+            )
+        }
+    stale = [m for m in members if _post_id(m) not in found]
+    if stale:
+        # Deleted posts, or posts the user can no longer see
+        client.zrem(key, *stale)
+
+    others, others_older, _ = keyset_page(
+        others_queryset(user, queryset), limit, before=before
+    )
+    posts = sorted(
+        [found[i] for i in ids if i in found] + others,
+        key=lambda post: (post.created_at, str(post.pk)),
+        reverse=True,
+    )
+    return posts[:limit], has_older or others_older or len(posts) > limit
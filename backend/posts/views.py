@@ -1,6 +1,9 @@
 # backend/posts/views.py
+import logging
+
 from django.contrib.gis.db.models.functions import Distance
 from django.contrib.gis.geos import Point
+from django.contrib.gis.measure import D
 from django.core.exceptions import ValidationError
 from django.shortcuts import get_object_or_404
 from accounts.models import User
@@ -9,11 +12,16 @@ from .models import Comment, Like, Post
 from notifications.services import NotificationService
 from privacy.services import PrivacyService
 from rest_framework import generics, permissions, status
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.response import Response
+from . import geocells, nearby, timeline
 from .serializers import CommentSerializer, PostCreateSerializer, PostSerializer
 from services.validation_service import InputValidationService, RateLimitService
 from accounts.throttles import UploadRateThrottle
+from glade.pagination import KeysetPagination, estimated_count
+
+logger = logging.getLogger(__name__)
 
 
 class PostListCreateView(generics.ListCreateAPIView):
@@ -27,32 +35,39 @@ class PostListCreateView(generics.ListCreateAPIView):
         return PostSerializer
 
     def get_queryset(self):
-        from django.db.models import Q
-        
-        user = self.request.user
-        privacy_service = PrivacyService()
-        
-        # Simplified: Show all public posts and posts from users you follow
-        # TODO: Add back location-based filtering later
-        queryset = Post.objects.select_related("author").prefetch_related("likes", "comments")
-        
-        # Build base visibility filter
-        visibility_filter = Q(visibility=1)  # Public posts
-        visibility_filter |= Q(author=user)  # Own posts
-        
-        # Add followers-only posts
-        following_ids = user.following.filter(accepted=True).values_list('following_id', flat=True)
-        visibility_filter |= Q(visibility=3, author_id__in=following_ids)
-        
-        queryset = queryset.filter(visibility_filter)
-        
-        # Filter by privacy rules (handles location radius per post)
-        visible_post_ids = []
-        for post in queryset:
-            if privacy_service.can_user_see_post(user, post):
-                visible_post_ids.append(post.id)
-        
-        return Post.objects.filter(id__in=visible_post_ids).select_related("author").prefetch_related("likes").order_by("-created_at")
+        queryset = Post.objects.select_related("author").with_viewer_flags(
+            self.request.user
+        )
+
+        # Every visible post; privacy rules are applied in SQL
+        return timeline.home_queryset(self.request.user, queryset)
+
+    def list(self, request, *args, **kwargs):
+        """Serve the feed from the materialized timeline when possible"""
+        paginator = self.paginator
+        before, after = paginator.get_cursors(request)
+        result = None
+        if not after:  # Newer pages come from the database
+            try:
+                result = timeline.page(
+                    request.user,
+                    Post.objects.select_related("author").with_viewer_flags(request.user),
+                    paginator.get_page_size(request),
+                    before,
+                )
+            except Exception as e:
+                logger.warning(f"Home timeline unavailable, querying posts: {e}")
+        if result is None:
+            return super().list(request, *args, **kwargs)
+
+        posts, has_older = result
+        count = None
+        if paginator.wants_count(request):
+            count = estimated_count(self.get_queryset())
+        paginator.set_page(request, posts, has_older, bool(before), count)
+        return paginator.get_paginated_response(
+            self.get_serializer(posts, many=True).data
+        )
 
     def create(self, request, *args, **kwargs):
         # Check rate limit
@@ -87,27 +102,43 @@ class LocalPostsView(generics.ListAPIView):
 
     serializer_class = PostSerializer
     permission_classes = [permissions.IsAuthenticated]
+    # Ordered by distance, so it cannot page on (created_at, id)
+    pagination_class = PageNumberPagination
 
     def get_queryset(self):
         user = self.request.user
         lat = float(self.request.query_params.get("lat", 0))
         lng = float(self.request.query_params.get("lng", 0))
         radius = int(self.request.query_params.get("radius", 1000))
+        # Beyond this even the coarsest 3x3 block of cells no longer covers it
+        radius = min(radius, geocells.max_radius(lat))
 
-        user_location = Point(lng, lat)
+        # Candidates come from the cached lists of the 3x3 block of cells
+        # around the viewer (posts/nearby.py); distances are measured from
+        # the viewer's own position
+        cells = geocells.covering_cells(lat, lng, radius)
+        user_location = Point(lng, lat, srid=4326)
 
-        # Find posts within radius
-        nearby_posts = (
-            Post.objects.filter(
-                location__distance_lte=(user_location, radius),
-                visibility__in=[1, 2],  # Public or Local
-            )
+        nearby_posts = Post.objects.filter(
+            location__dwithin=(user_location, D(m=radius)),
+        )
+        candidate_ids = nearby.cell_post_ids(cells)
+        if candidate_ids is None:
+            # A full cell's list misses older posts; use the GiST index instead
+            nearby_posts = nearby_posts.filter(visibility__in=nearby.NEARBY_VISIBILITIES)
+        else:
+            nearby_posts = nearby_posts.filter(pk__in=candidate_ids)
+
+        # Local posts and post radii are checked against the viewer's own location
+        return (
+            PrivacyService()
+            .filter_visible_posts(user, nearby_posts)
+            .select_related("author")
+            .with_viewer_flags(user)
             .annotate(distance=Distance("location", user_location))
             .order_by("distance", "-created_at")
         )
 
-        return nearby_posts
-
 
 @api_view(["POST", "DELETE"])
 @permission_classes([permissions.IsAuthenticated])
@@ -140,7 +171,7 @@ def like_post(request, post_id):
             NotificationService.notify_post_like(post, request.user)
 
         # TODO: Federate like activity
-        likes_count = post.likes.count()
+        likes_count = Post.objects.values_list("likes_count", flat=True).get(pk=post.pk)
         return Response({
             "liked_by_current_user": True,
             "likes_count": likes_count
@@ -154,7 +185,7 @@ def like_post(request, post_id):
         except Like.DoesNotExist:
             pass
         
-        likes_count = post.likes.count()
+        likes_count = Post.objects.values_list("likes_count", flat=True).get(pk=post.pk)
         return Response({
             "liked_by_current_user": False,
             "likes_count": likes_count
@@ -202,10 +233,15 @@ def post_comments(request, post_id):
     except Post.DoesNotExist:
         return Response({"error": "Post not found"}, status=404)
 
+    if not PrivacyService().can_user_see_post(request.user, post):
+        return Response({"error": "Post not found"}, status=404)
+
     if request.method == "GET":
         comments = Comment.objects.filter(post=post).select_related("author")
-        serializer = CommentSerializer(comments, many=True)
-        return Response(serializer.data)
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(comments, request)
+        serializer = CommentSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     elif request.method == "POST":
         # Apply rate limiting only to POST (comment creation)
@@ -275,4 +311,6 @@ class UserPostsView(generics.ListAPIView):
         return Post.objects.filter(
             author=user,
             visibility=1  # Only public posts for now
-        ).select_related('author').prefetch_related('likes').order_by('-created_at')
+        ).select_related('author').with_viewer_flags(
+            self.request.user
+        ).order_by('-created_at')
@@ -1,16 +1,23 @@
 # backend/privacy/middleware.py
-import time
-
 from django.conf import settings
-from django.core.cache import cache
 from django.http import JsonResponse
 
+from services import rate_limiter
+
 
 class PrivacyMiddleware:
     """Middleware for privacy and rate limiting"""
 
     def __init__(self, get_response):
         self.get_response = get_response
+        # Most clients are far below the global limit, so checks are answered
+        # from a per-worker bucket and synced to the shared limiter in batches
+        self.global_limit = rate_limiter.PreFilter(
+            limit=getattr(settings, "GLOBAL_RATE_LIMIT", 200),
+            window=getattr(settings, "GLOBAL_RATE_LIMIT_WINDOW", 60),
+            batch=getattr(settings, "GLOBAL_RATE_LIMIT_BATCH", 10),
+            sync_seconds=getattr(settings, "GLOBAL_RATE_LIMIT_SYNC_SECONDS", 5),
+        )
 
     def __call__(self, request):
         # Apply rate limiting
@@ -27,8 +34,7 @@ class PrivacyMiddleware:
 
         return response
 
-    @staticmethod
-    def _check_rate_limit(request):
+    def _check_rate_limit(self, request):
         """
         Global rate limiting as a safety net.
         Note: Most endpoints should use DRF throttling for more granular control.
@@ -46,13 +52,6 @@ class PrivacyMiddleware:
         else:
             ip = request.META.get("REMOTE_ADDR")
 
-        # Global rate limit: 200 requests per minute per IP (safety net)
+        # Global rate limit: GLOBAL_RATE_LIMIT (200) requests per minute per IP (safety net)
         # Individual endpoints have stricter limits via DRF throttling
-        key = f"global_rate_limit:{ip}"
-        current = cache.get(key, 0)
-
-        if current >= 200:
-            return False
-
-        cache.set(key, current + 1, 60)  # 60 seconds
-        return True
+        return self.global_limit.allow(f"global_rate_limit:{ip}")
@@ -5,9 +5,10 @@ from typing import Optional, Tuple
 
 from accounts.models import Follow, User
 from django.conf import settings
-from django.contrib.gis.db.models.functions import Distance
 from django.contrib.gis.geos import Point
 from django.contrib.gis.measure import D
+from django.db.models import F, Q, QuerySet, Value
+from django.db.models.functions import Coalesce, NullIf
 from posts.models import Post
 
 
@@ -38,48 +39,66 @@ class PrivacyService:
 
     def can_user_see_post(self, user: User, post: Post) -> bool:
         """Check if user can see a post based on privacy rules"""
-        # Author can always see their own posts
-        if post.author == user:
+        if post.author_id == user.pk:
             return True
+        # The same SQL predicate as the feeds, so a post listed in a feed is
+        # never refused when opened
+        return self.filter_visible_posts(
+            user, Post.objects.filter(pk=post.pk)
+        ).exists()
 
-        # Check base visibility level
-        if post.visibility == 4:  # Private
-            return False
-        elif post.visibility == 3:  # Followers only
-            if not self._is_follower(user, post.author):
-                return False
-        elif post.visibility == 1:  # Public
-            pass  # Anyone can see (if location check passes)
-        elif post.visibility == 2:  # Local (legacy)
-            if not self._is_in_local_area(user, post):
-                return False
+    @staticmethod
+    def in_local_area(point: Optional[Point]) -> Q:
+        """
+        Posts whose area contains point: within the post's location_radius,
+        or DEFAULT_LOCATION_RADIUS when unset, measured with ST_DWithin on the
+        geography column. The constant outer bound lets the GiST index on
+        Post.location narrow the candidates before the per-row radius applies.
+        """
+        if point is None:
+            return Q(pk__in=[])
+        bound = max(settings.MAX_LOCATION_RADIUS, settings.DEFAULT_LOCATION_RADIUS)
+        radius = Coalesce(
+            NullIf(F("location_radius"), 0), Value(settings.DEFAULT_LOCATION_RADIUS)
+        )
+        return Q(location__dwithin=(point, D(m=bound))) & Q(
+            location__dwithin=(point, radius)
+        )
 
-        # Additional location filter (if location_radius is set)
-        # This applies on top of visibility (e.g., "public + nearby" or "followers + nearby")
-        if post.location_radius and post.location:
-            if not self._is_in_local_area(user, post):
-                return False
+    def filter_visible_posts(
+            self, user: User, queryset: Optional[QuerySet] = None
+    ) -> QuerySet:
+        """
+        Restrict a Post queryset to the posts a user may see.
 
-        return True
+        Expresses the same rules as can_user_see_post as a single SQL
+        predicate, so ordering and pagination stay in the database.
+        """
+        if queryset is None:
+            queryset = Post.objects.all()
 
-    @staticmethod
-    def _is_follower(follower: User, following: User) -> bool:
-        """Check if user follows another user"""
-        return Follow.objects.filter(
-            follower=follower, following=following, accepted=True
-        ).exists()
+        # Local posts and posts with a radius both need the viewer in the area
+        in_local_area = self.in_local_area(user.approximate_location)
 
-    @staticmethod
-    def _is_in_local_area(user: User, post: Post) -> bool:
-        """Check if user is in the local area for a post"""
-        if not user.approximate_location or not post.location:
-            return False
-
-        # Use post's location radius or default
-        radius = post.location_radius or settings.DEFAULT_LOCATION_RADIUS
-
-        # Calculate distance (returns degrees, convert to meters)
-        distance_degrees = user.approximate_location.distance(post.location)
-        distance_meters = distance_degrees * 111320  # Approximate conversion
-        
-        return distance_meters <= radius
+        following_ids = Follow.objects.filter(
+            follower=user, accepted=True
+        ).values("following_id")
+
+        # Base visibility level
+        visibility_filter = (
+            Q(visibility=1)
+            | Q(visibility=3, author_id__in=following_ids)
+            | (Q(visibility=2) & in_local_area)
+        )
+
+        # Additional location filter (if location_radius is set)
+        location_filter = (
+            Q(location_radius__isnull=True)
+            | Q(location_radius=0)
+            | Q(location__isnull=True)
+            | in_local_area
+        )
+
+        return queryset.filter(
+            Q(author=user) | (visibility_filter & location_filter)
+        )
@@ -0,0 +1,125 @@
+# backend/services/counter_service.py
+from django.db.models import Count, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+
+class CounterService:
+    """Maintain denormalized counter columns on Post and User"""
+
+    POST_COUNTERS = ("likes_count", "comments_count", "replies_count")
+    USER_COUNTERS = (
+        "followers_count",
+        "following_count",
+        "posts_count",
+        "public_posts_count",
+    )
+
+    @staticmethod
+    def adjust(model, pk, **deltas):
+        """Atomically add deltas to counter columns, never going below zero"""
+        if pk is None or not deltas:
+            return
+        model.objects.filter(pk=pk).update(
+            **{
+                field: Greatest(F(field) + delta, Value(0))
+                for field, delta in deltas.items()
+            }
+        )
+
+    @staticmethod
+    def protect_counters(instance, counter_fields, kwargs):
+        """
+        Keep a full save() of an existing row from writing back counter
+        values that are stale in memory; counters only change via adjust().
+        """
+        if instance._state.adding or kwargs.get("update_fields") is not None:
+            return kwargs
+        if kwargs.get("force_insert"):
+            return kwargs
+        skip = set(counter_fields) | instance.get_deferred_fields()
+        kwargs["update_fields"] = [
+            field.name
+            for field in instance._meta.concrete_fields
+            if not field.primary_key
+            and field.name not in skip
+            and field.attname not in skip
+        ]
+        return kwargs
+
+    @staticmethod
+    def _count(queryset, group_field):
+        """Correlated COUNT subquery grouped on group_field"""
+        return Coalesce(
+            Subquery(
+                queryset.order_by()
+                .values(group_field)
+                .annotate(n=Count("pk"))
+                .values("n")
+            ),
+            Value(0),
+        )
+
+    @classmethod
+    def reconcile_posts(cls, batch_size: int = 1000) -> int:
+        """Recount post counters; returns the number of rows repaired"""
+        from posts.models import Comment, Like, Post
+
+        drifted = Post.objects.annotate(
+            true_likes=cls._count(Like.objects.filter(post=OuterRef("pk")), "post"),
+            true_comments=cls._count(
+                Comment.objects.filter(post=OuterRef("pk")), "post"
+            ),
+            true_replies=cls._count(
+                Post.objects.filter(reply_to=OuterRef("pk")), "reply_to"
+            ),
+        ).filter(
+            ~Q(likes_count=F("true_likes"))
+            | ~Q(comments_count=F("true_comments"))
+            | ~Q(replies_count=F("true_replies"))
+        )
+
+        repaired = []
+        for post in drifted.only("id").iterator(chunk_size=batch_size):
+            post.likes_count = post.true_likes
+            post.comments_count = post.true_comments
+            post.replies_count = post.true_replies
+            repaired.append(post)
+        Post.objects.bulk_update(repaired, cls.POST_COUNTERS, batch_size=batch_size)
+        return len(repaired)
+
+    @classmethod
+    def reconcile_users(cls, batch_size: int = 1000) -> int:
+        """Recount user counters; returns the number of rows repaired"""
+        from accounts.models import Follow, User
+        from posts.models import Post
+
+        drifted = User.objects.annotate(
+            true_followers=cls._count(
+                Follow.objects.filter(following=OuterRef("pk"), accepted=True),
+                "following",
+            ),
+            true_following=cls._count(
+                Follow.objects.filter(follower=OuterRef("pk"), accepted=True),
+                "follower",
+            ),
+            true_posts=cls._count(Post.objects.filter(author=OuterRef("pk")), "author"),
+            true_public_posts=cls._count(
+                Post.objects.filter(author=OuterRef("pk"), visibility__in=[1, 2]),
+                "author",
+            ),
+        ).filter(
+            ~Q(followers_count=F("true_followers"))
+            | ~Q(following_count=F("true_following"))
+            | ~Q(posts_count=F("true_posts"))
+            | ~Q(public_posts_count=F("true_public_posts"))
+        )
+
+        repaired = []
+        for user in drifted.only("id").iterator(chunk_size=batch_size):
+            user.followers_count = user.true_followers
+            user.following_count = user.true_following
+            user.posts_count = user.true_posts
+            user.public_posts_count = user.true_public_posts
+            repaired.append(user)
+        User.objects.bulk_update(repaired, cls.USER_COUNTERS, batch_size=batch_size)
+        return len(repaired)
@@ -1,16 +1,28 @@
 # backend/services/email_service.py
+import logging
 import secrets
+import smtplib
 from datetime import timedelta
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.core.mail import send_mail
+from django.core.mail import EmailMultiAlternatives, get_connection, send_mail
 from django.template.loader import render_to_string
 from django.utils import timezone
 from django.utils.html import strip_tags
 
+logger = logging.getLogger(__name__)
+
 User = get_user_model()
 
+# Failures that end a digest run; anything else only skips that recipient
+SMTP_CONNECTION_ERRORS = (
+    smtplib.SMTPServerDisconnected,
+    smtplib.SMTPConnectError,
+    ConnectionError,
+    TimeoutError,
+)
+
 
 class EmailVerificationService:
     """Handle email verification for users"""
@@ -84,6 +96,33 @@ class EmailVerificationService:
 class NotificationEmailService:
     """Handle notification emails"""
 
+    @staticmethod
+    def build_message(user, notifications):
+        """One email covering a user's notifications, newest first"""
+        context = {
+            "user": user,
+            "notification": notifications[0],
+            "notifications": notifications,
+            "instance_name": settings.INSTANCE_NAME,
+            "site_url": f"https://{settings.INSTANCE_DOMAIN}",
+        }
+
+        if len(notifications) == 1:
+            subject = f"New notification on {settings.INSTANCE_NAME}"
+            html_message = render_to_string("emails/notification.html", context)
+        else:
+            subject = f"{len(notifications)} new notifications on {settings.INSTANCE_NAME}"
+            html_message = render_to_string("emails/notification_digest.html", context)
+
+        message = EmailMultiAlternatives(
+            subject=subject,
+            body=strip_tags(html_message),
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[user.email],
+        )
+        message.attach_alternative(html_message, "text/html")
+        return message
+
     @staticmethod
     def send_notification_email(notification):
         """Send email for a notification"""
@@ -93,25 +132,81 @@ class NotificationEmailService:
         if not user.email_verified:
             return
 
-        context = {
-            "user": user,
-            "notification": notification,
-            "instance_name": settings.INSTANCE_NAME,
-            "site_url": f"https://{settings.INSTANCE_DOMAIN}",
-        }
-
-        html_message = render_to_string("emails/notification.html", context)
-        plain_message = strip_tags(html_message)
+        NotificationEmailService.build_message(user, [notification]).send(
+            fail_silently=True
+        )
 
-        send_mail(
-            subject=f"New notification on {settings.INSTANCE_NAME}",
-            message=plain_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email],
-            html_message=html_message,
-            fail_silently=True,
+    @staticmethod
+    def send_pending_digests(batch_size=None, on_batch=None):
+        """
+        Send every recipient with pending notifications one email covering
+        them all. Messages go out over a single SMTP connection, loaded in
+        batches of NOTIFICATION_DIGEST_BATCH_SIZE recipients; returns how
+        many were sent. Each recipient's notifications are marked as soon
+        as their message is accepted, so a failure leaves only unsent
+        digests pending for the next run. A recipient whose message fails
+        is skipped; a lost connection ends the run. on_batch is called after every
+        batch (the task uses it to keep its lock alive).
+        """
+        from notifications.models import Notification
+
+        if batch_size is None:
+            batch_size = getattr(settings, "NOTIFICATION_DIGEST_BATCH_SIZE", 100)
+
+        # Groups updated after this point keep their pending flag
+        started_at = timezone.now()
+        pending = Notification.objects.filter(
+            email_pending=True, created_at__lte=started_at
+        )
+        recipient_ids = list(
+            pending.order_by().values_list("recipient_id", flat=True).distinct()
         )
 
+        if not recipient_ids:
+            return 0
+
+        sent = 0
+        with get_connection() as connection:
+            for start in range(0, len(recipient_ids), batch_size):
+                notifications = (
+                    pending.filter(recipient_id__in=recipient_ids[start : start + batch_size])
+                    .select_related("recipient", "actor", "post")
+                    .order_by("-created_at")
+                )
+                by_recipient = {}
+                for notification in notifications:
+                    by_recipient.setdefault(notification.recipient_id, []).append(
+                        notification
+                    )
+
+                skipped_ids = []
+                for items in by_recipient.values():
+                    user = items[0].recipient
+                    ids = [item.pk for item in items]
+                    if not (user.email_verified and user.email):
+                        skipped_ids.extend(ids)
+                        continue
+                    message = NotificationEmailService.build_message(user, items)
+                    try:
+                        if not connection.send_messages([message]):
+                            continue
+                    except SMTP_CONNECTION_ERRORS as e:
+                        # The rest waits for the next run
+                        logger.warning(f"Notification digests stopped, connection lost: {e}")
+                        pending.filter(pk__in=skipped_ids).update(email_pending=False)
+                        return sent
+                    except Exception as e:
+                        # e.g. a refused address; stays pending, the others go out
+                        logger.warning(f"Notification digest to {user.pk} failed: {e}")
+                        continue
+                    sent += 1
+                    pending.filter(pk__in=ids).update(email_pending=False, emailed=True)
+
+                pending.filter(pk__in=skipped_ids).update(email_pending=False)
+                if on_batch is not None:
+                    on_batch()
+        return sent
+
 
 class PasswordResetEmailService:
     """Handle password reset emails"""
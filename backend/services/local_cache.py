@@ -0,0 +1,59 @@
+# backend/services/local_cache.py
+"""
+Small per-process LRU with a TTL, kept in front of the shared cache.
+
+Entries are only trusted for a short time, so an invalidation made in
+another process (which cannot reach this one) takes effect within that
+time. Limits are named settings, read on each call.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from django.conf import settings
+
+
+class LocalCache:
+    """Per-process LRU of (value, stored_at)"""
+
+    def __init__(
+        self,
+        max_age_setting: str,
+        max_age_default: float,
+        maxsize_setting: str,
+        maxsize_default: int,
+    ):
+        self._max_age = (max_age_setting, max_age_default)
+        self._maxsize = (maxsize_setting, maxsize_default)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        max_age = getattr(settings, *self._max_age)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, stored_at = entry
+            if time.monotonic() - stored_at > max_age:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        maxsize = getattr(settings, *self._maxsize)
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
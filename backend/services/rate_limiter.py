@@ -0,0 +1,167 @@
+# backend/services/rate_limiter.py
+"""
+Atomic rate limiting with GCRA (generic cell rate algorithm).
+
+Each key stores a single timestamp, the theoretical arrival time (TAT) of
+the next request. A hit advances it by window / limit and is allowed while
+the TAT stays within one window of now, so up to limit requests may burst
+and the allowance then refills evenly. With Redis the whole check runs as
+one Lua script, a single atomic round trip using the server's clock; keys
+expire as soon as the allowance is full again. Other cache backends (the
+local memory cache used in development) fall back to the same algorithm
+under a per-process lock.
+
+PreFilter puts a per-worker token bucket in front of hit() for hot, loose
+limits such as the global per-IP limit: most checks are answered in
+memory, and hits are reported to the shared limiter in batches.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from django.core.cache import cache
+from services import redis_client
+
+# KEYS: key. ARGV: emission interval, window (seconds), hits already served.
+# Returns {allowed, seconds until the next request would be allowed,
+# requests still allowed right now}
+_GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local tat = tonumber(redis.call('GET', KEYS[1]) or 0)
+if tat < now then
+    tat = now
+end
+tat = tat + tonumber(ARGV[3]) * interval
+local allowed = 0
+local retry_after = 0
+if tat + interval - now <= window then
+    tat = tat + interval
+    allowed = 1
+else
+    retry_after = tat + interval - now - window
+end
+if tat > now then
+    redis.call('SET', KEYS[1], tostring(tat), 'PX', math.ceil((tat - now) * 1000))
+end
+local remaining = math.max(0, math.floor((window - (tat - now)) / interval))
+return {allowed, tostring(retry_after), remaining}
+"""
+
+_local_lock = threading.Lock()
+_script = None
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    retry_after: float  # seconds; 0 when allowed
+    remaining: int  # further requests allowed right now
+
+
+def _key(key: str) -> str:
+    return f"ratelimit:{key}"
+
+
+def hit(key: str, limit: int, window: float, served: int = 0) -> RateLimitResult:
+    """
+    Count one request against limit requests per window seconds for key.
+    served adds hits that were already let through elsewhere (PreFilter).
+    """
+    global _script
+
+    interval = window / limit
+    client = redis_client.get_client()
+    if client is None:
+        return _hit_local(key, interval, window, served)
+
+    if _script is None:
+        _script = client.register_script(_GCRA_SCRIPT)
+    allowed, retry_after, remaining = _script(
+        keys=[cache.make_key(_key(key))],
+        args=[interval, window, served],
+        client=client,
+    )
+    return RateLimitResult(bool(allowed), float(retry_after), int(remaining))
+
+
+def _hit_local(key: str, interval: float, window: float, served: int) -> RateLimitResult:
+    with _local_lock:
+        now = time.time()
+        tat = max(cache.get(_key(key), 0), now) + served * interval
+        allowed = tat + interval - now <= window
+        retry_after = 0.0
+        if allowed:
+            tat += interval
+        else:
+            retry_after = tat + interval - now - window
+        if tat > now:
+            cache.set(_key(key), tat, tat - now)
+        remaining = max(0, math.floor((window - (tat - now)) / interval))
+        return RateLimitResult(allowed, retry_after, remaining)
+
+
+class _Bucket:
+    __slots__ = ("tokens", "pending", "expires")
+
+    def __init__(self):
+        self.tokens = 0
+        self.pending = 0
+        self.expires = 0.0
+
+
+class PreFilter:
+    """
+    Per-worker token bucket in front of hit().
+
+    A sync reports the hits served locally since the last one and takes up
+    to batch tokens of the remaining shared allowance; later checks spend
+    those tokens in memory until they run out or sync_seconds pass. Near
+    the limit the shared allowance is small, so checks fall back to syncing
+    every request. Each worker can let through at most batch requests the
+    shared limiter has not seen yet, which bounds the error; batch=0 makes
+    every check exact.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        window: float,
+        batch: int,
+        sync_seconds: float,
+        max_keys: int = 10000,
+    ):
+        self.limit = limit
+        self.window = window
+        self.batch = batch
+        self.sync_seconds = sync_seconds
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def allow(self, key: str) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = _Bucket()
+                if len(self._buckets) > self.max_keys:
+                    # Unsynced hits of the least recently seen key are dropped
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+            if bucket.tokens > 0 and now < bucket.expires:
+                bucket.tokens -= 1
+                bucket.pending += 1
+                return True
+            served, bucket.pending = bucket.pending, 0
+
+        result = hit(key, self.limit, self.window, served=served)
+
+        with self._lock:
+            bucket.tokens = min(self.batch, result.remaining)
+            bucket.expires = now + self.sync_seconds
+        return result.allowed
@@ -0,0 +1,10 @@
+# backend/services/redis_client.py
+from django.core.cache import cache
+
+
+def get_client():
+    """Raw Redis client behind the default cache, or None without Redis"""
+    backend = getattr(cache, "_cache", None)
+    if backend is None or not hasattr(backend, "get_client"):
+        return None
+    return backend.get_client(write=True)
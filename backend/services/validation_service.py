@@ -187,13 +187,6 @@ class RateLimitService:
     @staticmethod
     def check_rate_limit(user, action, limit=10, window=60):
         """Check if user has exceeded rate limit for an action"""
-        from django.core.cache import cache
+        from services import rate_limiter
 
-        key = f"rate_limit:{user.id}:{action}"
-        current = cache.get(key, 0)
-
-        if current >= limit:
-            return False
-
-        cache.set(key, current + 1, window)
-        return True
+        return rate_limiter.hit(f"rate_limit:{user.id}:{action}", limit, window).allowed
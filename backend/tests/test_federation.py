@@ -29,3 +29,556 @@ def test_actor_generation(user):
 
 
 
+
+
+@pytest.mark.asyncio
+async def test_send_activity_batch_limits_per_host(settings, monkeypatch):
+    """Deliveries run concurrently but never exceed the per-host limit."""
+    import asyncio
+
+    from federation.services import ActivityPubService
+
+    settings.ACTIVITYPUB_DELIVERY_PER_HOST_CONCURRENCY = 2
+    in_flight = {}
+    peak = {}
+
+    async def fake_post(self, sender, activity, inbox_url):
+        host = inbox_url.split("/")[2]
+        in_flight[host] = in_flight.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), in_flight[host])
+        await asyncio.sleep(0.01)
+        in_flight[host] -= 1
+        return "HTTP 500" if inbox_url.endswith("/broken") else ""
+
+    monkeypatch.setattr(ActivityPubService, "_post_activity", fake_post)
+
+    inboxes = [f"https://a.example/users/{i}/inbox" for i in range(6)]
+    inboxes += ["https://b.example/inbox", "https://b.example/broken"]
+    results = await ActivityPubService().send_activity_batch(None, {}, inboxes)
+
+    assert peak["a.example"] == 2
+    assert results["https://b.example/inbox"] == ""
+    assert results["https://b.example/broken"] == "HTTP 500"
+
+
+@pytest.mark.django_db
+def test_failed_delivery_backs_off_then_dead_letters(user, settings):
+    """Each inbox job retries on its own schedule and is dead-lettered at the limit."""
+    from django.utils import timezone
+
+    from federation.models import DeliveryJob
+    from federation.tasks import _schedule_retry
+
+    settings.ACTIVITYPUB_DELIVERY_MAX_RETRIES = 1
+    job = DeliveryJob.objects.create(
+        sender=user,
+        activity_id="https://example.com/activities/1",
+        activity={"type": "Create"},
+        inbox_url="https://remote.example/inbox",
+        next_attempt_at=timezone.now(),
+    )
+
+    _schedule_retry(job, "HTTP 500")
+    job.refresh_from_db()
+    assert job.status == "pending"
+    assert job.attempts == 1
+    assert job.next_attempt_at > timezone.now()
+
+    _schedule_retry(job, "HTTP 500")
+    job.refresh_from_db()
+    assert job.status == "dead"
+
+
+@pytest.mark.django_db
+def test_delivery_queue_records_errors_and_requeues_full_batches(
+    user, settings, monkeypatch
+):
+    """Failed jobs keep the real error; a full batch queues the next run."""
+    from django.utils import timezone
+
+    from federation import tasks
+    from federation.models import DeliveryJob
+    from federation.services import ActivityPubService
+
+    async def fake_post(self, sender, activity, inbox_url):
+        return "" if inbox_url.endswith("/ok") else "HTTP 410"
+
+    monkeypatch.setattr(ActivityPubService, "_post_activity", fake_post)
+    queued = []
+    monkeypatch.setattr(
+        tasks.process_delivery_queue, "delay", lambda **kwargs: queued.append(kwargs)
+    )
+
+    for inbox in ("https://remote.example/ok", "https://gone.example/inbox"):
+        DeliveryJob.objects.create(
+            sender=user,
+            activity_id="https://example.com/activities/1",
+            activity={"type": "Create"},
+            inbox_url=inbox,
+            next_attempt_at=timezone.now(),
+        )
+
+    assert tasks.process_delivery_queue(batch_size=2) == 1
+    assert queued == [{"activity_id": None, "batch_size": 2}]
+    failed = DeliveryJob.objects.get(inbox_url="https://gone.example/inbox")
+    assert failed.last_error == "HTTP 410"
+    assert failed.status == "pending"
+
+
+@pytest.mark.django_db
+def test_federation_targets_collapse_onto_shared_inbox(user, post):
+    """Followers on one server share a single delivery; others fall back to their inbox."""
+    from federation.models import RemoteFollower, RemoteInstance, RemoteUser
+    from federation.tasks import get_federation_targets
+
+    big = RemoteInstance.objects.create(domain="big.example")
+    small = RemoteInstance.objects.create(domain="small.example")
+    for i in range(3):
+        remote = RemoteUser.objects.create(
+            instance=big,
+            actor_uri=f"https://big.example/users/u{i}",
+            username=f"u{i}",
+            inbox_url=f"https://big.example/users/u{i}/inbox",
+            shared_inbox_url="https://big.example/inbox",
+            public_key="",
+        )
+        RemoteFollower.objects.create(remote_user=remote, local_user=user, accepted=True)
+    loner = RemoteUser.objects.create(
+        instance=small,
+        actor_uri="https://small.example/users/solo",
+        username="solo",
+        inbox_url="https://small.example/users/solo/inbox",
+        public_key="",
+    )
+    RemoteFollower.objects.create(remote_user=loner, local_user=user, accepted=True)
+
+    targets = get_federation_targets(user, post)
+
+    assert sorted(targets) == [
+        "https://big.example/inbox",
+        "https://small.example/users/solo/inbox",
+    ]
+
+
+@pytest.mark.django_db
+def test_inbox_queues_activity_and_returns_202(client, monkeypatch):
+    """Verified activities are queued once, with no DB writes in the request."""
+    import json
+
+    from django.core.cache import cache
+
+    from federation import views
+    from federation.models import Activity
+
+    cache.clear()
+    queued = []
+    monkeypatch.setattr(views, "_verify_signature", lambda request: True)
+    monkeypatch.setattr(views.process_inbox_activity, "delay", queued.append)
+
+    activity = {
+        "id": "https://remote.example/activities/1",
+        "type": "Like",
+        "actor": "https://remote.example/users/alice",
+        "object": "https://glade.example/posts/1",
+    }
+    for _ in range(2):
+        response = client.post(
+            "/inbox",
+            data=json.dumps(activity),
+            content_type="application/activity+json",
+        )
+        assert response.status_code == 202
+
+    assert queued == [activity]
+    assert not Activity.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_key_lookup_is_coalesced_and_negatively_cached(monkeypatch):
+    """Concurrent lookups for an unknown actor share one fetch; failures are cached."""
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    from django.core.cache import cache
+
+    from federation import keys
+
+    cache.clear()
+    calls = []
+
+    async def fake_fetch(actor_uri):
+        calls.append(actor_uri)
+        await asyncio.sleep(0.2)
+        return "PEM" if actor_uri.endswith("/alice") else None
+
+    monkeypatch.setattr(keys, "_fetch_public_key", fake_fetch)
+
+    alice = "https://new.example/users/alice"
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(keys.resolve_public_key, [alice] * 8))
+    assert results == [b"PEM"] * 8
+    assert calls == [alice]
+
+    ghost = "https://new.example/users/ghost"
+    assert keys.resolve_public_key(ghost) is None
+    assert keys.resolve_public_key(ghost) is None
+    assert calls == [alice, ghost]
+
+
+@pytest.mark.django_db
+def test_actor_cache_serves_stale_and_invalidates_on_update(monkeypatch):
+    """Expired records are served while a refresh is scheduled; saves invalidate."""
+    from datetime import timedelta
+
+    from django.core.cache import cache
+    from django.utils import timezone
+
+    from federation import actor_cache
+    from federation.models import RemoteInstance, RemoteUser
+
+    cache.clear()
+    actor_cache._local.clear()
+    refreshed = []
+    monkeypatch.setattr(actor_cache, "schedule_refresh", refreshed.append)
+
+    instance = RemoteInstance.objects.create(domain="remote.example")
+    remote_user = RemoteUser.objects.create(
+        instance=instance,
+        actor_uri="https://remote.example/users/bob",
+        username="bob",
+        inbox_url="https://remote.example/users/bob/inbox",
+        public_key="OLD",
+    )
+    RemoteUser.objects.filter(pk=remote_user.pk).update(
+        last_fetched_at=timezone.now() - timedelta(days=1)
+    )
+
+    record = actor_cache.get_actor(remote_user.actor_uri)
+    assert record.public_key_pem == "OLD"
+    assert record.as_remote_user().pk == remote_user.pk
+    assert refreshed == [remote_user.actor_uri]
+
+    remote_user.public_key = "NEW"
+    remote_user.save()
+    assert actor_cache.get_actor(remote_user.actor_uri).public_key_pem == "NEW"
+
+
+@pytest.mark.django_db
+def test_inbox_dedupe_gate_skips_verification_for_redeliveries(client, monkeypatch):
+    """Accepted activity IDs are answered 202 before signature checks and counted."""
+    import json
+
+    from django.core.cache import cache
+
+    from federation import dedupe, views
+
+    cache.clear()
+    verified = []
+    monkeypatch.setattr(views, "_verify_signature", lambda r: verified.append(r) or True)
+    monkeypatch.setattr(views.process_inbox_activity, "delay", lambda pk: None)
+
+    body = json.dumps(
+        {
+            "id": "https://remote.example/activities/2",
+            "type": "Like",
+            "actor": "https://remote.example/users/alice",
+            "object": "https://glade.example/posts/1",
+        }
+    )
+    for _ in range(3):
+        response = client.post(
+            "/inbox", data=body, content_type="application/activity+json"
+        )
+        assert response.status_code == 202
+
+    assert len(verified) == 1
+    assert dedupe.duplicate_count() == 2
+
+
+@pytest.mark.django_db
+def test_failed_inbox_processing_releases_dedupe_claim(monkeypatch):
+    """A delivery whose processing fails is not answered "duplicate" on retry."""
+    from django.core.cache import cache
+
+    from federation import dedupe, tasks
+
+    cache.clear()
+    activity = {
+        "id": "https://remote.example/activities/3",
+        "type": "Like",
+        "actor": "https://remote.example/users/alice",
+        "object": "https://glade.example/posts/1",
+    }
+
+    async def fail(self, activity):
+        return {"status": "error", "reason": "boom"}
+
+    monkeypatch.setattr(tasks.ActivityHandler, "handle_activity", fail)
+    assert dedupe.claim(activity["id"])
+
+    tasks.process_inbox_activity(activity)
+
+    assert not dedupe.is_duplicate(activity["id"])
+
+
+@pytest.mark.django_db
+def test_crashed_inbox_processing_is_logged(monkeypatch):
+    """An activity whose handler raises still gets an inbound log row."""
+    from federation import activity_log, tasks
+    from federation.models import Activity
+
+    activity_log.flush()
+    activity = {
+        "id": "https://remote.example/activities/4",
+        "type": "Like",
+        "actor": "https://remote.example/users/alice",
+        "object": "https://glade.example/posts/1",
+    }
+
+    async def crash(self, activity):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(tasks.ActivityHandler, "handle_activity", crash)
+    with pytest.raises(RuntimeError):
+        tasks.process_inbox_activity(activity)
+
+    activity_log.flush()
+    row = Activity.objects.get(activity_id=activity["id"])
+    assert row.direction == "inbound"
+    assert not row.processed
+    assert row.error_message == "RuntimeError: boom"
+
+
+@pytest.mark.django_db
+def test_activity_log_batches_and_stubs_payloads(settings):
+    """Rows are written in one batch, once per target inbox, with large payloads stubbed."""
+    from federation import activity_log
+    from federation.models import Activity
+
+    settings.ACTIVITYPUB_ACTIVITY_LOG_PAYLOAD_MAX_BYTES = 200
+    activity_log.flush()
+
+    note = {"id": "https://glade.example/notes/1", "content": "x" * 500}
+    activity = {
+        "id": "https://glade.example/activities/1",
+        "type": "Create",
+        "actor": "https://glade.example/users/testuser",
+        "object": note,
+    }
+    for inbox in ("https://a.example/inbox", "https://b.example/inbox"):
+        activity_log.log_activity(activity, "outbound", target=inbox)
+    assert not Activity.objects.exists()
+
+    activity_log.log_activity({"type": "Delete", "actor": activity["actor"]}, "inbound")
+
+    assert activity_log.flush() == 3
+    assert set(Activity.objects.values_list("target", flat=True)) == {
+        "https://a.example/inbox",
+        "https://b.example/inbox",
+        "",
+    }
+    assert Activity.objects.get(activity_type="Delete").activity_id is None
+    row = Activity.objects.filter(direction="outbound").first()
+    assert row.raw_activity == {
+        "id": activity["id"],
+        "type": "Create",
+        "actor": activity["actor"],
+        "object": note["id"],
+        "truncated": True,
+    }
+
+
+@pytest.mark.django_db
+def test_outbox_pages_with_keyset_cursors_and_etags(client, user, settings):
+    """The outbox root links to pages that walk all public posts; repeats get 304."""
+    from django.core.cache import cache
+
+    from posts.models import Post
+
+    cache.clear()
+    settings.ACTIVITYPUB_COLLECTION_PAGE_SIZE = 2
+    for i in range(5):
+        Post.objects.create(author=user, content=f"post {i}", visibility=1)
+    Post.objects.create(author=user, content="private", visibility=4)
+
+    url = f"/users/{user.username}/outbox"
+    root = client.get(url)
+    assert root.json()["totalItems"] == 5
+
+    contents, next_url = [], root.json()["first"]
+    while next_url:
+        page = client.get(next_url.split(settings.INSTANCE_DOMAIN, 1)[1]).json()
+        contents += [item["object"]["content"] for item in page["orderedItems"]]
+        next_url = page.get("next")
+    assert contents == [f"post {i}" for i in reversed(range(5))]
+
+    again = client.get(url, HTTP_IF_NONE_MATCH=root["ETag"])
+    assert again.status_code == 304
+
+
+@pytest.mark.django_db
+def test_followers_collection_root_is_count_only(client, user, settings):
+    """The root carries only the count; pages list follower actors newest first."""
+    from django.contrib.auth import get_user_model
+    from django.core.cache import cache
+
+    from accounts.models import Follow
+
+    cache.clear()
+    settings.ACTIVITYPUB_COLLECTION_PAGE_SIZE = 2
+    User = get_user_model()
+    followers = [
+        User.objects.create_user(
+            username=f"fan{i}", email=f"fan{i}@example.com", password="password123"
+        )
+        for i in range(3)
+    ]
+    for follower in followers:
+        Follow.objects.create(follower=follower, following=user, accepted=True)
+
+    root = client.get(f"/users/{user.username}/followers").json()
+    assert root["totalItems"] == 3
+    assert "orderedItems" not in root
+
+    page = client.get(f"/users/{user.username}/followers?page=true").json()
+    assert page["orderedItems"] == [f.actor_uri for f in reversed(followers)][:2]
+    assert "before=" in page["next"]
+
+    Follow.objects.filter(follower=followers[0]).delete()
+    root = client.get(f"/users/{user.username}/followers").json()
+    assert root["totalItems"] == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_actor_fetch_rejects_documents_for_other_servers(monkeypatch):
+    """A server answering with another server's actor id cannot replace its key."""
+    from asgiref.sync import async_to_sync
+    from django.core.cache import cache
+
+    from federation import actor_cache, services
+    from federation.models import RemoteInstance, RemoteUser
+
+    cache.clear()
+    actor_cache._local.clear()
+    victim = RemoteUser.objects.create(
+        instance=RemoteInstance.objects.create(domain="victim.example"),
+        actor_uri="https://victim.example/users/alice",
+        username="alice",
+        inbox_url="https://victim.example/users/alice/inbox",
+        public_key="VICTIM",
+    )
+
+    class FakeResponse:
+        status_code = 200
+
+        def json(self):
+            return {
+                "id": victim.actor_uri,
+                "type": "Person",
+                "preferredUsername": "alice",
+                "inbox": "https://evil.example/inbox",
+                "publicKey": {"publicKeyPem": "EVIL"},
+            }
+
+    class FakeClient:
+        async def get(self, url, headers=None):
+            return FakeResponse()
+
+    monkeypatch.setattr(services, "get_async_client", FakeClient)
+
+    evil = "https://evil.example/actor"
+    assert async_to_sync(services.ActivityPubService().fetch_actor)(evil) == {}
+    assert async_to_sync(actor_cache.refresh_actor)(evil) is None
+    victim.refresh_from_db()
+    assert victim.public_key == "VICTIM"
+    assert victim.inbox_url == "https://victim.example/users/alice/inbox"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_actor_update_refetches_instead_of_trusting_payload(monkeypatch):
+    """An actor Update only schedules a refetch; its key is never stored."""
+    from asgiref.sync import async_to_sync
+    from django.core.cache import cache
+
+    from federation import actor_cache
+    from federation.handlers import ActivityHandler
+    from federation.models import RemoteInstance, RemoteUser
+
+    cache.clear()
+    actor_cache._local.clear()
+    refreshed = []
+    monkeypatch.setattr(actor_cache, "schedule_refresh", refreshed.append)
+
+    remote_user = RemoteUser.objects.create(
+        instance=RemoteInstance.objects.create(domain="remote.example"),
+        actor_uri="https://remote.example/users/bob",
+        username="bob",
+        inbox_url="https://remote.example/users/bob/inbox",
+        public_key="OLD",
+    )
+    update = {
+        "type": "Update",
+        "actor": remote_user.actor_uri,
+        "object": {
+            "id": remote_user.actor_uri,
+            "type": "Person",
+            "inbox": "https://evil.example/inbox",
+            "publicKey": {"publicKeyPem": "EVIL"},
+        },
+    }
+
+    result = async_to_sync(ActivityHandler().handle_activity)(update)
+    assert result["action"] == "actor_refetch_scheduled"
+    assert refreshed == [remote_user.actor_uri]
+    remote_user.refresh_from_db()
+    assert remote_user.public_key == "OLD"
+    assert remote_user.inbox_url == "https://remote.example/users/bob/inbox"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_accept_from_cached_actor_backfills_posts(user, monkeypatch):
+    """An Accept resolved through the actor cache hands backfill a full RemoteUser."""
+    from asgiref.sync import async_to_sync
+    from django.core.cache import cache
+
+    from federation import actor_cache
+    from federation.actor_cache import ActorRecord
+    from federation.handlers import ActivityHandler
+    from federation.models import RemoteFollow, RemoteInstance, RemoteUser
+    from federation.services import ActivityPubService
+
+    cache.clear()
+    actor_cache._local.clear()
+    remote_user = RemoteUser.objects.create(
+        instance=RemoteInstance.objects.create(domain="remote.example"),
+        actor_uri="https://remote.example/users/bob",
+        username="bob",
+        inbox_url="https://remote.example/users/bob/inbox",
+        outbox_url="https://remote.example/users/bob/outbox",
+        public_key="KEY",
+    )
+    actor_cache.store(ActorRecord.from_remote_user(remote_user))
+
+    fetched = []
+
+    async def fake_fetch(self, remote_user):
+        # Deferred fields would raise SynchronousOnlyOperation here
+        fetched.append((remote_user.username, remote_user.outbox_url))
+        return 0
+
+    monkeypatch.setattr(ActivityPubService, "fetch_remote_posts", fake_fetch)
+
+    accept = {
+        "type": "Accept",
+        "actor": remote_user.actor_uri,
+        "object": {
+            "type": "Follow",
+            "actor": f"https://example.com/users/{user.username}",
+            "object": remote_user.actor_uri,
+        },
+    }
+    result = async_to_sync(ActivityHandler().handle_activity)(accept)
+
+    assert result == {"status": "success", "action": "follow_accepted"}
+    assert fetched == [("bob", "https://remote.example/users/bob/outbox")]
+    assert RemoteFollow.objects.get(follower=user, remote_user=remote_user).accepted
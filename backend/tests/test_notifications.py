@@ -0,0 +1,202 @@
+import pytest
+from django.contrib.auth import get_user_model
+
+from notifications import preferences as notification_preferences
+from notifications.models import Notification
+from notifications.services import NotificationService
+from posts.models import Like
+
+
+@pytest.mark.django_db
+def test_create_notification_reads_cached_preferences(
+    post, django_assert_num_queries
+):
+    """With preferences cached, a like costs only the group lookup and the INSERT."""
+    liker = get_user_model().objects.create_user(
+        username="liker", email="liker@example.com", password="password123"
+    )
+    notification_preferences.get(post.author)
+
+    with django_assert_num_queries(2):
+        notification = NotificationService.notify_post_like(post, liker)
+
+    assert Notification.objects.filter(pk=notification.pk).exists()
+
+    preferences = post.author.notification_preferences
+    preferences.notify_on_likes = False
+    preferences.save()
+    notification_preferences.invalidate(post.author.pk)
+    assert NotificationService.notify_post_like(post, liker) is None
+
+
+@pytest.mark.django_db
+def test_likes_on_a_post_are_grouped(post):
+    User = get_user_model()
+    likers = [
+        User.objects.create_user(
+            username=f"liker{i}", email=f"liker{i}@example.com", password="password123"
+        )
+        for i in range(3)
+    ]
+
+    # A, B, A: the repeated liker counts once
+    for liker in [likers[0], likers[1], likers[0]]:
+        Like.objects.get_or_create(user=liker, post=post)
+        NotificationService.notify_post_like(post, liker)
+
+    notification = Notification.objects.get(recipient=post.author)
+    assert notification.actor == likers[0]
+    assert notification.others_count == 1
+    assert notification.display_message == "liker0 and 1 other liked your post"
+
+    # Unliking drops out of the count on the next event
+    Like.objects.filter(user=likers[1], post=post).delete()
+    Like.objects.create(user=likers[2], post=post)
+    NotificationService.notify_post_like(post, likers[2])
+    notification.refresh_from_db()
+    assert notification.actor == likers[2]
+    assert notification.others_count == 1
+
+
+@pytest.mark.django_db
+def test_follow_accepted_does_not_join_follow_groups(user):
+    from accounts.models import Follow
+
+    User = get_user_model()
+    followed = User.objects.create_user(
+        username="followed", email="followed@example.com", password="password123"
+    )
+    follower = User.objects.create_user(
+        username="follower", email="follower@example.com", password="password123"
+    )
+
+    Follow.objects.create(follower=user, following=followed, accepted=True)
+    NotificationService.notify_follow_accepted(user, followed)
+    Follow.objects.create(follower=follower, following=user, accepted=True)
+    NotificationService.notify_follow(user, follower)
+
+    notifications = Notification.objects.filter(recipient=user)
+    assert notifications.count() == 2
+    assert all(n.others_count == 0 for n in notifications)
+
+
+@pytest.mark.django_db
+def test_pending_notifications_go_out_as_one_digest(post, mailoutbox):
+    from services.email_service import NotificationEmailService
+
+    author = post.author
+    author.email = "author@example.com"
+    author.email_verified = True
+    author.save(update_fields=["email", "email_verified"])
+    actor = get_user_model().objects.create_user(
+        username="replier", email="replier@example.com", password="password123"
+    )
+    for i in range(3):
+        Notification.objects.create(
+            recipient=author,
+            actor=actor,
+            notification_type="reply",
+            message=f"replier replied to your post ({i})",
+            post=post,
+            email_pending=True,
+        )
+
+    assert NotificationEmailService.send_pending_digests() == 1
+
+    assert len(mailoutbox) == 1
+    assert mailoutbox[0].subject.startswith("3 new notifications")
+    assert not Notification.objects.filter(email_pending=True).exists()
+    assert Notification.objects.filter(emailed=True).count() == 3
+
+
+@pytest.mark.django_db
+def test_failed_digest_leaves_only_unsent_messages_pending(post, mailoutbox, monkeypatch):
+    from django.core.mail.backends.locmem import EmailBackend
+
+    from services.email_service import NotificationEmailService
+
+    User = get_user_model()
+    actor = User.objects.create_user(
+        username="replier", email="replier@example.com", password="password123"
+    )
+    for i in range(2):
+        recipient = User.objects.create_user(
+            username=f"reader{i}", email=f"reader{i}@example.com", password="password123"
+        )
+        recipient.email_verified = True
+        recipient.save(update_fields=["email_verified"])
+        Notification.objects.create(
+            recipient=recipient,
+            actor=actor,
+            notification_type="reply",
+            message="replier replied to your post",
+            post=post,
+            email_pending=True,
+        )
+
+    send_messages = EmailBackend.send_messages
+    calls = []
+
+    def flaky_send(self, messages):
+        calls.append(messages)
+        if len(calls) > 1:
+            raise ConnectionResetError("connection reset")
+        return send_messages(self, messages)
+
+    monkeypatch.setattr(EmailBackend, "send_messages", flaky_send)
+    assert NotificationEmailService.send_pending_digests() == 1
+    assert Notification.objects.filter(emailed=True).count() == 1
+    assert Notification.objects.filter(email_pending=True).count() == 1
+
+    # The next run only sends the digest that failed
+    monkeypatch.setattr(EmailBackend, "send_messages", send_messages)
+    assert NotificationEmailService.send_pending_digests() == 1
+    assert len(mailoutbox) == 2
+    assert {message.to[0] for message in mailoutbox} == {
+        "reader0@example.com",
+        "reader1@example.com",
+    }
+
+
+@pytest.mark.django_db
+def test_refused_recipient_does_not_block_other_digests(post, mailoutbox, monkeypatch):
+    import smtplib
+
+    from django.core.mail.backends.locmem import EmailBackend
+
+    from services.email_service import NotificationEmailService
+
+    User = get_user_model()
+    actor = User.objects.create_user(
+        username="replier", email="replier@example.com", password="password123"
+    )
+    for name in ("bounced", "reader"):
+        recipient = User.objects.create_user(
+            username=name, email=f"{name}@example.com", password="password123"
+        )
+        recipient.email_verified = True
+        recipient.save(update_fields=["email_verified"])
+        Notification.objects.create(
+            recipient=recipient,
+            actor=actor,
+            notification_type="reply",
+            message="replier replied to your post",
+            post=post,
+            email_pending=True,
+        )
+
+    send_messages = EmailBackend.send_messages
+
+    def refusing_send(self, messages):
+        if messages[0].to == ["bounced@example.com"]:
+            raise smtplib.SMTPRecipientsRefused({"bounced@example.com": (550, b"no")})
+        return send_messages(self, messages)
+
+    monkeypatch.setattr(EmailBackend, "send_messages", refusing_send)
+    assert NotificationEmailService.send_pending_digests() == 1
+    assert [message.to for message in mailoutbox] == [["reader@example.com"]]
+    assert list(
+        Notification.objects.filter(email_pending=True).values_list(
+            "recipient__username", flat=True
+        )
+    ) == ["bounced"]
@@ -8,3 +8,253 @@ def test_post_creation_and_actor(post):
     assert actor["type"] == "Person"
     assert "https://" in actor["id"]
     assert "publicKey" in actor
+
+
+@pytest.mark.django_db
+def test_counters_follow_creates_and_deletes(post, user):
+    """Counter columns track likes, comments, replies and posts without COUNT queries."""
+    from posts.models import Comment, Like, Post
+
+    like = Like.objects.create(user=user, post=post)
+    Comment.objects.create(post=post, author=user, content="nice")
+    reply = Post.objects.create(author=user, content="reply", reply_to=post, visibility=4)
+
+    # A stale in-memory copy must not write old counts back
+    post.content = "edited"
+    post.save()
+
+    post.refresh_from_db()
+    user.refresh_from_db()
+    assert (post.likes_count, post.comments_count, post.replies_count) == (1, 1, 1)
+    assert (user.posts_count, user.public_posts_count) == (2, 1)
+
+    like.delete()
+    reply.delete()
+    post.refresh_from_db()
+    user.refresh_from_db()
+    assert (post.likes_count, post.replies_count) == (0, 0)
+    assert (user.posts_count, user.public_posts_count) == (1, 1)
+
+
+@pytest.mark.django_db
+def test_reconcile_counters_repairs_drift(post, user):
+    from django.core.management import call_command
+
+    from posts.models import Like, Post
+
+    Like.objects.create(user=user, post=post)
+    Post.objects.filter(pk=post.pk).update(likes_count=7)
+    type(user).objects.filter(pk=user.pk).update(posts_count=0)
+
+    call_command("reconcile_counters")
+
+    post.refresh_from_db()
+    user.refresh_from_db()
+    assert post.likes_count == 1
+    assert user.posts_count == 1
+
+
+@pytest.mark.django_db
+def test_user_posts_resolve_liked_flag_without_per_post_queries(
+    user, django_assert_max_num_queries
+):
+    """liked_by_current_user comes from one EXISTS annotation, not a query per post."""
+    from rest_framework.test import APIClient
+
+    from posts.models import Like, Post
+
+    posts = [Post.objects.create(author=user, content=f"p{i}", visibility=1) for i in range(6)]
+    Like.objects.create(user=user, post=posts[0])
+
+    client = APIClient()
+    client.force_authenticate(user)
+    with django_assert_max_num_queries(4):
+        response = client.get(f"/api/v1/posts/user/{user.username}/")
+
+    results = response.json()
+    results = results.get("results", results)
+    liked = {item["content"]: item["liked_by_current_user"] for item in results}
+    assert liked["p0"] is True
+    assert not any(value for content, value in liked.items() if content != "p0")
+
+
+@pytest.mark.django_db
+def test_home_timeline_fans_out_and_forgets_unfollowed_authors(
+    user, mock_redis, monkeypatch
+):
+    """Built timelines receive followed posts; unfollowing removes them again."""
+    from django.contrib.auth import get_user_model
+
+    from accounts.models import Follow
+    from posts import timeline
+    from posts.models import Post
+    from services import redis_client
+
+    monkeypatch.setattr(redis_client, "get_client", lambda: mock_redis)
+    author = get_user_model().objects.create_user(username="author", password="pw")
+    Follow.objects.create(follower=user, following=author, accepted=True)
+
+    first = Post.objects.create(author=author, content="before", visibility=1)
+    # Cold timelines are skipped on fan-out and built on first read
+    assert timeline.push(first) == 0
+    posts, has_older = timeline.page(user, Post.objects.all(), 10)
+    assert [p.content for p in posts] == ["before"] and not has_older
+
+    second = Post.objects.create(author=author, content="after", visibility=1)
+    hidden = Post.objects.create(author=author, content="private", visibility=4)
+    timeline.push(second)
+    timeline.push(hidden)
+    posts, _ = timeline.page(user, Post.objects.all(), 10)
+    assert [p.content for p in posts] == ["after", "before"]
+
+    timeline.remove_author(user.pk, author.pk)
+    posts, has_older = timeline.page(user, Post.objects.all(), 10)
+    assert posts == [] and not has_older
+
+
+@pytest.mark.django_db
+def test_home_timeline_merges_in_public_posts_of_unfollowed_authors(
+    user, mock_redis, monkeypatch
+):
+    """The feed still shows everyone's public posts, interleaved by time."""
+    from django.contrib.auth import get_user_model
+
+    from accounts.models import Follow
+    from posts import timeline
+    from posts.models import Post
+    from services import redis_client
+
+    monkeypatch.setattr(redis_client, "get_client", lambda: mock_redis)
+    User = get_user_model()
+    followed = User.objects.create_user(username="followed", password="pw")
+    stranger = User.objects.create_user(username="stranger", password="pw")
+    Follow.objects.create(follower=user, following=followed, accepted=True)
+
+    Post.objects.create(author=stranger, content="public 1", visibility=1)
+    Post.objects.create(author=followed, content="followed", visibility=3)
+    Post.objects.create(author=stranger, content="public 2", visibility=1)
+    Post.objects.create(author=stranger, content="followers only", visibility=3)
+
+    posts, has_older = timeline.page(user, Post.objects.all(), 2)
+    assert [p.content for p in posts] == ["public 2", "followed"] and has_older
+    before = (posts[-1].created_at, str(posts[-1].pk))
+    posts, has_older = timeline.page(user, Post.objects.all(), 2, before)
+    assert [p.content for p in posts] == ["public 1"] and not has_older
+
+
+@pytest.mark.django_db
+def test_comments_page_by_cursor_without_counting(post, user, django_assert_max_num_queries):
+    """Comment lists walk (created_at, id) cursors and never run COUNT(*)."""
+    from rest_framework.test import APIClient
+
+    from posts.models import Comment
+
+    for i in range(5):
+        Comment.objects.create(post=post, author=user, content=f"c{i}")
+
+    client = APIClient()
+    client.force_authenticate(user)
+    url = f"/api/v1/posts/{post.id}/comments/?limit=2"
+    seen = []
+    while url:
+        with django_assert_max_num_queries(4) as captured:
+            body = client.get(url).json()
+        assert not any("COUNT(" in q["sql"] for q in captured.captured_queries)
+        seen += [item["content"] for item in body["results"]]
+        url = body["next"]
+    assert seen == list(
+        Comment.objects.order_by("-created_at", "-id").values_list("content", flat=True)
+    )
+
+    assert client.get(f"/api/v1/posts/{post.id}/comments/?before=bogus").status_code == 404
+
+
+@pytest.mark.django_db
+def test_cursor_with_malformed_id_is_not_found(post, user):
+    """A cursor whose id part is not a UUID is rejected like any bad cursor."""
+    from django.utils import timezone
+    from rest_framework.test import APIClient
+
+    from glade.pagination import encode_cursor
+
+    client = APIClient()
+    client.force_authenticate(user)
+    cursor = encode_cursor(timezone.now(), "not-a-uuid")
+    response = client.get(f"/api/v1/posts/{post.id}/comments/?before={cursor}")
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+@pytest.mark.django_db
+def test_local_posts_measure_distance_from_the_viewer(user):
+    """Nearby posts are found around the viewer's position, not their cell's centre."""
+    from django.contrib.gis.geos import Point
+    from django.core.cache import cache
+    from rest_framework.test import APIClient
+
+    from posts import geocells
+    from posts.models import Post
+
+    cache.clear()
+    radius = 1000
+    # Viewer in the corner of their cell, far from its centre
+    precision = geocells.precision_for_radius(45.0, radius)
+    min_lat, min_lng, _, _ = geocells.bounds(geocells.encode(45.0, 10.0, precision))
+    lat, lng = min_lat + 0.0005, min_lng + 0.0005
+
+    def post_at(content, dlat, dlng):
+        return Post.objects.create(
+            author=user,
+            content=content,
+            visibility=1,
+            location=Point(lng + dlng, lat + dlat, srid=4326),
+        )
+
+    post_at("near", 0.003, 0.003)  # ~400 m, in the same cell
+    post_at("across", -0.004, 0)  # ~450 m, in the neighbouring cell
+    post_at("far", 0.05, 0.05)  # ~6.8 km
+
+    client = APIClient()
+    client.force_authenticate(user)
+    response = client.get("/api/v1/posts/local/", {"lat": lat, "lng": lng, "radius": radius})
+    assert response.status_code == 200
+    contents = [item["content"] for item in response.json()["results"]]
+    assert contents == ["near", "across"]
+
+
+@pytest.mark.django_db
+def test_local_posts_find_older_posts_behind_a_full_cell(user, settings):
+    """More posts than a cell list holds: older nearby posts are still found."""
+    from django.contrib.gis.geos import Point
+    from django.core.cache import cache
+    from rest_framework.test import APIClient
+
+    from posts import geocells
+    from posts.models import Post
+
+    cache.clear()
+    lat, lng = 45.0, 10.0
+    Post.objects.create(
+        author=user,
+        content="old and near",
+        visibility=1,
+        location=Point(lng + 0.001, lat + 0.001, srid=4326),
+    )
+    # Newer posts in the same cell, but ~1.5 km away
+    far = (lat + 0.014, lng)
+    Post.objects.bulk_create(
+        Post(
+            author=user,
+            content=f"busy {i}",
+            visibility=1,
+            location=Point(far[1], far[0], srid=4326),
+            geocell=geocells.encode(*far),
+        )
+        for i in range(settings.NEARBY_CELL_MAX_POSTS + 1)
+    )
+
+    client = APIClient()
+    client.force_authenticate(user)
+    response = client.get("/api/v1/posts/local/", {"lat": lat, "lng": lng, "radius": 1000})
+    assert response.status_code == 200
+    assert [item["content"] for item in response.json()["results"]] == ["old and near"]
@@ -0,0 +1,92 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.gis.geos import Point
+
+from accounts.models import Follow
+from posts.models import Post
+from privacy.services import PrivacyService
+
+
+@pytest.fixture
+def other_user(db):
+    User = get_user_model()
+    return User.objects.create_user(
+        username="otheruser", email="other@example.com", password="password123"
+    )
+
+
+@pytest.mark.django_db
+def test_filter_visible_posts_matches_can_user_see_post(user, other_user):
+    """SQL visibility filter agrees with the per-post Python check."""
+    user.approximate_location = Point(-80.7321, 35.3056)
+    user.save(update_fields=["approximate_location"])
+
+    near = Point(-80.7330, 35.3060)
+    far = Point(-79.0, 36.0)
+    Post.objects.create(author=other_user, content="public", visibility=1)
+    Post.objects.create(author=other_user, content="followers", visibility=3)
+    Post.objects.create(author=other_user, content="private", visibility=4)
+    Post.objects.create(
+        author=other_user, content="local near", visibility=2, location=near
+    )
+    Post.objects.create(
+        author=other_user, content="local far", visibility=2, location=far
+    )
+    Post.objects.create(
+        author=other_user,
+        content="public far radius",
+        visibility=1,
+        location=far,
+        location_radius=500,
+    )
+    Post.objects.create(author=user, content="own private", visibility=4)
+
+    privacy_service = PrivacyService()
+    expected = {
+        post.content
+        for post in Post.objects.all()
+        if privacy_service.can_user_see_post(user, post)
+    }
+    visible = set(
+        privacy_service.filter_visible_posts(user).values_list("content", flat=True)
+    )
+
+    assert visible == expected
+    assert visible == {"public", "local near", "own private"}
+
+    Follow.objects.create(follower=user, following=other_user, accepted=True)
+    visible = set(
+        privacy_service.filter_visible_posts(user).values_list("content", flat=True)
+    )
+    assert "followers" in visible
+
+
+@pytest.mark.django_db
+def test_local_area_uses_geodesic_meters_at_high_latitude(user, other_user):
+    """At 60°N a degree of longitude is ~55.7 km, not 111.3 km."""
+    user.approximate_location = Point(10.0, 60.0)
+    user.save(update_fields=["approximate_location"])
+
+    # ~800 m and ~1600 m east of the viewer, radius 1000 m
+    inside = Post.objects.create(
+        author=other_user,
+        content="inside",
+        visibility=2,
+        location=Point(10.01437, 60.0),
+        location_radius=1000,
+    )
+    outside = Post.objects.create(
+        author=other_user,
+        content="outside",
+        visibility=2,
+        location=Point(10.02874, 60.0),
+        location_radius=1000,
+    )
+
+    privacy_service = PrivacyService()
+    assert privacy_service.can_user_see_post(user, inside)
+    assert not privacy_service.can_user_see_post(user, outside)
+    visible = set(
+        privacy_service.filter_visible_posts(user).values_list("content", flat=True)
+    )
+    assert visible == {"inside"}
@@ -0,0 +1,28 @@
+import pytest
+
+from posts import geocells
+
+
+@pytest.mark.unit
+def test_encode_known_hash():
+    assert geocells.encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+
+@pytest.mark.unit
+def test_covering_cells_contain_points_within_radius():
+    lat, lng, radius = 45.0, 179.999, 1000
+    cells = geocells.covering_cells(lat, lng, radius)
+    precision = len(cells[0])
+
+    # ~900 m north and ~700 m east, across the antimeridian
+    for point in [(lat + 0.008, lng), (lat, -179.992)]:
+        assert geocells.encode(*point, precision) in cells
+
+
+@pytest.mark.unit
+def test_max_radius_stays_within_coarsest_cells():
+    radius = geocells.max_radius(45.0)
+    cells = geocells.covering_cells(45.0, 10.0, radius)
+    assert len(cells[0]) == geocells.MIN_PRECISION
+    assert geocells.precision_for_radius(45.0, radius) == geocells.MIN_PRECISION
+    assert geocells.max_radius(80.0) < radius
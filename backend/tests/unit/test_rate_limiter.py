@@ -0,0 +1,47 @@
+import pytest
+
+from services import rate_limiter
+
+
+@pytest.fixture
+def local_cache(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+
+
+@pytest.mark.unit
+def test_limit_allows_burst_then_refills_evenly(local_cache, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limiter.time, "time", lambda: now[0])
+
+    results = [rate_limiter.hit("test:burst", 3, 60) for _ in range(4)]
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert results[-1].retry_after == pytest.approx(20)
+
+    # One request's worth of allowance comes back every window / limit
+    now[0] += 20
+    assert rate_limiter.hit("test:burst", 3, 60).allowed
+    assert not rate_limiter.hit("test:burst", 3, 60).allowed
+
+
+@pytest.mark.unit
+def test_prefilter_syncs_in_batches_and_stops_at_limit(local_cache, monkeypatch):
+    monkeypatch.setattr(rate_limiter.time, "time", lambda: 1000.0)
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: 1000.0)
+    syncs = []
+    real_hit = rate_limiter.hit
+
+    def counting_hit(*args, **kwargs):
+        syncs.append(kwargs.get("served", 0))
+        return real_hit(*args, **kwargs)
+
+    monkeypatch.setattr(rate_limiter, "hit", counting_hit)
+    prefilter = rate_limiter.PreFilter(limit=20, window=60, batch=5, sync_seconds=5)
+
+    allowed = [prefilter.allow("test:ip") for _ in range(21)]
+
+    assert allowed == [True] * 20 + [False]
+    # Every locally served hit is reported, and most checks skip the limiter
+    assert sum(syncs) + len(syncs) == 21
+    assert len(syncs) == 5
@@ -0,0 +1,51 @@
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from federation import signing
+
+
+def _keypair():
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+    public_pem = private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    return private_pem, public_pem
+
+
+@pytest.mark.unit
+def test_warm_keys_skip_pem_parsing(monkeypatch):
+    private_pem, public_pem = _keypair()
+    key_id = "https://remote.example/users/alice#main-key"
+
+    sig = signing.sign_bytes_rsa(private_pem, b"hello", key_id)
+    assert signing.verify_bytes_rsa(public_pem, b"hello", sig, key_id)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("PEM parsed on a warm key")
+
+    monkeypatch.setattr(signing._public_keys, "_loader", fail)
+    monkeypatch.setattr(signing._private_keys, "_loader", fail)
+    sig = signing.sign_bytes_rsa(private_pem, b"again", key_id)
+    assert signing.verify_bytes_rsa(public_pem, b"again", sig, key_id)
+
+
+@pytest.mark.unit
+def test_rotated_key_is_not_served_from_cache():
+    key_id = "https://remote.example/users/bob#main-key"
+    old_private, old_public = _keypair()
+    new_private, new_public = _keypair()
+
+    sig = signing.sign_bytes_rsa(old_private, b"msg", key_id)
+    assert signing.verify_bytes_rsa(old_public, b"msg", sig, key_id)
+
+    signing.invalidate_cached_keys("https://remote.example/users/bob")
+    assert not signing.verify_bytes_rsa(new_public, b"msg", sig, key_id)
+    new_sig = signing.sign_bytes_rsa(new_private, b"msg", key_id)
+    assert signing.verify_bytes_rsa(new_public, b"msg", new_sig, key_id)
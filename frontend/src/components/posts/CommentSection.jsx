@@ -32,7 +32,7 @@ function CommentSection({ postId }) {
     try {
       setLoading(true);
       const response = await axios.get(`/api/v1/posts/${postId}/comments/`);
-      setComments(response.data);
+      setComments(response.data.results || response.data);
       setError(null);
     } catch (err) {
       console.error('Error fetching comments:', err);
@@ -3,6 +3,7 @@ import { Link } from "react-router-dom";
 import { formatDistanceToNow } from "date-fns";
 import { api } from "../../services/api";
 import { useAuth } from "../../hooks/useAuth";
+import { cursorParams } from "../../services/pagination";
 import ConfirmModal from "../common/ConfirmModal";
 import FederatedPostIndicator from "../FederatedPostIndicator";
 import UserTypeBadge from "../UserTypeBadge";
@@ -18,6 +19,9 @@ function PostCard({ post, onDelete }) {
   const [commentCount, setCommentCount] = useState(post?.comments_count || 0);
   const [showComments, setShowComments] = useState(false);
   const [comments, setComments] = useState([]);
+  // Cursor params of the next (older) page of comments, null when none
+  const [nextCommentsCursor, setNextCommentsCursor] = useState(null);
+  const [loadingMoreComments, setLoadingMoreComments] = useState(false);
   const [newComment, setNewComment] = useState("");
   const [isLoading, setIsLoading] = useState(false);
 
@@ -32,8 +36,9 @@ function PostCard({ post, onDelete }) {
     if (!post?.id) return;
     try {
       setIsLoading(true);
-      const commentsData = await api.getComments(post.id);
-      setComments(commentsData);
+      const data = await api.getComments(post.id);
+      setComments(data.results || []);
+      setNextCommentsCursor(cursorParams(data.next));
     } catch (error) {
       console.error("Error loading comments:", error);
     } finally {
@@ -41,6 +46,20 @@ function PostCard({ post, onDelete }) {
     }
   };
 
+  const loadMoreComments = async () => {
+    if (!post?.id || !nextCommentsCursor) return;
+    try {
+      setLoadingMoreComments(true);
+      const data = await api.getComments(post.id, nextCommentsCursor);
+      setComments((prev) => [...prev, ...(data.results || [])]);
+      setNextCommentsCursor(cursorParams(data.next));
+    } catch (error) {
+      console.error("Error loading more comments:", error);
+    } finally {
+      setLoadingMoreComments(false);
+    }
+  };
+
   const handleLike = async () => {
     if (!post?.id) return;
 
@@ -351,6 +370,16 @@ function PostCard({ post, onDelete }) {
                   <p className="text-burgundy">{comment.content}</p>
                 </div>
               ))}
+
+              {nextCommentsCursor && (
+                <button
+                  onClick={loadMoreComments}
+                  disabled={loadingMoreComments}
+                  className="w-full text-sm text-olive hover:underline disabled:opacity-50"
+                >
+                  {loadingMoreComments ? "Loading..." : "Load more comments"}
+                </button>
+              )}
             </div>
           ) : (
             <div className="text-center py-3 text-gray-500">
@@ -12,12 +12,15 @@ import {
   Filter,
 } from "lucide-react";
 import { instanceService } from "../services/instanceService";
+import { cursorParams } from "../services/pagination";
 
 export default function ActivityLogPage() {
   const [activities, setActivities] = useState([]);
   const [loading, setLoading] = useState(true);
-  const [page, setPage] = useState(1);
-  const [totalPages, setTotalPages] = useState(0);
+  // Cursor params of the current page and of its neighbours (null when none)
+  const [cursor, setCursor] = useState({});
+  const [nextCursor, setNextCursor] = useState(null);
+  const [previousCursor, setPreviousCursor] = useState(null);
   const [filters, setFilters] = useState({
     type: "",
     direction: "",
@@ -26,14 +29,15 @@ export default function ActivityLogPage() {
 
   useEffect(() => {
     loadActivities();
-  }, [page, filters]);
+  }, [cursor, filters]);
 
   const loadActivities = async () => {
     setLoading(true);
     try {
-      const data = await instanceService.getActivityLog(page, filters);
+      const data = await instanceService.getActivityLog(cursor, filters);
       setActivities(data.results || []);
-      setTotalPages(data.pages || 0);
+      setNextCursor(cursorParams(data.next));
+      setPreviousCursor(cursorParams(data.previous));
     } catch (err) {
       console.error("Failed to load activity log:", err);
     } finally {
@@ -43,7 +47,7 @@ export default function ActivityLogPage() {
 
   const handleFilterChange = (key, value) => {
     setFilters((prev) => ({ ...prev, [key]: value }));
-    setPage(1); // Reset to first page on filter change
+    setCursor({}); // Reset to first page on filter change
   };
 
   const getActivityIcon = (type) => {
@@ -76,7 +80,7 @@ export default function ActivityLogPage() {
     return colors[type] || "bg-gray-50 text-gray-700 border-gray-200";
   };
 
-  if (loading && page === 1) {
+  if (loading && !cursor.before && !cursor.after) {
     return (
       <div className="flex items-center justify-center min-h-screen">
         <div className="animate-spin rounded-full h-12 w-12 border-b-2 border-burgundy"></div>
@@ -166,7 +170,7 @@ export default function ActivityLogPage() {
           <button
             onClick={() => {
               setFilters({ type: "", direction: "" });
-              setPage(1);
+              setCursor({});
             }}
             className="mt-4 text-sm text-coral hover:text-burgundy font-semibold"
           >
@@ -264,24 +268,20 @@ export default function ActivityLogPage() {
           </div>
 
           {/* Pagination */}
-          {totalPages > 1 && (
+          {(nextCursor || previousCursor) && (
             <div className="flex items-center justify-center gap-4">
               <button
-                onClick={() => setPage((p) => Math.max(1, p - 1))}
-                disabled={page === 1 || loading}
+                onClick={() => setCursor(previousCursor)}
+                disabled={!previousCursor || loading}
                 className="flex items-center gap-2 px-4 py-2 bg-olive text-white rounded-lg font-semibold hover:bg-lime transition-colors disabled:opacity-50 disabled:cursor-not-allowed"
               >
                 <ChevronLeft size={20} />
                 Previous
               </button>
 
-              <span className="text-gray-600">
-                Page {page} of {totalPages}
-              </span>
-
               <button
-                onClick={() => setPage((p) => Math.min(totalPages, p + 1))}
-                disabled={page === totalPages || loading}
+                onClick={() => setCursor(nextCursor)}
+                disabled={!nextCursor || loading}
                 className="flex items-center gap-2 px-4 py-2 bg-olive text-white rounded-lg font-semibold hover:bg-lime transition-colors disabled:opacity-50 disabled:cursor-not-allowed"
               >
                 Next
@@ -17,13 +17,15 @@ function HomePage() {
 		error,
 	} = useInfiniteQuery({
 		queryKey: ["posts"],
-		queryFn: ({ pageParam = 1 }) => api.getPosts({ page: pageParam }),
+		queryFn: ({ pageParam }) =>
+			api.getPosts(pageParam ? { before: pageParam } : {}),
+		initialPageParam: null,
 		getNextPageParam: (lastPage) => {
 			// Check if there's a next page
 			if (lastPage?.next) {
-				// Extract page number from next URL
+				// Extract the cursor from the next URL
 				const url = new URL(lastPage.next);
-				return parseInt(url.searchParams.get('page') || '2');
+				return url.searchParams.get('before') || undefined;
 			}
 			return undefined;
 		},
@@ -40,7 +42,7 @@ function HomePage() {
 				// If no data yet, create initial structure
 				return {
 					pages: [{ results: [newPost], next: null, previous: null, count: 1 }],
-					pageParams: [1]
+					pageParams: [null]
 				};
 			}
 			
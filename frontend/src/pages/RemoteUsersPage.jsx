@@ -3,26 +3,31 @@ import { useEffect, useState } from "react";
 import { useNavigate } from "react-router-dom";
 import { Users, Globe, Server, ChevronLeft, ChevronRight } from "lucide-react";
 import { instanceService } from "../services/instanceService";
+import { cursorParams } from "../services/pagination";
 
 export default function RemoteUsersPage() {
   const [users, setUsers] = useState([]);
   const [loading, setLoading] = useState(true);
-  const [page, setPage] = useState(1);
-  const [totalPages, setTotalPages] = useState(0);
+  // Cursor params of the current page and of its neighbours (null when none)
+  const [cursor, setCursor] = useState({});
+  const [nextCursor, setNextCursor] = useState(null);
+  const [previousCursor, setPreviousCursor] = useState(null);
   const [total, setTotal] = useState(0);
   const navigate = useNavigate();
 
   useEffect(() => {
     loadUsers();
-  }, [page]);
+  }, [cursor]);
 
   const loadUsers = async () => {
     setLoading(true);
     try {
-      const data = await instanceService.getRemoteUsers(page);
+      const data = await instanceService.getRemoteUsers(cursor);
       setUsers(data.results || []);
-      setTotalPages(data.pages || 0);
-      setTotal(data.total || 0);
+      setNextCursor(cursorParams(data.next));
+      setPreviousCursor(cursorParams(data.previous));
+      // Estimated from table statistics
+      setTotal(data.count || 0);
     } catch (err) {
       console.error("Failed to load remote users:", err);
     } finally {
@@ -41,7 +46,7 @@ export default function RemoteUsersPage() {
     }
   };
 
-  if (loading && page === 1) {
+  if (loading && !cursor.before && !cursor.after) {
     return (
       <div className="flex items-center justify-center min-h-screen">
         <div className="animate-spin rounded-full h-12 w-12 border-b-2 border-burgundy"></div>
@@ -75,8 +80,7 @@ export default function RemoteUsersPage() {
           <div>
             <h1 className="text-4xl font-bold text-burgundy">Remote Users</h1>
             <p className="text-olive text-lg">
-              {total} federated {total === 1 ? "user" : "users"}
-              {totalPages > 1 && ` • Page ${page} of ${totalPages}`}
+              About {total} federated {total === 1 ? "user" : "users"}
             </p>
           </div>
         </div>
@@ -164,24 +168,20 @@ export default function RemoteUsersPage() {
           </div>
 
           {/* Pagination */}
-          {totalPages > 1 && (
+          {(nextCursor || previousCursor) && (
             <div className="flex items-center justify-center gap-4">
               <button
-                onClick={() => setPage((p) => Math.max(1, p - 1))}
-                disabled={page === 1}
+                onClick={() => setCursor(previousCursor)}
+                disabled={!previousCursor}
                 className="flex items-center gap-2 px-4 py-2 bg-olive text-white rounded-lg font-semibold hover:bg-lime transition-colors disabled:opacity-50 disabled:cursor-not-allowed"
               >
                 <ChevronLeft size={20} />
                 Previous
               </button>
 
-              <span className="text-gray-600">
-                Page {page} of {totalPages}
-              </span>
-
               <button
-                onClick={() => setPage((p) => Math.min(totalPages, p + 1))}
-                disabled={page === totalPages}
+                onClick={() => setCursor(nextCursor)}
+                disabled={!nextCursor}
                 className="flex items-center gap-2 px-4 py-2 bg-olive text-white rounded-lg font-semibold hover:bg-lime transition-colors disabled:opacity-50 disabled:cursor-not-allowed"
               >
                 Next
@@ -3,6 +3,7 @@ import React, { useState, useEffect } from "react";
 import { useNavigate, useSearchParams } from "react-router-dom";
 import { api } from "../services/api";
 import UserTypeBadge from "../components/UserTypeBadge";
+import { cursorParams } from "../services/pagination";
 
 function SearchPage() {
   const [searchParams, setSearchParams] = useSearchParams();
@@ -10,22 +11,22 @@ function SearchPage() {
   const [results, setResults] = useState([]);
   const [loading, setLoading] = useState(false);
   const [searchPerformed, setSearchPerformed] = useState(false);
-  const [currentPage, setCurrentPage] = useState(1);
-  const [totalPages, setTotalPages] = useState(0);
-  const [totalResults, setTotalResults] = useState(0);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [previousCursor, setPreviousCursor] = useState(null);
   const navigate = useNavigate();
 
   useEffect(() => {
     const q = searchParams.get("q");
-    const p = parseInt(searchParams.get("page") || "1");
+    const before = searchParams.get("before");
+    const after = searchParams.get("after");
+    const cursor = before ? { before } : after ? { after } : {};
     if (q) {
       setQuery(q);
-      setCurrentPage(p);
-      performSearch(q, p);
+      performSearch(q, cursor);
     }
   }, [searchParams]);
 
-  const performSearch = async (searchQuery, page = 1) => {
+  const performSearch = async (searchQuery, cursor = {}) => {
     if (!searchQuery.trim() || searchQuery.trim().length < 2) {
       setResults([]);
       setSearchPerformed(false);
@@ -35,22 +36,22 @@ function SearchPage() {
     try {
       setLoading(true);
       setSearchPerformed(true);
-      const searchResults = await api.searchUsers(searchQuery.trim(), { page });
+      const searchResults = await api.searchUsers(searchQuery.trim(), cursor);
 
       if (searchResults && Array.isArray(searchResults.results)) {
         setResults(searchResults.results);
-        setTotalResults(searchResults.total || searchResults.results.length);
-        setTotalPages(searchResults.pages || 1);
+        setNextCursor(cursorParams(searchResults.next));
+        setPreviousCursor(cursorParams(searchResults.previous));
       } else {
         setResults([]);
-        setTotalResults(0);
-        setTotalPages(0);
+        setNextCursor(null);
+        setPreviousCursor(null);
       }
     } catch (error) {
       console.error("Error searching users:", error);
       setResults([]);
-      setTotalResults(0);
-      setTotalPages(0);
+      setNextCursor(null);
+      setPreviousCursor(null);
     } finally {
       setLoading(false);
     }
@@ -59,12 +60,12 @@ function SearchPage() {
   const handleSearch = (e) => {
     e.preventDefault();
     if (query.trim()) {
-      setSearchParams({ q: query.trim(), page: "1" });
+      setSearchParams({ q: query.trim() });
     }
   };
 
-  const handlePageChange = (newPage) => {
-    setSearchParams({ q: query, page: newPage.toString() });
+  const handlePageChange = (cursor) => {
+    setSearchParams({ q: query, ...cursor });
     window.scrollTo({ top: 0, behavior: "smooth" });
   };
 
@@ -110,8 +111,7 @@ function SearchPage() {
             <div>
               <div className="flex items-center justify-between mb-4">
                 <h2 className="text-lg font-semibold text-gray-700">
-                  Found {totalResults} user{totalResults !== 1 ? "s" : ""}
-                  {totalPages > 1 && ` (Page ${currentPage} of ${totalPages})`}
+                  Users matching "{searchParams.get("q")}"
                 </h2>
               </div>
               <div className="space-y-3">
@@ -180,55 +180,19 @@ function SearchPage() {
               </div>
 
               {/* Pagination */}
-              {totalPages > 1 && (
+              {(nextCursor || previousCursor) && (
                 <div className="flex justify-center items-center gap-2 mt-8">
                   <button
-                    onClick={() => handlePageChange(currentPage - 1)}
-                    disabled={currentPage === 1}
+                    onClick={() => handlePageChange(previousCursor)}
+                    disabled={!previousCursor}
                     className="px-4 py-2 border border-gray-300 rounded-lg hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed transition-colors"
                   >
                     Previous
                   </button>
 
-                  <div className="flex gap-1">
-                    {[...Array(totalPages)].map((_, i) => {
-                      const pageNum = i + 1;
-                      if (
-                        pageNum === 1 ||
-                        pageNum === totalPages ||
-                        (pageNum >= currentPage - 1 &&
-                          pageNum <= currentPage + 1)
-                      ) {
-                        return (
-                          <button
-                            key={pageNum}
-                            onClick={() => handlePageChange(pageNum)}
-                            className={`px-4 py-2 rounded-lg transition-colors ${
-                              currentPage === pageNum
-                                ? "bg-[#85993D] text-white"
-                                : "border border-gray-300 hover:bg-gray-50"
-                            }`}
-                          >
-                            {pageNum}
-                          </button>
-                        );
-                      } else if (
-                        pageNum === currentPage - 2 ||
-                        pageNum === currentPage + 2
-                      ) {
-                        return (
-                          <span key={pageNum} className="px-2 py-2">
-                            ...
-                          </span>
-                        );
-                      }
-                      return null;
-                    })}
-                  </div>
-
                   <button
-                    onClick={() => handlePageChange(currentPage + 1)}
-                    disabled={currentPage === totalPages}
+                    onClick={() => handlePageChange(nextCursor)}
+                    disabled={!nextCursor}
                     className="px-4 py-2 border border-gray-300 rounded-lg hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed transition-colors"
                   >
                     Next
@@ -196,12 +196,13 @@ export const api = {
   // --------------------------------------------------------------------------
 
   /**
-   * Get comments for post
+   * Get a page of comments for post, newest first
    * @param {string} postId
-   * @returns {Promise<Array>}
+   * @param {Object} cursor - {before} or {after}, {} for the first page
+   * @returns {Promise<Object>} - {next, previous, results}
    */
-  async getComments(postId) {
-    return await postService.getComments(postId);
+  async getComments(postId, cursor = {}) {
+    return await postService.getComments(postId, cursor);
   },
 
   /**
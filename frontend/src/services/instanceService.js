@@ -37,17 +37,17 @@ export const instanceService = {
   },
 
   // Get list of remote users
-  async getRemoteUsers(page = 1) {
+  async getRemoteUsers(cursor = {}) {
     const response = await api.get("/api/instance/remote-users", {
-      params: { page },
+      params: { ...cursor, count: "estimate" },
     });
     return response.data;
   },
 
   // Get activity log
-  async getActivityLog(page = 1, filters = {}) {
+  async getActivityLog(cursor = {}, filters = {}) {
     const response = await api.get("/api/instance/activity-log", {
-      params: { page, ...filters },
+      params: { ...cursor, ...filters },
     });
     return response.data;
   },
@@ -0,0 +1,14 @@
+// frontend/src/services/pagination.js
+
+/**
+ * Query params for a cursor-paginated page link ("next" or "previous")
+ * @param {string|null} link - Absolute page URL returned by the API
+ * @returns {Object|null} - {before} or {after}, or null when there is no page
+ */
+export function cursorParams(link) {
+  if (!link) return null;
+  const params = new URL(link).searchParams;
+  if (params.get("before")) return { before: params.get("before") };
+  if (params.get("after")) return { after: params.get("after") };
+  return {};
+}
@@ -124,12 +124,15 @@ export const postService = {
   },
 
   /**
-   * Get comments for post
+   * Get a page of comments for post, newest first
    * @param {string} postId
-   * @returns {Promise<Array>}
+   * @param {Object} cursor - {before} or {after} from cursorParams, {} for the first page
+   * @returns {Promise<Object>} - {next, previous, results}
    */
-  async getComments(postId) {
-    const response = await apiClient.get(`/posts/${postId}/comments/`);
+  async getComments(postId, cursor = {}) {
+    const response = await apiClient.get(`/posts/${postId}/comments/`, {
+      params: cursor,
+    });
     return response.data;
   },
 